@@ -0,0 +1,180 @@
+"""
+Catalog Aggregates
+Price distributions and rating rankings kept current on every catalog write
+"""
+
+import bisect
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .catalog import CatalogIndex
+
+GROUP_FIELDS = ("category", "state")
+
+def parse_edges(value: str) -> List[float]:
+    """Parse comma-separated bucket edges ("15000,30000") into a sorted list; raises ValueError"""
+    edges = sorted(float(edge) for edge in value.split(",") if edge.strip())
+    if not all(math.isfinite(edge) for edge in edges):
+        raise ValueError("Bucket edges must be finite numbers")
+    return [int(edge) if edge.is_integer() else edge for edge in edges]
+
+def bucket_labels(edges: Sequence[float]) -> List[str]:
+    """Generic labels for custom edges: under_10000, 10000_to_20000, 20000_plus"""
+    if not edges:
+        return ["all"]
+    labels = [f"under_{edges[0]}"]
+    labels += [f"{low}_to_{high}" for low, high in zip(edges, edges[1:])]
+    labels.append(f"{edges[-1]}_plus")
+    return labels
+
+class PriceDistribution:
+    """Sorted prices of a group of destinations; bucket counts for any edges are bisections"""
+
+    def __init__(self):
+        self.prices: List[float] = []
+        self.total = 0
+
+    def add(self, price: float):
+        bisect.insort(self.prices, price)
+        self.total += price
+
+    def discard(self, price: float):
+        position = bisect.bisect_left(self.prices, price)
+        if position < len(self.prices) and self.prices[position] == price:
+            del self.prices[position]
+            self.total -= price
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def summary(self, edges: Sequence[float], labels: Sequence[str], total_rows: int) -> Dict[str, Any]:
+        """Price statistics over the priced rows; `total_rows` also counts rows without a price"""
+        count = len(self.prices)
+        # Bucket i holds edges[i-1] <= price < edges[i]
+        bounds = [0] + [bisect.bisect_left(self.prices, edge) for edge in edges] + [count]
+        return {
+            "min_price": self.prices[0],
+            "max_price": self.prices[-1],
+            "avg_price": self.total // count,
+            "budget_ranges": {label: bounds[i + 1] - bounds[i] for i, label in enumerate(labels)},
+            "total_destinations": total_rows,
+            "priced_destinations": count
+        }
+
+class AggregateIndex(CatalogIndex):
+    """Budget and popularity aggregates, overall and per category/state, updated per row"""
+
+    def __init__(self, edges: Optional[List[float]] = None, labels: Optional[List[str]] = None):
+        self.edges = edges if edges is not None else parse_edges(os.getenv("BUDGET_BUCKET_EDGES", "15000,30000"))
+        labels = labels or [label.strip() for label in os.getenv("BUDGET_BUCKET_LABELS", "budget,mid_range,luxury").split(",")]
+        self.labels = labels if len(labels) == len(self.edges) + 1 else bucket_labels(self.edges)
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self._reset()
+
+    def _reset(self):
+        self.rows = {}
+        self.prices = PriceDistribution()
+        self.group_prices: Dict[str, Dict[str, PriceDistribution]] = {field: {} for field in GROUP_FIELDS}
+        # (-rating, id), best first — overall and per group
+        self.ranked: List[Tuple[float, int]] = []
+        self.group_ranked: Dict[str, Dict[str, List[Tuple[float, int]]]] = {field: {} for field in GROUP_FIELDS}
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self._reset()
+        for row in rows:
+            self._add(row)
+
+    def upsert(self, row: Dict[str, Any]):
+        self.remove(row["id"])
+        self._add(row)
+
+    def remove(self, destination_id: int):
+        row = self.rows.pop(destination_id, None)
+        if row is None:
+            return
+        price = row.get("price_from")
+        rank = (-float(row.get("rating") or 0), destination_id)
+        self._discard(self.ranked, rank)
+        if price is not None:
+            self.prices.discard(price)
+        for field in GROUP_FIELDS:
+            group = row.get(field)
+            if group is None:
+                continue
+            self._discard(self.group_ranked[field][group], rank)
+            if not self.group_ranked[field][group]:
+                del self.group_ranked[field][group]
+            if price is not None:
+                distribution = self.group_prices[field][group]
+                distribution.discard(price)
+                if not distribution:
+                    del self.group_prices[field][group]
+
+    def _add(self, row: Dict[str, Any]):
+        destination_id = row["id"]
+        self.rows[destination_id] = row
+        price = row.get("price_from")
+        rank = (-float(row.get("rating") or 0), destination_id)
+        bisect.insort(self.ranked, rank)
+        if price is not None:
+            self.prices.add(price)
+        for field in GROUP_FIELDS:
+            group = row.get(field)
+            if group is None:
+                continue
+            bisect.insort(self.group_ranked[field].setdefault(group, []), rank)
+            if price is not None:
+                self.group_prices[field].setdefault(group, PriceDistribution()).add(price)
+
+    @staticmethod
+    def _discard(items: list, item):
+        position = bisect.bisect_left(items, item)
+        if position < len(items) and items[position] == item:
+            del items[position]
+
+    def budget_analysis(self, edges: Optional[List[float]] = None, group_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """min/max/avg price and bucket counts, optionally broken down by category or state"""
+        if not self.prices:
+            return None
+        if edges is None:
+            edges, labels = self.edges, self.labels
+        else:
+            labels = bucket_labels(edges)
+
+        analysis = self.prices.summary(edges, labels, len(self.rows))
+        if group_by is not None:
+            analysis["breakdown"] = {
+                group: distribution.summary(edges, labels, len(self.group_ranked[group_by][group]))
+                for group, distribution in sorted(self.group_prices[group_by].items())
+            }
+        return analysis
+
+    def counts(self) -> Dict[str, Any]:
+        """Exact destination counts overall and per category/state"""
+        return {
+            "total": len(self.rows),
+            "by_category": {group: len(ranked) for group, ranked in sorted(self.group_ranked["category"].items())},
+            "by_state": {group: len(ranked) for group, ranked in sorted(self.group_ranked["state"].items())}
+        }
+
+    def popular(self, limit: int = 5, category: Optional[str] = None, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Highest-rated destinations, optionally within one category and/or state"""
+        if limit <= 0:
+            return []
+        if category is not None:
+            ranked = self.group_ranked["category"].get(category, [])
+        elif state is not None:
+            ranked = self.group_ranked["state"].get(state, [])
+        else:
+            ranked = self.ranked
+
+        popular = []
+        for _, destination_id in ranked:
+            row = self.rows[destination_id]
+            if state is not None and row.get("state") != state:
+                continue
+            popular.append(row)
+            if len(popular) == limit:
+                break
+        return popular
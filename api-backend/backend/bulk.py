@@ -0,0 +1,126 @@
+"""
+Bulk Writes
+One-pass batch validation and chunked multi-row database writes with per-item results
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+Indexed = List[Tuple[int, Any]]
+
+def _dump(model: Any) -> Dict[str, Any]:
+    return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+
+def validate_batch(items: List[Any], adapter: Any) -> Tuple[Indexed, Dict[int, str]]:
+    """Validate a whole batch with one List[model] TypeAdapter call.
+
+    Returns (index, row) pairs for the valid items, with every model field
+    present so all rows of a multi-row statement share the same columns,
+    and an error message per invalid index.
+    """
+    try:
+        return list(enumerate(_dump(model) for model in adapter.validate_python(items))), {}
+    except ValidationError as e:
+        messages: Dict[int, List[str]] = {}
+        for error in e.errors():
+            location = error["loc"]
+            field = ".".join(str(part) for part in location[1:])
+            messages.setdefault(location[0], []).append(f"{field}: {error['msg']}" if field else error["msg"])
+
+    valid = [index for index in range(len(items)) if index not in messages]
+    models = adapter.validate_python([items[index] for index in valid])
+    invalid = {index: "; ".join(errors) for index, errors in messages.items()}
+    return list(zip(valid, (_dump(model) for model in models))), invalid
+
+def is_row_error(error: Exception) -> bool:
+    """True when Postgres rejected the data itself (SQLSTATE classes 22 and 23), not the connection"""
+    return str(getattr(error, "code", "") or "").startswith(("22", "23"))
+
+def bulk_report(
+    total: int,
+    status: str,
+    written: Dict[int, Any],
+    failed: Dict[int, str],
+    invalid: Dict[int, str],
+    ids: Optional[Dict[int, Any]] = None
+) -> Dict[str, Any]:
+    """Per-item outcome of a bulk request, in request order, plus counts by status"""
+    ids = ids or {}
+    results = []
+    for index in range(total):
+        if index in invalid:
+            result = {"index": index, "status": "invalid", "error": invalid[index]}
+        elif index in failed:
+            result = {"index": index, "status": "failed", "error": failed[index]}
+        elif written.get(index) is None:
+            result = {"index": index, "status": "not_found"}
+        else:
+            result = {"index": index, "status": status, "id": written[index].get("id")}
+        if index in ids:
+            result.setdefault("id", ids[index])
+        results.append(result)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return {"total": total, "counts": counts, "results": results}
+
+class BulkWriter:
+    """Split (index, item) pairs into chunks and write a few chunks concurrently"""
+
+    def __init__(self, chunk_size: Optional[int] = None, concurrency: Optional[int] = None):
+        self.chunk_size = chunk_size or int(os.getenv("BULK_CHUNK_SIZE", "500"))
+        self.concurrency = concurrency or int(os.getenv("BULK_CONCURRENCY", "4"))
+        self.statements = 0
+        self.rows_written = 0
+        self.splits = 0
+
+    async def run(self, write: Callable[[List[Any]], Awaitable[List[Any]]], items: Indexed) -> Tuple[Dict[int, Any], Dict[int, str]]:
+        """Write every item; returns write results and error messages, both by input index.
+
+        `write` sends one multi-row statement and returns one result per item
+        in order (None for an item that matched nothing). A chunk rejected
+        because of its data is halved until the offending rows are isolated,
+        so one bad row does not fail the rest of its chunk.
+        """
+        written: Dict[int, Any] = {}
+        failed: Dict[int, str] = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def write_chunk(chunk: Indexed):
+            failure = None
+            async with semaphore:
+                self.statements += 1
+                try:
+                    results = await write([item for _, item in chunk])
+                except Exception as e:
+                    failure = e
+
+            if failure is None:
+                for (index, _), result in zip(chunk, results):
+                    written[index] = result
+                self.rows_written += sum(result is not None for result in results)
+            elif len(chunk) > 1 and is_row_error(failure):
+                self.splits += 1
+                middle = len(chunk) // 2
+                await asyncio.gather(write_chunk(chunk[:middle]), write_chunk(chunk[middle:]))
+            else:
+                message = getattr(failure, "message", None) or str(failure)
+                for index, _ in chunk:
+                    failed[index] = message
+
+        chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+        await asyncio.gather(*(write_chunk(chunk) for chunk in chunks))
+        return written, failed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "chunk_size": self.chunk_size,
+            "concurrency": self.concurrency,
+            "statements": self.statements,
+            "rows_written": self.rows_written,
+            "splits": self.splits
+        }
@@ -0,0 +1,219 @@
+"""
+Destination Catalog Snapshot
+Full in-memory copy of the destinations table and the indexes derived from it
+"""
+
+import asyncio
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Postgres trims trailing zeros from fractional seconds; fromisoformat before 3.11 wants 3 or 6 digits
+_FRACTION_RE = re.compile(r"\.(\d{1,6})\d*")
+
+class CatalogIndex:
+    """Base class for in-memory structures derived from the catalog.
+
+    CatalogStore calls `rebuild` after a full load and `upsert` / `remove`
+    after single-row writes, so subclasses stay in sync incrementally.
+    """
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def upsert(self, row: Dict[str, Any]):
+        raise NotImplementedError
+
+    def remove(self, destination_id: int):
+        raise NotImplementedError
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Aware UTC datetime from a row timestamp ("...Z", "+00:00" or naive, taken as UTC)"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif value:
+        text = str(value).strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        text = _FRACTION_RE.sub(lambda match: "." + match.group(1).ljust(6, "0"), text, count=1)
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+class CatalogUnavailable(Exception):
+    """The catalog has never loaded and the database is failing (or a retry is not due yet)"""
+
+class CatalogStore:
+    """Loads the whole catalog once, keeps it current on writes and feeds registered indexes.
+
+    A failed load is remembered: until the retry delay (doubling per failure
+    up to `retry_max_seconds`) passes, callers get CatalogUnavailable at once,
+    or keep the stale snapshot if one is loaded, instead of each reloading the
+    whole table. Writes applied while a reload is in flight are replayed onto
+    the fresh rows so the swap cannot lose them.
+    """
+
+    def __init__(
+        self,
+        db,
+        page_size: Optional[int] = None,
+        refresh_seconds: Optional[float] = None,
+        retry_seconds: Optional[float] = None,
+        retry_max_seconds: Optional[float] = None
+    ):
+        self.db = db
+        self.page_size = page_size or int(os.getenv("CATALOG_PAGE_SIZE", "1000"))
+        # Periodic full reload picks up writes made outside this process
+        self.refresh_seconds = refresh_seconds or float(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+        self.retry_seconds = retry_seconds or float(os.getenv("CATALOG_RETRY_SECONDS", "5"))
+        self.retry_max_seconds = retry_max_seconds or float(os.getenv("CATALOG_RETRY_MAX_SECONDS", "60"))
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.indexes: List[CatalogIndex] = []
+        self.loaded_at: Optional[float] = None
+        # Bumped on every full reload, which may bring in changes made elsewhere
+        self.generation = 0
+        # Newest change seen, in UTC (row timestamps on load, then local writes)
+        self.last_modified: Optional[datetime] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.load_failures = 0
+        self.last_error: Optional[str] = None
+        self._retry_at = 0.0
+        # (id, row or None for a delete) for writes applied while a reload is in flight
+        self._writes_during_refresh: Optional[List[Tuple[int, Optional[Dict[str, Any]]]]] = None
+        self._background: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def register(self, index: CatalogIndex) -> CatalogIndex:
+        """Attach an index; it is built immediately if the catalog is already loaded"""
+        self.indexes.append(index)
+        if self.loaded:
+            index.rebuild(list(self.rows.values()))
+        return index
+
+    def _current(self) -> bool:
+        """True when the snapshot should be used as is; raises while a failed first load backs off"""
+        now = time.monotonic()
+        if self.loaded and now - self.loaded_at < self.refresh_seconds:
+            return True
+        if now < self._retry_at:
+            if self.loaded:
+                return True
+            raise CatalogUnavailable(f"Catalog load failed, retrying in {self._retry_at - now:.0f}s: {self.last_error}")
+        return False
+
+    async def ensure_loaded(self):
+        """Load the catalog on first use; afterwards return at once and reload a stale one in the background.
+
+        Only the first load blocks callers. Raises CatalogUnavailable when there
+        is no snapshot to serve; a failed reload keeps serving the previous one.
+        """
+        if self.loaded:
+            self.refresh_in_background()
+            return
+        if not self._current():
+            await self._load()
+
+    def refresh_in_background(self):
+        """Start reloading a stale snapshot without waiting for it (no-op before the first load)"""
+        if not self.loaded or self._current() or (self._background is not None and not self._background.done()):
+            return
+        self._background = asyncio.ensure_future(self._load())
+
+    async def _load(self):
+        """One (re)load at a time, recording failures for the retry backoff"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._current():
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.load_failures += 1
+                self.last_error = str(e) or type(e).__name__
+                delay = min(self.retry_seconds * 2 ** (self.load_failures - 1), self.retry_max_seconds)
+                self._retry_at = time.monotonic() + delay
+                if not self.loaded:
+                    raise CatalogUnavailable(f"Catalog load failed, retrying in {delay:.0f}s: {self.last_error}") from e
+                print(f"⚠️ Catalog reload failed, serving the previous snapshot for {delay:.0f}s: {self.last_error}")
+                return
+            self.load_failures = 0
+            self.last_error = None
+            self._retry_at = 0.0
+
+    async def refresh(self):
+        """Reload every row and rebuild all indexes"""
+        self._writes_during_refresh = []
+        try:
+            rows = await self.db.get_all_destinations(page_size=self.page_size)
+        finally:
+            writes, self._writes_during_refresh = self._writes_during_refresh, None
+        by_id = {row["id"]: row for row in rows}
+        # The read may predate writes this process made while it was in flight
+        for destination_id, row in writes:
+            if row is None:
+                by_id.pop(destination_id, None)
+            else:
+                by_id[destination_id] = row
+        rows = list(by_id.values())
+        self.rows = by_id
+        timestamps = [parse_timestamp(row.get("updated_at") or row.get("created_at")) for row in rows]
+        self._touch(max((stamp for stamp in timestamps if stamp is not None), default=None))
+        for index in self.indexes:
+            index.rebuild(rows)
+        self.generation += 1
+        self.loaded_at = time.monotonic()
+
+    def upsert(self, row: Optional[Dict[str, Any]]):
+        """Apply a created or updated row"""
+        if not row or "id" not in row:
+            return
+        if self._writes_during_refresh is not None:
+            self._writes_during_refresh.append((row["id"], row))
+        if not self.loaded:
+            return
+        self.rows[row["id"]] = row
+        self._touch(datetime.now(timezone.utc))
+        for index in self.indexes:
+            index.upsert(row)
+
+    def remove(self, destination_id: int):
+        """Apply a deleted row"""
+        if self._writes_during_refresh is not None:
+            self._writes_during_refresh.append((destination_id, None))
+        if not self.loaded or self.rows.pop(destination_id, None) is None:
+            return
+        self._touch(datetime.now(timezone.utc))
+        for index in self.indexes:
+            index.remove(destination_id)
+
+    def _touch(self, stamp: Optional[datetime]):
+        """Advance last_modified; it never moves backwards"""
+        if stamp is not None and (self.last_modified is None or stamp > self.last_modified):
+            self.last_modified = stamp
+
+    def last_modified_iso(self) -> Optional[str]:
+        return self.last_modified.isoformat() if self.last_modified else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "rows": len(self.rows),
+            "indexes": [type(index).__name__ for index in self.indexes],
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded else None,
+            "last_modified": self.last_modified_iso(),
+            "load_failures": self.load_failures,
+            "last_error": self.last_error,
+            "retry_in_seconds": round(max(self._retry_at - time.monotonic(), 0.0), 1)
+        }
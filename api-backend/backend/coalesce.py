@@ -0,0 +1,53 @@
+"""
+Request Coalescing
+Single-flight execution: concurrent identical reads share one in-flight call
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Run at most one call per key at a time; callers arriving meanwhile await the same result.
+
+    The call runs as its own task, so a caller that gives up (client
+    disconnect, timeout) cancels only its own wait, never the shared call.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.peak_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.peak_waiters = max(self.peak_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]"):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        requested = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requested, 4) if requested else 0.0,
+            "in_flight": len(self._tasks),
+            "peak_waiters": self.peak_waiters
+        }
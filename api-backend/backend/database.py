@@ -5,10 +5,13 @@ Handles all database operations
 
 import os
 from supabase import create_client, Client
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from .coalesce import SingleFlight
+
 class SupabaseClient:
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
@@ -27,6 +30,37 @@ class SupabaseClient:
             except Exception as e:
                 print(f"❌ Failed to initialize Supabase client: {e}")
                 self.client = None
+        
+        # The supabase client is synchronous; run its calls on a bounded worker
+        # pool so a slow round trip never blocks the event loop
+        self.max_concurrency = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "32"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="supabase"
+        )
+        
+        # Concurrent identical reads share one round trip
+        self.coalesce_reads = os.getenv("DB_COALESCE_READS", "true").lower() == "true"
+        self.reads = SingleFlight()
+        self.writes_started = 0
+    
+    async def _execute(self, query):
+        """Execute a PostgREST query builder off the event loop"""
+        if getattr(query, "http_method", None) != "GET":
+            self.writes_started += 1
+        elif self.coalesce_reads:
+            # A read issued after a write never joins one that started before it
+            key = (self.writes_started, query.path, str(query.params), query.headers.get("prefer"))
+            return await self.reads.do(key, lambda: self._run(query))
+        return await self._run(query)
+    
+    async def _run(self, query):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, query.execute)
+    
+    def close(self):
+        """Release the worker pool"""
+        self._executor.shutdown(wait=False)
     
     async def test_connection(self) -> bool:
         """Test the Supabase connection"""
@@ -35,7 +69,7 @@ class SupabaseClient:
         
         try:
             # Try to fetch one record to test connection
-            result = self.client.table("destinations").select("id").limit(1).execute()
+            result = await self._execute(self.client.table("destinations").select("id").limit(1))
             return True
         except Exception as e:
             print(f"❌ Supabase connection test failed: {e}")
@@ -45,14 +79,15 @@ class SupabaseClient:
         self, 
         limit: int = 20, 
         featured: Optional[bool] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        columns: str = "*"
     ) -> List[Dict[str, Any]]:
         """Get destinations with optional filters"""
         if not self.client:
             return self._get_mock_destinations()
         
         try:
-            query = self.client.table("destinations").select("*")
+            query = self.client.table("destinations").select(columns)
             
             if featured is not None:
                 query = query.eq("featured", featured)
@@ -60,20 +95,123 @@ class SupabaseClient:
             if category:
                 query = query.eq("category", category)
             
-            result = query.limit(limit).execute()
+            result = await self._execute(query.limit(limit))
             return result.data
         except Exception as e:
             print(f"❌ Error fetching destinations: {e}")
             return self._get_mock_destinations()
     
-    async def get_destination_by_id(self, destination_id: int) -> Optional[Dict[str, Any]]:
+    async def get_destinations_page(
+        self,
+        sort: str,
+        descending: bool,
+        limit: int,
+        after: Optional[Tuple[Any, int]] = None,
+        featured: Optional[bool] = None,
+        category: Optional[str] = None,
+        columns: str = "*"
+    ) -> List[Dict[str, Any]]:
+        """One keyset page ordered by (sort, id); `after` is the last (value, id) already returned"""
+        if not self.client:
+            rows = [
+                dest for dest in self._get_mock_destinations()
+                if (featured is None or dest["featured"] == featured) and (not category or dest["category"] == category)
+            ]
+            rows.sort(key=lambda dest: (dest.get(sort) is None, dest.get(sort) or 0, dest["id"]), reverse=descending)
+            if after is not None:
+                marker = (after[0] is None, after[0] or 0, after[1])
+                rows = [
+                    dest for dest in rows
+                    if ((dest.get(sort) is None, dest.get(sort) or 0, dest["id"]) < marker) == descending
+                    and dest["id"] != after[1]
+                ]
+            return rows[:limit]
+        
+        try:
+            query = self.client.table("destinations").select(columns)
+            if featured is not None:
+                query = query.eq("featured", featured)
+            if category:
+                query = query.eq("category", category)
+            if after is not None:
+                query = query.or_(self._keyset_filter(sort, descending, *after))
+            query = query.order(sort, desc=descending).order("id", desc=descending).limit(limit)
+            result = await self._execute(query)
+            return result.data
+        except Exception as e:
+            print(f"❌ Error fetching destinations page: {e}")
+            raise
+    
+    @staticmethod
+    def _keyset_filter(sort: str, descending: bool, value: Any, last_id: int) -> str:
+        """PostgREST `or` filter selecting rows after (value, id); NULLs sort last ascending, first descending"""
+        op = "lt" if descending else "gt"
+        if value is None:
+            if descending:
+                return f"{sort}.not.is.null,and({sort}.is.null,id.{op}.{last_id})"
+            return f"and({sort}.is.null,id.{op}.{last_id})"
+        quoted = '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        clause = f"{sort}.{op}.{quoted},and({sort}.eq.{quoted},id.{op}.{last_id})"
+        return clause if descending else f"{clause},{sort}.is.null"
+    
+    async def iter_destinations(self, page_size: int = 1000, columns: str = "*") -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the whole table one page at a time in id order (keyset, so only one page is held)"""
+        if not self.client:
+            yield self._get_mock_destinations()
+            return
+        
+        last_id = None
+        while True:
+            query = self.client.table("destinations").select(columns).order("id").limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            result = await self._execute(query)
+            if result.data:
+                yield result.data
+            if len(result.data) < page_size:
+                return
+            last_id = result.data[-1]["id"]
+    
+    async def get_all_destinations(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        """Get every destination, paging through the table by id"""
+        rows: List[Dict[str, Any]] = []
+        try:
+            async for page in self.iter_destinations(page_size):
+                rows.extend(page)
+            return rows
+        except Exception as e:
+            print(f"❌ Error loading destination catalog: {e}")
+            raise
+    
+    async def count_destinations(self, category: Optional[str] = None, state: Optional[str] = None) -> int:
+        """Exact row count via PostgREST's count=exact (no rows transferred)"""
+        if not self.client:
+            mock_data = self._get_mock_destinations()
+            return len([
+                dest for dest in mock_data
+                if (category is None or dest["category"] == category) and (state is None or dest["state"] == state)
+            ])
+        
+        try:
+            query = self.client.table("destinations").select("id", count="exact").limit(0)
+            if category:
+                query = query.eq("category", category)
+            if state:
+                query = query.eq("state", state)
+            result = await self._execute(query)
+            return result.count or 0
+        except Exception as e:
+            print(f"❌ Error counting destinations: {e}")
+            raise
+    
+    async def get_destination_by_id(self, destination_id: int, columns: str = "*") -> Optional[Dict[str, Any]]:
         """Get a specific destination by ID"""
         if not self.client:
             mock_data = self._get_mock_destinations()
             return next((dest for dest in mock_data if dest["id"] == destination_id), None)
         
         try:
-            result = self.client.table("destinations").select("*").eq("id", destination_id).execute()
+            result = await self._execute(self.client.table("destinations").select(columns).eq("id", destination_id))
             return result.data[0] if result.data else None
         except Exception as e:
             print(f"❌ Error fetching destination {destination_id}: {e}")
@@ -85,7 +223,7 @@ class SupabaseClient:
             raise Exception("Database not available in mock mode")
         
         try:
-            result = self.client.table("destinations").insert(destination_data).execute()
+            result = await self._execute(self.client.table("destinations").insert(destination_data))
             return result.data[0]
         except Exception as e:
             print(f"❌ Error creating destination: {e}")
@@ -97,7 +235,7 @@ class SupabaseClient:
             raise Exception("Database not available in mock mode")
         
         try:
-            result = self.client.table("destinations").update(destination_data).eq("id", destination_id).execute()
+            result = await self._execute(self.client.table("destinations").update(destination_data).eq("id", destination_id))
             return result.data[0] if result.data else None
         except Exception as e:
             print(f"❌ Error updating destination {destination_id}: {e}")
@@ -109,13 +247,51 @@ class SupabaseClient:
             raise Exception("Database not available in mock mode")
         
         try:
-            result = self.client.table("destinations").delete().eq("id", destination_id).execute()
+            result = await self._execute(self.client.table("destinations").delete().eq("id", destination_id))
             return len(result.data) > 0
         except Exception as e:
             print(f"❌ Error deleting destination {destination_id}: {e}")
             raise
     
-    async def search_destinations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def insert_destinations(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert many destinations in one statement; returns the created rows in order"""
+        if not self.client:
+            raise Exception("Database not available in mock mode")
+
+        try:
+            result = await self._execute(self.client.table("destinations").insert(rows))
+            return result.data
+        except Exception as e:
+            print(f"❌ Error inserting {len(rows)} destinations: {e}")
+            raise
+
+    async def upsert_destinations(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert or replace many destinations by id in one statement"""
+        if not self.client:
+            raise Exception("Database not available in mock mode")
+
+        try:
+            result = await self._execute(self.client.table("destinations").upsert(rows, on_conflict="id"))
+            return result.data
+        except Exception as e:
+            print(f"❌ Error upserting {len(rows)} destinations: {e}")
+            raise
+
+    async def delete_destinations(self, destination_ids: List[int]) -> List[int]:
+        """Delete many destinations in one statement; returns the ids that existed"""
+        if not self.client:
+            raise Exception("Database not available in mock mode")
+
+        try:
+            result = await self._execute(
+                self.client.table("destinations").delete().in_("id", destination_ids)
+            )
+            return [row["id"] for row in result.data]
+        except Exception as e:
+            print(f"❌ Error deleting {len(destination_ids)} destinations: {e}")
+            raise
+
+    async def search_destinations(self, query: str, limit: int = 10, columns: str = "*") -> List[Dict[str, Any]]:
         """Search destinations by text"""
         if not self.client:
             mock_data = self._get_mock_destinations()
@@ -129,9 +305,9 @@ class SupabaseClient:
         
         try:
             # Use text search or multiple OR conditions
-            result = self.client.table("destinations").select("*").or_(
+            result = await self._execute(self.client.table("destinations").select(columns).or_(
                 f"name.ilike.%{query}%,location.ilike.%{query}%,description.ilike.%{query}%"
-            ).limit(limit).execute()
+            ).limit(limit))
             return result.data
         except Exception as e:
             print(f"❌ Error searching destinations: {e}")
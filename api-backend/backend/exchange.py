@@ -0,0 +1,176 @@
+"""
+Catalog Export and Import
+Streaming NDJSON / CSV encoders and incremental parsers that move the table in bounded batches
+"""
+
+import csv
+import io
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .projection import DESTINATION_FIELDS
+from .responses import dumps, loads
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Parsed record: (line number, row or None, error message or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+def exchange_format(requested: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """"ndjson" or "csv" from an explicit format= value or a media type; None if unsupported"""
+    if requested:
+        return requested.lower() if requested.lower() in EXPORT_FORMATS else None
+    media_types = [part.split(";")[0].strip().lower() for part in (content_type or "").split(",")]
+    for name, media_type in EXPORT_FORMATS.items():
+        if media_type in media_types or (name == "ndjson" and "application/jsonl" in media_types):
+            return name
+    if not content_type or "*/*" in media_types:
+        return "ndjson"
+    return None
+
+async def encode_export(pages: AsyncIterator[List[Dict[str, Any]]], fmt: str, fields: Optional[Sequence[str]] = None) -> AsyncIterator[bytes]:
+    """Encode pages of rows as they arrive; one page is the most ever held"""
+    columns = list(fields or DESTINATION_FIELDS)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        async for page in pages:
+            for row in page:
+                writer.writerow([_csv_value(row.get(column)) for column in columns])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+        return
+
+    async for page in pages:
+        yield b"".join(dumps({column: row.get(column) for column in columns}) + b"\n" for row in page)
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without holding more than one partial line"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+        if len(pending) > max_line_bytes:
+            raise ValueError(f"Line longer than {max_line_bytes} bytes")
+    if pending.strip():
+        yield pending.rstrip(b"\r")
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str, max_line_bytes: int = 1024 * 1024) -> AsyncIterator[Record]:
+    """Parse an NDJSON or CSV (header row first) body record by record"""
+    line_number = 0
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks, max_line_bytes):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, "Each line must be a JSON object"
+        return
+
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    first_line = 0
+    async for line in iter_lines(chunks, max_line_bytes):
+        line_number += 1
+        try:
+            text = line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError as e:
+            yield line_number, None, f"Invalid UTF-8: {e}"
+            continue
+        if not pending:
+            first_line = line_number
+        pending.append(text)
+        record_text = "\n".join(pending)
+        # An odd number of quotes means a quoted field continues on the next line
+        if record_text.count('"') % 2:
+            if len(record_text) > max_line_bytes:
+                raise ValueError(f"Unterminated quoted field starting on line {first_line}")
+            continue
+        pending = []
+        if not record_text.strip():
+            continue
+        values = next(csv.reader([record_text]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if len(values) != len(header):
+            yield first_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells are left out so model defaults apply (featured=false, image_url=null)
+        yield first_line, {column: value for column, value in zip(header, values) if value != ""}, None
+    if pending:
+        yield first_line, None, "Unterminated quoted field"
+
+async def import_records(
+    records: AsyncIterator[Record],
+    write: Callable[[List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+    batch_size: int,
+    max_errors: int = 100
+) -> Dict[str, Any]:
+    """Feed parsed records to a bulk write in batches of `batch_size`, keeping counts and the first errors.
+
+    The next batch is not read until the previous one is written, so a slow
+    database pushes back on the upload instead of buffering it.
+    """
+    counts: Dict[str, int] = {}
+    errors: List[Dict[str, Any]] = []
+    batch: List[Dict[str, Any]] = []
+    batch_lines: List[int] = []
+
+    def note(status: str, line: int, error: Optional[str]):
+        counts[status] = counts.get(status, 0) + 1
+        if error and len(errors) < max_errors:
+            errors.append({"line": line, "status": status, "error": error})
+
+    async def flush():
+        report = await write(batch)
+        for result in report["results"]:
+            note(result["status"], batch_lines[result["index"]], result.get("error"))
+        batch.clear()
+        batch_lines.clear()
+
+    aborted = None
+    try:
+        async for line, record, error in records:
+            if record is None:
+                note("invalid", line, error)
+                continue
+            batch.append(record)
+            batch_lines.append(line)
+            if len(batch) >= batch_size:
+                await flush()
+    except ValueError as e:
+        aborted = str(e)
+    if batch:
+        await flush()
+
+    errors.sort(key=lambda error: error["line"])
+    failed = sum(count for status, count in counts.items() if status in ("invalid", "failed"))
+    summary = {
+        "rows": sum(counts.values()),
+        "counts": counts,
+        "errors": errors,
+        "errors_truncated": failed > len(errors)
+    }
+    if aborted:
+        summary["aborted"] = aborted
+    return summary
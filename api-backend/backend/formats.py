@@ -0,0 +1,122 @@
+"""
+Binary Response Formats
+MessagePack and Arrow IPC encodings of catalog responses, negotiated from the Accept header
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from .projection import DESTINATION_FIELDS
+from .responses import FastJSONResponse, _default, dumps
+
+# Both encoders are optional (pip install msgpack pyarrow); JSON is always available
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+MEDIA_TYPE_ALIASES = {
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    ARROW: ARROW
+}
+
+if ARROW_AVAILABLE:
+    ARROW_TYPES = {
+        "id": pa.int64(),
+        "name": pa.string(),
+        "location": pa.string(),
+        "state": pa.string(),
+        "description": pa.string(),
+        "image_url": pa.string(),
+        "category": pa.string(),
+        "rating": pa.float64(),
+        "price_from": pa.int64(),
+        "featured": pa.bool_(),
+        # ISO 8601 text as stored by PostgREST
+        "created_at": pa.string()
+    }
+
+def supported_formats(columnar: bool = True) -> List[str]:
+    """Media types this process can produce"""
+    formats = [JSON]
+    if MSGPACK_AVAILABLE:
+        formats.append(MSGPACK)
+    if ARROW_AVAILABLE and columnar:
+        formats.append(ARROW)
+    return formats
+
+def negotiate(accept: Optional[str], columnar: bool = True) -> Optional[str]:
+    """Best supported media type for an Accept header, JSON when absent, None if nothing acceptable.
+
+    `columnar` is False for responses that are not a list of rows (Arrow needs a table).
+    """
+    if not accept or not accept.strip():
+        return JSON
+    supported = supported_formats(columnar)
+    candidates = []
+    for position, part in enumerate(accept.lower().split(",")):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidate = MEDIA_TYPE_ALIASES.get(media_type.strip())
+        if candidate in supported and quality > 0:
+            candidates.append((-quality, position, candidate))
+    return min(candidates)[2] if candidates else None
+
+def _plain(value: Any) -> Any:
+    return _default(value) if isinstance(value, BaseModel) else value
+
+def encode_msgpack(content: Any) -> bytes:
+    return msgpack.packb(content, default=_default, use_bin_type=True)
+
+def encode_arrow(rows: Sequence[Any], fields: Optional[Sequence[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> bytes:
+    """One record batch in an Arrow IPC stream, built column by column straight from the rows.
+
+    The rest of the JSON envelope (count, next_cursor, filters...) travels as
+    the schema's "envelope" metadata.
+    """
+    rows = [_plain(row) for row in rows]
+    names = [field for field in (fields or DESTINATION_FIELDS) if field in ARROW_TYPES]
+    schema = pa.schema(
+        [pa.field(name, ARROW_TYPES[name]) for name in names],
+        metadata={"envelope": dumps(metadata or {})}
+    )
+    arrays = [pa.array([row.get(name) for row in rows], type=ARROW_TYPES[name]) for name in names]
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+    return sink.getvalue().to_pybytes()
+
+def render(media_type: str, content: Dict[str, Any], rows_key: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> Response:
+    """Encode a response envelope as the negotiated media type"""
+    if media_type == MSGPACK:
+        return Response(encode_msgpack(content), media_type=MSGPACK)
+    if media_type == ARROW:
+        envelope = {key: value for key, value in content.items() if key != rows_key}
+        return Response(encode_arrow(content[rows_key], fields, envelope), media_type=ARROW)
+    return FastJSONResponse(content)
@@ -0,0 +1,207 @@
+"""
+Destination Gazetteer
+Place names from the catalog (name, location, state) plus aliases, linked to destination IDs in one pass over a message
+"""
+
+import bisect
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalog import CatalogIndex
+from .retrieval import STOPWORDS
+from .suggest import normalize, rank_key
+
+# Lower ranks first: a message naming a destination means that one, not every destination in its state
+GAZETTEER_FIELDS = {"name": 0, "location": 1, "state": 2}
+
+# Alias -> catalog phrase. A phrase present in the catalog always wins over an alias of the
+# same text, so both spellings can be listed and whichever the catalog uses is the target.
+DEFAULT_ALIASES: Dict[str, str] = {
+    "bombay": "mumbai",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "bangalore": "bengaluru",
+    "bengaluru": "bangalore",
+    "new delhi": "delhi",
+    "taj": "taj mahal",
+    "benares": "varanasi",
+    "banaras": "varanasi",
+    "kashi": "varanasi",
+    "cochin": "kochi",
+    "kochi": "cochin",
+    "pondicherry": "puducherry",
+    "puducherry": "pondicherry",
+    "trivandrum": "thiruvananthapuram",
+    "gurgaon": "gurugram",
+    "simla": "shimla",
+    "ooty": "udhagamandalam",
+    "udhagamandalam": "ooty"
+}
+
+Phrase = Tuple[str, ...]
+Entry = Tuple  # (field rank,) + suggest.rank_key(row), which ends with the destination id
+
+def phrase_of(text: str) -> Phrase:
+    return tuple(normalize(text).split())
+
+def linkable(phrase: Phrase) -> bool:
+    """Skip values that would fire on ordinary words ("the", "goa" is fine, "in" is not)"""
+    if not phrase or all(word in STOPWORDS for word in phrase):
+        return False
+    return len(phrase) > 1 or len(phrase[0]) >= 3
+
+def load_aliases(path: Optional[str]) -> Dict[str, str]:
+    """DEFAULT_ALIASES overlaid with a JSON object of alias -> catalog phrase"""
+    aliases = dict(DEFAULT_ALIASES)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as aliases_file:
+                aliases.update({str(alias): str(target) for alias, target in json.load(aliases_file).items()})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Gazetteer aliases not loaded from {path}: {e}")
+    return aliases
+
+class Gazetteer(CatalogIndex):
+    """Token-keyed phrase index resolving place names in a message to destination IDs.
+
+    Phrases are hashed whole, and each first token records the phrase lengths
+    starting with it, so linking a message costs one dict lookup per message
+    token plus one per candidate length, however large the catalog is. Each
+    phrase keeps its destinations in rank order, so the best matches are a slice.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, max_ids: Optional[int] = None):
+        if aliases is None:
+            aliases = load_aliases(os.getenv("GAZETTEER_ALIASES_PATH"))
+        self.aliases: Dict[Phrase, Phrase] = {}
+        for alias, target in aliases.items():
+            alias_phrase, target_phrase = phrase_of(alias), phrase_of(target)
+            if linkable(alias_phrase) and target_phrase and alias_phrase != target_phrase:
+                self.aliases[alias_phrase] = target_phrase
+        self.max_ids = max_ids or int(os.getenv("GAZETTEER_MAX_IDS", "10"))
+        self.entries: Dict[Phrase, List[Entry]] = {}
+        self.doc_entries: Dict[int, List[Tuple[Phrase, Entry]]] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        # first token -> {phrase length: number of phrases}; aliases are counted once, for good
+        self.starts: Dict[str, Dict[int, int]] = {}
+        for alias in self.aliases:
+            self._add_start(alias)
+        self.links = 0
+        self.linked = 0
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self.entries = {}
+        self.doc_entries = {}
+        self.rows = {}
+        self.starts = {}
+        for alias in self.aliases:
+            self._add_start(alias)
+        for row in rows:
+            for phrase, entry in self._row_entries(row):
+                self.entries.setdefault(phrase, []).append(entry)
+        for phrase, entries in self.entries.items():
+            entries.sort()
+            if phrase not in self.aliases:
+                self._add_start(phrase)
+
+    def upsert(self, row: Dict[str, Any]):
+        self.remove(row["id"])
+        for phrase, entry in self._row_entries(row):
+            entries = self.entries.get(phrase)
+            if entries is None:
+                entries = self.entries[phrase] = []
+                if phrase not in self.aliases:
+                    self._add_start(phrase)
+            bisect.insort(entries, entry)
+
+    def remove(self, destination_id: int):
+        self.rows.pop(destination_id, None)
+        for phrase, entry in self.doc_entries.pop(destination_id, []):
+            entries = self.entries.get(phrase, [])
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+            if not entries:
+                self.entries.pop(phrase, None)
+                if phrase not in self.aliases:
+                    self._drop_start(phrase)
+
+    def _row_entries(self, row: Dict[str, Any]) -> List[Tuple[Phrase, Entry]]:
+        """The (phrase, entry) pairs a row contributes; a phrase is kept once, at its best field"""
+        best: Dict[Phrase, int] = {}
+        for field, field_rank in GAZETTEER_FIELDS.items():
+            phrase = phrase_of(str(row.get(field) or ""))
+            if linkable(phrase) and field_rank < best.get(phrase, len(GAZETTEER_FIELDS)):
+                best[phrase] = field_rank
+        rank = rank_key(row)
+        pairs = [(phrase, (field_rank,) + rank) for phrase, field_rank in best.items()]
+        self.rows[row["id"]] = row
+        self.doc_entries[row["id"]] = pairs
+        return pairs
+
+    def _add_start(self, phrase: Phrase):
+        lengths = self.starts.setdefault(phrase[0], {})
+        lengths[len(phrase)] = lengths.get(len(phrase), 0) + 1
+
+    def _drop_start(self, phrase: Phrase):
+        lengths = self.starts.get(phrase[0], {})
+        if lengths.get(len(phrase), 0) > 1:
+            lengths[len(phrase)] -= 1
+        else:
+            lengths.pop(len(phrase), None)
+            if not lengths:
+                self.starts.pop(phrase[0], None)
+
+    def _resolve(self, phrase: Phrase) -> Tuple[Phrase, List[Entry]]:
+        """Catalog phrase first, then the alias target"""
+        entries = self.entries.get(phrase)
+        if entries:
+            return phrase, entries
+        target = self.aliases.get(phrase)
+        if target is not None:
+            return target, self.entries.get(target, [])
+        return phrase, []
+
+    def link(self, message: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Place names in a message and the destination IDs they refer to, best first.
+
+        Returns {"entities": [phrase, ...], "destination_ids": [id, ...]}; at each
+        position the longest phrase wins and its words are not matched again.
+        """
+        limit = limit or self.max_ids
+        tokens = normalize(message).split()
+        entities: Dict[str, None] = {}
+        candidates: List[Entry] = []
+        position, count = 0, len(tokens)
+        while position < count:
+            matched = 0
+            for length in sorted(self.starts.get(tokens[position], ()), reverse=True):
+                if position + length > count:
+                    continue
+                canonical, entries = self._resolve(tuple(tokens[position:position + length]))
+                if entries:
+                    entities[" ".join(canonical)] = None
+                    candidates.extend(entries[:limit])
+                    matched = length
+                    break
+            position += matched or 1
+
+        destination_ids: List[int] = []
+        for entry in sorted(candidates):
+            if entry[-1] not in destination_ids:
+                destination_ids.append(entry[-1])
+                if len(destination_ids) == limit:
+                    break
+        self.links += 1
+        self.linked += bool(destination_ids)
+        return {"entities": list(entities), "destination_ids": destination_ids}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "phrases": len(self.entries),
+            "aliases": len(self.aliases),
+            "destinations": len(self.rows),
+            "links": self.links,
+            "linked": self.linked
+        }
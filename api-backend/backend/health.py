@@ -0,0 +1,125 @@
+"""
+Health Monitor
+Background probes of Supabase and the LLM providers; /health and /ready read the last results
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .database import SupabaseClient
+from .http_clients import HTTPClientManager
+
+UP, DOWN, MOCK, NOT_CONFIGURED, PENDING = "up", "down", "mock", "not_configured", "pending"
+
+class HealthMonitor:
+    """Probes dependencies on a fixed interval so probe traffic does not scale with callers.
+
+    Each check keeps its last status, latency, error and timestamps; readers
+    never trigger a probe themselves.
+    """
+
+    def __init__(self, db: SupabaseClient, http_clients: HTTPClientManager, provider_keys: Dict[str, Optional[str]]):
+        self.db = db
+        self.http_clients = http_clients
+        self.provider_keys = provider_keys
+        self.interval = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+        self.timeout = float(os.getenv("HEALTH_PROBE_TIMEOUT", "5"))
+        self.checks: Dict[str, Dict[str, Any]] = {
+            name: {"status": PENDING, "checked_at": None, "last_ok_at": None,
+                   "latency_ms": None, "error": None, "consecutive_failures": 0}
+            for name in ["supabase", *provider_keys]
+        }
+        self.probe_runs = 0
+        self._last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the probe loop (called on application startup)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the probe loop (called on application shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        """Run every probe concurrently and record the results"""
+        probes: Dict[str, Callable[[], Awaitable[str]]] = {"supabase": self._probe_supabase}
+        for provider in self.provider_keys:
+            probes[provider] = lambda provider=provider: self._probe_provider(provider)
+        await asyncio.gather(*(self._record(name, probe) for name, probe in probes.items()))
+        self.probe_runs += 1
+        self._last_run = time.monotonic()
+
+    async def _record(self, name: str, probe: Callable[[], Awaitable[str]]):
+        check = self.checks[name]
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(probe(), timeout=self.timeout)
+            error = None
+        except Exception as e:
+            status, error = DOWN, str(e) or type(e).__name__
+        check["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        check["checked_at"] = datetime.now().isoformat()
+        check["error"] = error
+        if status == DOWN:
+            if check["status"] != DOWN:
+                print(f"🔴 Health probe failed for {name}: {error}")
+            check["consecutive_failures"] += 1
+        else:
+            if check["status"] == DOWN:
+                print(f"🟢 {name} recovered")
+            check["consecutive_failures"] = 0
+            check["last_ok_at"] = check["checked_at"]
+        check["status"] = status
+
+    async def _probe_supabase(self) -> str:
+        if not self.db.client:
+            return MOCK
+        if await self.db.test_connection():
+            return UP
+        raise ConnectionError("Supabase query failed")
+
+    async def _probe_provider(self, provider: str) -> str:
+        api_key = self.provider_keys[provider]
+        if not api_key:
+            return NOT_CONFIGURED
+        response = await self.http_clients.client(provider).get(
+            "/models", headers={"Authorization": f"Bearer {api_key}"}
+        )
+        response.raise_for_status()
+        return UP
+
+    def status(self, name: str) -> str:
+        return self.checks[name]["status"]
+
+    @property
+    def stale(self) -> bool:
+        """True when the probe loop has not completed a run within three intervals"""
+        return self._last_run is None or time.monotonic() - self._last_run > 3 * self.interval
+
+    def ready(self) -> bool:
+        """Ready once the database has been probed and is usable (live or mock data)"""
+        return not self.stale and self.status("supabase") in (UP, MOCK)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "probe_runs": self.probe_runs,
+            "stale": self.stale,
+            "checks": {name: dict(check) for name, check in self.checks.items()}
+        }
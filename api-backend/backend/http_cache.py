@@ -0,0 +1,202 @@
+"""
+HTTP Caching and Compression
+ETag / If-None-Match handling and response compression for the catalog endpoints
+"""
+
+import gzip
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import TTLCache
+
+# brotli is optional (pip install brotli); gzip is always available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header (honouring q=0), or None"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if BROTLI_AVAILABLE and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in tags)
+
+class CompressionMiddleware:
+    """Compress complete response bodies above `minimum_size` with brotli or gzip.
+
+    Streaming responses (server-sent events, exports) are passed through
+    untouched so every chunk reaches the client as soon as it is sent.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", "")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Dict[str, Any] = {}
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal passthrough
+            if message["type"] == "http.response.start":
+                start.update(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = self.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+class ETagPolicy:
+    """What ConditionalGetMiddleware covers, how long clients may cache it, and its counters"""
+
+    def __init__(
+        self,
+        version: Callable[[str], Awaitable[str]],
+        paths: Sequence[str] = (),
+        prefixes: Sequence[str] = (),
+        max_age: int = 30,
+        stale_while_revalidate: int = 300,
+        cache: Optional[TTLCache] = None,
+        excluded: Sequence[str] = ()
+    ):
+        # Called with the request path, so routes with different sources can get different tokens
+        self.version = version
+        self.paths = frozenset(paths)
+        self.prefixes = tuple(prefixes)
+        self.excluded = frozenset(excluded)
+        self.cache_control = f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+        self.cache = cache
+        self.not_modified = 0
+
+    def covers(self, path: str) -> bool:
+        if path in self.excluded:
+            return False
+        return path in self.paths or (bool(self.prefixes) and path.startswith(self.prefixes))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "not_modified": self.not_modified,
+            "cache_control": self.cache_control,
+            "rendered_cache": self.cache.stats() if self.cache is not None else None
+        }
+
+class ConditionalGetMiddleware:
+    """Strong ETags from a catalog version token, 304s, Cache-Control, and a rendered-response cache.
+
+    The policy's `version` returns a token for the request path that changes
+    whenever that endpoint's output could change, so a matching If-None-Match is answered
+    without running the endpoint, and a repeat request without one is
+    replayed from the cache of (already compressed) bodies.
+    """
+
+    def __init__(self, app: ASGIApp, policy: ETagPolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        policy = self.policy
+        if scope["type"] != "http" or scope["method"] != "GET" or not policy.covers(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        # Each encoding (and media type) of the same data is its own representation
+        variant = "-".join(filter(None, [choose_encoding(headers.get("accept-encoding", "")), headers.get("accept")]))
+        token = await policy.version(scope["path"])
+        etag = f'"{token}-{zlib.crc32(variant.encode()):x}"' if variant else f'"{token}"'
+        common = [(b"etag", etag.encode()), (b"cache-control", policy.cache_control.encode()), (b"vary", b"Accept, Accept-Encoding")]
+
+        if _matches(headers.get("if-none-match", ""), etag):
+            policy.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": common})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cache = policy.cache
+        key = (etag, scope["path"], scope.get("query_string", b""))
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            start, body = cached
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Dict[str, Any] = {}
+        cacheable = True
+
+        async def send_with_etag(message: Message):
+            nonlocal cacheable
+            if message["type"] == "http.response.start":
+                if message["status"] == 200:
+                    response_headers = MutableHeaders(raw=message["headers"])
+                    response_headers["ETag"] = etag
+                    response_headers["Cache-Control"] = policy.cache_control
+                    response_headers.add_vary_header("Accept")
+                else:
+                    cacheable = False
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    cacheable = False
+                elif cacheable and cache is not None:
+                    body = message.get("body", b"")
+                    cache.set(key, (dict(start, headers=list(start["headers"])), body), size=len(body) + 512)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
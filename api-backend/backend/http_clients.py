@@ -0,0 +1,102 @@
+"""
+Shared HTTP Clients
+Application-lifetime pooled httpx clients for the LLM providers
+"""
+
+import os
+from typing import Any, Dict
+
+import httpx
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Default base URL, timeout and chat model per provider, overridable with
+# <PROVIDER>_BASE_URL / <PROVIDER>_TIMEOUT / <PROVIDER>_MODEL; keys come from <PROVIDER>_API_KEY
+PROVIDERS: Dict[str, Dict[str, Any]] = {
+    "groq": {"base_url": "https://api.groq.com/openai/v1", "timeout": 30.0, "model": "llama-3.1-70b-versatile"},
+    "openrouter": {"base_url": "https://openrouter.ai/api/v1", "timeout": 60.0, "model": "deepseek/deepseek-chat"},
+}
+
+def provider_setting(provider: str, name: str) -> Any:
+    """Resolve a provider setting from the environment, falling back to PROVIDERS"""
+    default = PROVIDERS[provider][name]
+    value = os.getenv(f"{provider.upper()}_{name.upper()}")
+    if value is None:
+        return default
+    return type(default)(value)
+
+class HTTPClientManager:
+    """Owns one keep-alive connection pool per provider for the lifetime of the app"""
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+        )
+        self.http2 = HTTP2_AVAILABLE and os.getenv("LLM_HTTP2", "true").lower() == "true"
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """Get the pooled client for a provider, creating it on first use"""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            stats = self._stats.setdefault(
+                provider, {"requests": 0, "connections_opened": 0, "tls_handshakes": 0}
+            )
+
+            async def trace(event: str, info: Dict[str, Any]):
+                if event == "connection.connect_tcp.complete":
+                    stats["connections_opened"] += 1
+                elif event == "connection.start_tls.complete":
+                    stats["tls_handshakes"] += 1
+
+            async def on_request(request: httpx.Request):
+                stats["requests"] += 1
+                request.extensions["trace"] = trace
+
+            client = httpx.AsyncClient(
+                base_url=provider_setting(provider, "base_url"),
+                timeout=httpx.Timeout(provider_setting(provider, "timeout"), connect=10.0),
+                limits=self.limits,
+                http2=self.http2,
+                event_hooks={"request": [on_request]}
+            )
+            self._clients[provider] = client
+        return client
+
+    async def start(self):
+        """Open the provider pools (called on application startup)"""
+        for provider in PROVIDERS:
+            self.client(provider)
+
+    async def close(self):
+        """Close every pool (called on application shutdown)"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider request and connection counters"""
+        providers = {}
+        for provider, stats in self._stats.items():
+            requests = stats["requests"]
+            reused = max(requests - stats["connections_opened"], 0)
+            providers[provider] = {
+                **stats,
+                "reused_connections": reused,
+                "reuse_ratio": round(reused / requests, 4) if requests else 0.0
+            }
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "providers": providers
+        }
@@ -0,0 +1,269 @@
+"""
+Intent Classification
+Keyword/phrase rules compiled into word-level lookup tables, weighted scoring, hot-reloadable from JSON
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Patterns match whole words; a trailing * also matches the regular inflections of
+# the word ("restaurant*" -> restaurants, "price*" -> pricing), not any word that
+# merely starts with it ("cost*" does not match costume). On equal scores the lower
+# priority wins.
+DEFAULT_RULES: Dict[str, Any] = {
+    "intents": {
+        "itinerary": {
+            "priority": 1,
+            "patterns": {
+                "itinerary": 3, "itineraries": 3, "trip plan*": 3, "trip planner": 3, "plan": 2, "plans": 2, "planning": 2,
+                "plan my": 3, "days in": 2, "day trip*": 1, "schedule": 1, "route": 1
+            }
+        },
+        "budget": {
+            "priority": 2,
+            "patterns": {
+                "budget*": 3, "cost*": 2, "price*": 2, "pricing": 2, "how much": 2, "money": 1,
+                "cheap*": 2, "cheaper": 2, "affordable": 2, "expensive": 2, "spend*": 1
+            }
+        },
+        "food": {
+            "priority": 3,
+            "patterns": {
+                "food*": 3, "foodie*": 3, "cuisine*": 3, "street food": 3, "eat": 2, "eating": 2, "restaurant*": 2,
+                "dish*": 2, "vegetarian": 1
+            }
+        },
+        "culture": {
+            "priority": 4,
+            "patterns": {
+                "culture*": 3, "cultural": 3, "festival*": 3, "tradition*": 2, "custom*": 1, "dance*": 1
+            }
+        },
+        "timing": {
+            "priority": 5,
+            "patterns": {
+                "weather": 3, "best time": 3, "when to visit": 3, "season*": 2, "monsoon": 2,
+                "climate": 2, "winter": 1, "summer": 1
+            }
+        }
+    },
+    # Canonical entity -> aliases; a message naming one but no intent is a "destination" question
+    "entities": {
+        "delhi": ["delhi", "new delhi"],
+        "agra": ["agra"],
+        "jaipur": ["jaipur"],
+        "mumbai": ["mumbai", "bombay"],
+        "goa": ["goa"],
+        "kerala": ["kerala"],
+        "rajasthan": ["rajasthan"],
+        "himalayas": ["himalaya*", "himalayan"],
+        "manali": ["manali"],
+        "taj mahal": ["taj mahal", "taj"],
+        "backwaters": ["backwater*"],
+        "golden triangle": ["golden triangle"]
+    },
+    "entity_intent": "destination",
+    "default_intent": "general",
+    # Confidence reported when nothing matched, so a fallback is distinguishable from a match
+    "default_confidence": 0.0
+}
+
+Match = Tuple[str, str, float]  # (kind, label, weight): ("intent", "budget", 2.0) or ("entity", "goa", 0)
+
+WORD = re.compile(r"\w+")
+
+# Suffixes a trailing-* pattern accepts; -er is left out because it turns nouns
+# into other nouns ("custom" -> customer)
+INFLECTIONS = ("", "s", "es", "d", "ed", "ing", "est", "ly", "al", "an")
+
+def inflections(pattern: str) -> FrozenSet[str]:
+    """Words a pattern word matches: itself, or for "stem*" the stem plus regular suffixes"""
+    if not pattern.endswith("*"):
+        return frozenset([pattern])
+    stem = pattern[:-1]
+    forms: Set[str] = {stem + suffix for suffix in INFLECTIONS}
+    if stem.endswith("e"):
+        # price -> pricing, culture -> cultural
+        forms |= {stem[:-1] + suffix for suffix in ("ing", "al")}
+    elif len(stem) >= 3 and stem[-1] not in "aeiouwxy" and stem[-2] in "aeiou" and stem[-3] not in "aeiou":
+        # plan -> planned, planning
+        forms |= {stem + stem[-1] + suffix for suffix in ("ed", "ing")}
+    return frozenset(forms)
+
+def _follows(tokens: List[str], start: int, words: List[FrozenSet[str]]) -> bool:
+    """Whether tokens from `start` match words[1:]"""
+    for offset, forms in enumerate(words[1:]):
+        if tokens[start + offset] not in forms:
+            return False
+    return True
+
+class CompiledRules:
+    """Every phrase of every intent and entity compiled into word-level lookup tables.
+
+    The message is tokenised once and scanned left to right: phrases are
+    found through their first word (longest first) and single words through
+    one dict lookup. Trailing-* patterns are expanded into their inflected
+    forms up front, so the cost is independent of the number of rules.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        intents = rules.get("intents", {})
+        self.priorities = {name: float(spec.get("priority", 100)) for name, spec in intents.items()}
+        self.entity_intent = rules.get("entity_intent", "destination")
+        self.default_intent = rules.get("default_intent", "general")
+        self.default_confidence = float(rules.get("default_confidence", 0.0))
+
+        entries: List[Tuple[str, Match]] = []
+        for name, spec in intents.items():
+            for phrase, weight in spec.get("patterns", {}).items():
+                entries.append((phrase, ("intent", name, float(weight))))
+        for entity, aliases in rules.get("entities", {}).items():
+            for alias in aliases:
+                entries.append((alias, ("entity", entity, 0.0)))
+        if not entries:
+            raise ValueError("Intent rules define no patterns")
+
+        self.words: Dict[str, Match] = {}
+        self.phrases: Dict[str, List[Tuple[List[FrozenSet[str]], Match]]] = {}
+        stems: List[Tuple[str, Match]] = []
+        for phrase, match in entries:
+            words = WORD.findall(phrase.lower()) + (["*"] if phrase.rstrip().endswith("*") else [])
+            if not words or words == ["*"]:
+                raise ValueError(f"Empty intent pattern: {phrase!r}")
+            if words[-1] == "*":
+                words = words[:-2] + [words[-2] + "*"]
+            if len(words) > 1:
+                forms = [inflections(word) for word in words]
+                for first in forms[0]:
+                    self.phrases.setdefault(first, []).append((forms, match))
+            elif words[0].endswith("*"):
+                stems.append((words[0], match))
+            else:
+                self.words[words[0]] = match
+        # Exact words win over inflected forms, and longer stems over shorter ones
+        for stem, match in sorted(stems, key=lambda item: -len(item[0])):
+            for form in inflections(stem):
+                self.words.setdefault(form, match)
+        for candidates in self.phrases.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))
+        self.size = len(entries)
+
+    def scan(self, message: str) -> List[Match]:
+        """Non-overlapping rule matches, longest phrase first at each word"""
+        tokens = WORD.findall(message.lower())
+        found: List[Match] = []
+        position, count = 0, len(tokens)
+        while position < count:
+            word = tokens[position]
+            phrases, match = self.phrases.get(word, ()), self.words.get(word)
+            for words, phrase_match in phrases:
+                end = position + len(words)
+                if end <= count and _follows(tokens, position + 1, words):
+                    found.append(phrase_match)
+                    position = end
+                    break
+            else:
+                if match is not None:
+                    found.append(match)
+                position += 1
+        return found
+
+    def classify(self, message: str) -> Dict[str, Any]:
+        scores: Dict[str, float] = {}
+        entities: List[str] = []
+        # Repeating a word ("food, food, food") counts once
+        for kind, label, weight in dict.fromkeys(self.scan(message)):
+            if kind == "intent":
+                scores[label] = scores.get(label, 0.0) + weight
+            elif label not in entities:
+                entities.append(label)
+
+        if scores:
+            intent_type = min(scores, key=lambda name: (-scores[name], self.priorities.get(name, 100)))
+            total = sum(scores.values())
+            # Saturates with evidence and drops when other intents compete
+            confidence = scores[intent_type] / (total + 1.0)
+        elif entities:
+            intent_type = self.entity_intent
+            confidence = len(entities) / (len(entities) + 1.0)
+        else:
+            intent_type = self.default_intent
+            confidence = self.default_confidence
+
+        return {
+            "type": intent_type,
+            "entities": entities,
+            "confidence": round(confidence, 2),
+            "scores": scores
+        }
+
+class IntentClassifier:
+    """Classify chat messages with compiled rules, reloading them when the rules file changes.
+
+    Without a rules file the built-in DEFAULT_RULES are used. A file that
+    fails to load or compile is reported and the previous rules stay live.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: Optional[float] = None):
+        self.path = path if path is not None else os.getenv("INTENT_RULES_PATH")
+        self.check_interval = check_interval if check_interval is not None else float(os.getenv("INTENT_RULES_CHECK_SECONDS", "5"))
+        self.rules = CompiledRules(DEFAULT_RULES)
+        self.source = "builtin"
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+        self.classified = 0
+        self.fallbacks = 0
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        if self.path:
+            self.maybe_reload(force=True)
+
+    def classify(self, message: str) -> Dict[str, Any]:
+        self.maybe_reload()
+        intent = self.rules.classify(message)
+        self.classified += 1
+        if not intent["scores"] and not intent["entities"]:
+            self.fallbacks += 1
+        return intent
+
+    def maybe_reload(self, force: bool = False) -> bool:
+        """Recompile if the rules file changed; checked at most every `check_interval` seconds"""
+        if not self.path:
+            return False
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+            if not force and mtime == self._mtime:
+                return False
+            # A broken version is tried once, not on every check
+            self._mtime = mtime
+            with open(self.path, encoding="utf-8") as rules_file:
+                rules = CompiledRules(json.load(rules_file))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.reload_errors += 1
+            if str(e) != self.last_error:
+                print(f"⚠️ Intent rules not reloaded from {self.path}: {e}")
+            self.last_error = str(e)
+            return False
+        self.rules, self.source, self.last_error = rules, self.path, None
+        self.reloads += 1
+        print(f"✅ Intent rules loaded from {self.path} ({rules.size} patterns)")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "patterns": self.rules.size,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "last_error": self.last_error,
+            "classified": self.classified,
+            "fallbacks": self.fallbacks
+        }
@@ -0,0 +1,297 @@
+"""
+LLM Provider Router
+Latency-ranked chat providers with hedged requests, failover and a per-provider circuit breaker
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .http_clients import HTTPClientManager, PROVIDERS, provider_setting
+
+class ProviderStats:
+    """Rolling latency window and failure streak of one provider"""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.wins = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "samples": len(self.latencies),
+            "circuit_open": self.open_until > time.monotonic(),
+            "last_error": self.last_error
+        }
+
+class LLMRouter:
+    """Send a chat completion to the fastest healthy provider, hedging slow attempts.
+
+    Providers with an API key are ranked by median latency (time to first
+    token when streaming). The best one is tried first; if it has not
+    answered within its own p95 latency a second provider is started, and
+    a failure starts the next one at once. The first answer wins and the
+    other attempts are cancelled, so the tail is bounded by the fastest
+    healthy provider rather than the slowest. A provider that fails
+    `failure_threshold` times in a row is skipped for `cooldown` seconds.
+    Returns None when every provider fails so callers can answer locally.
+    """
+
+    def __init__(self, http_clients: HTTPClientManager, providers: Optional[List[str]] = None):
+        self.http_clients = http_clients
+        names = providers or [name.strip() for name in os.getenv("LLM_PROVIDERS", "groq,openrouter").split(",") if name.strip()]
+        self.api_keys: Dict[str, Optional[str]] = {
+            name: os.getenv(f"{name.upper()}_API_KEY") for name in names if name in PROVIDERS
+        }
+        # Configured order breaks ties and ranks providers without latency samples yet
+        self.providers = [name for name, key in self.api_keys.items() if key]
+        self.hedge_quantile = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+        self.hedge_min_delay = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.25"))
+        self.hedge_default_delay = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "2.0"))
+        self.min_samples = int(os.getenv("LLM_MIN_SAMPLES", "10"))
+        self.failure_threshold = int(os.getenv("LLM_FAILURE_THRESHOLD", "3"))
+        self.cooldown = float(os.getenv("LLM_COOLDOWN_SECONDS", "30"))
+        self.deadline = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+        window = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+        self.stats_by_provider = {name: ProviderStats(window) for name in self.providers}
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.exhausted = 0
+
+    def ranked(self) -> List[str]:
+        """Providers with a closed circuit by median latency, then the ones cooling down as a last resort"""
+        now = time.monotonic()
+
+        def key(name: str) -> Tuple[bool, float, int]:
+            stats = self.stats_by_provider[name]
+            median = stats.quantile(0.5) if len(stats.latencies) >= self.min_samples else None
+            return (stats.open_until > now, median if median is not None else self.hedge_default_delay, self.providers.index(name))
+
+        return sorted(self.providers, key=key)
+
+    def hedge_delay(self, provider: str) -> float:
+        """How long to wait on `provider` before starting the next one"""
+        stats = self.stats_by_provider[provider]
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, stats.quantile(self.hedge_quantile))
+
+    def _succeeded(self, provider: str, latency: float):
+        stats = self.stats_by_provider[provider]
+        stats.latencies.append(latency)
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.open_until = 0.0
+
+    def _failed(self, provider: str, error: BaseException):
+        stats = self.stats_by_provider[provider]
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.last_error = str(error) or type(error).__name__
+        if stats.consecutive_failures >= self.failure_threshold:
+            if stats.open_until <= time.monotonic():
+                print(f"🔴 LLM provider {provider} failing, skipped for {self.cooldown:.0f}s: {stats.last_error}")
+            stats.open_until = time.monotonic() + self.cooldown
+        else:
+            print(f"⚠️ LLM provider {provider} error: {stats.last_error}")
+
+    def _request(self, provider: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float, stream: bool) -> Dict[str, Any]:
+        """OpenAI-compatible chat completion request (Groq and OpenRouter share the format)"""
+        return {
+            "url": "/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {self.api_keys[provider]}",
+                "Content-Type": "application/json"
+            },
+            "json": {
+                "model": provider_setting(provider, "model"),
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": stream
+            }
+        }
+
+    async def _race(
+        self,
+        attempt: Callable[[str], Awaitable[Any]],
+        discard: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Optional[Tuple[Any, str]]:
+        """Run `attempt` per provider with hedging; the first success and its provider, or None"""
+        order = self.ranked()
+        if not order:
+            return None
+        self.requests += 1
+        deadline = time.monotonic() + self.deadline
+        pending: Dict["asyncio.Task[Any]", str] = {}
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            provider = order[launched]
+            launched += 1
+            self.stats_by_provider[provider].requests += 1
+            pending[asyncio.ensure_future(attempt(provider))] = provider
+
+        launch()
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(self.hedge_delay(order[launched - 1]), remaining) if launched < len(order) else remaining
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launched < len(order):
+                        self.hedged += 1
+                        launch()
+                    continue
+
+                winner = None
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is not None:
+                        self._failed(provider, task.exception())
+                    elif winner is None:
+                        winner = (task.result(), provider)
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is not None:
+                    self.stats_by_provider[winner[1]].wins += 1
+                    if winner[1] != order[0]:
+                        self.hedge_wins += 1
+                    return winner
+                # Every finished attempt failed: fail over immediately instead of waiting out the hedge delay
+                if not pending and launched < len(order):
+                    launch()
+            self.exhausted += 1
+            return None
+        finally:
+            for task, provider in pending.items():
+                task.cancel()
+                self.stats_by_provider[provider].cancelled += 1
+            if pending:
+                results = await asyncio.gather(*pending, return_exceptions=True)
+                if discard is not None:
+                    for result in results:
+                        if not isinstance(result, BaseException):
+                            await discard(result)
+
+    async def _complete_once(self, provider: str, request: Dict[str, Any]) -> str:
+        start = time.perf_counter()
+        response = await self.http_clients.client(provider).post(**request)
+        if response.status_code != 200:
+            raise RuntimeError(f"{provider} API error: {response.status_code}")
+        content = response.json()["choices"][0]["message"]["content"]
+        self._succeeded(provider, time.perf_counter() - start)
+        return content
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> Optional[Tuple[str, str]]:
+        """The answer and the provider that gave it, or None if no provider could"""
+        return await self._race(
+            lambda provider: self._complete_once(provider, self._request(provider, messages, max_tokens, temperature, False))
+        )
+
+    async def _tokens(self, provider: str, request: Dict[str, Any]) -> AsyncIterator[str]:
+        """Content deltas of one provider's SSE stream"""
+        async with self.http_clients.client(provider).stream("POST", **request) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"{provider} API error: {response.status_code}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                choices = json.loads(payload).get("choices") or [{}]
+                token = choices[0].get("delta", {}).get("content")
+                if token:
+                    yield token
+
+    async def _first_token(self, provider: str, request: Dict[str, Any]) -> Tuple[str, AsyncIterator[str]]:
+        """Open a stream and wait for its first token; latency is time to first token"""
+        start = time.perf_counter()
+        tokens = self._tokens(provider, request)
+        try:
+            first = await tokens.__anext__()
+        except StopAsyncIteration:
+            raise RuntimeError(f"{provider} returned an empty stream")
+        except BaseException:
+            await tokens.aclose()
+            raise
+        self._succeeded(provider, time.perf_counter() - start)
+        return first, tokens
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        report: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Tokens from the provider that starts answering first; nothing if none could.
+
+        Hedging applies until the first token; after that the stream is
+        committed, and a provider failing mid-answer raises to the caller.
+        """
+        async def close(result: Tuple[str, AsyncIterator[str]]):
+            await result[1].aclose()
+
+        routed = await self._race(
+            lambda provider: self._first_token(provider, self._request(provider, messages, max_tokens, temperature, True)),
+            discard=close
+        )
+        if routed is None:
+            return
+        (first, tokens), provider = routed
+        if report is not None:
+            report["llm_provider"] = provider
+        try:
+            yield first
+            async for token in tokens:
+                yield token
+        except Exception as e:
+            self._failed(provider, e)
+            raise
+        finally:
+            await tokens.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "providers": self.providers,
+            "ranked": self.ranked(),
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "exhausted": self.exhausted,
+            "by_provider": {name: stats.snapshot() for name, stats in self.stats_by_provider.items()}
+        }
@@ -3,14 +3,16 @@ FastAPI Main Application
 Travel India API with Supabase Integration
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import os
+import json
 from dotenv import load_dotenv
 from typing import List, Optional, Dict, Any
 import httpx
 import asyncio
+from contextlib import asynccontextmanager
 
 # Use the simpler models to avoid Pydantic version issues
 try:
@@ -35,18 +37,82 @@ except ImportError:
 
 from .database import SupabaseClient
 from .services import TravelService, AIService
+from .http_clients import HTTPClientManager, provider_setting
+from .aggregates import GROUP_FIELDS, parse_edges
+from .projection import parse_fields
+from .responses import FastJSONResponse
+from .exchange import EXPORT_FORMATS, exchange_format
+from .formats import negotiate, render, supported_formats, MSGPACK_AVAILABLE, ARROW_AVAILABLE
+from .http_cache import CompressionMiddleware, ConditionalGetMiddleware, ETagPolicy, BROTLI_AVAILABLE
+from .cache import TTLCache
+from .health import HealthMonitor, UP, MOCK, DOWN, NOT_CONFIGURED, PENDING
+from .sessions import SessionStore
 
 # Load environment variables
 load_dotenv(".env.fastapi")
 
+# Initialize services
+supabase_client = SupabaseClient()
+travel_service = TravelService(supabase_client)
+http_clients = HTTPClientManager()
+ai_service = AIService(http_clients, gazetteer=travel_service.gazetteer)
+sessions = SessionStore()
+health_monitor = HealthMonitor(supabase_client, http_clients, ai_service.router.api_keys)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    await http_clients.start()
+    await health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await http_clients.close()
+    supabase_client.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Travel India API",
     description="FastAPI backend for Travel India with Supabase integration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# Compression for complete bodies above the threshold (streams pass through)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1000")),
+    gzip_level=int(os.getenv("GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("BROTLI_QUALITY", "4"))
+)
+
+# ETag / 304 and rendered-response cache for catalog reads, keyed by the write counter plus the
+# catalog's reload generation (or the DB-cache TTL window for reads that went to the database)
+etag_policy = ETagPolicy(
+    version=travel_service.catalog_etag,
+    paths=[
+        "/api/destinations",
+        "/api/search/destinations",
+        "/api/search/suggest",
+        "/api/analytics/popular-destinations",
+        "/api/analytics/budget-ranges",
+        "/api/catalog/stats",
+        "/api/categories"
+    ],
+    # /api/destinations/{id}
+    prefixes=["/api/destinations/"],
+    max_age=int(os.getenv("HTTP_CACHE_MAX_AGE", "30")),
+    stale_while_revalidate=int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "300")),
+    cache=TTLCache(
+        max_entries=int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "512")),
+        max_bytes=int(os.getenv("HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+        ttl=float(os.getenv("HTTP_CACHE_TTL", "300"))
+    ),
+    # Streamed straight from the database, not cached
+    excluded=["/api/destinations/export"]
 )
+app.add_middleware(ConditionalGetMiddleware, policy=etag_policy)
 
 # CORS middleware
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -58,11 +124,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-supabase_client = SupabaseClient()
-travel_service = TravelService(supabase_client)
-ai_service = AIService()
-
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -79,48 +140,128 @@ async def root():
         ]
     }
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
+PAGE_MAX_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "100"))
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,name,rating,price_from (id is always included)"
+
+def _fields(fields: Optional[str]):
+    """Validate a fields= projection, rejecting unknown columns with 400"""
     try:
-        # Test Supabase connection
-        supabase_status = await supabase_client.test_connection()
-        
-        return {
-            "status": "🟢 Healthy",
-            "database": "🟢 Connected" if supabase_status else "🟡 Mock Mode",
-            "timestamp": travel_service.get_current_timestamp(),
-            "services": {
-                "fastapi": "🟢 Running",
-                "supabase": "🟢 Connected" if supabase_status else "🟡 Disconnected",
-                "ai": "🟢 Available"
-            }
-        }
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "🔴 Unhealthy",
-                "error": str(e),
-                "timestamp": travel_service.get_current_timestamp()
-            }
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _media_type(request: Request, columnar: bool = True) -> str:
+    """Negotiate JSON, MessagePack or Arrow from the Accept header, rejecting the rest with 406"""
+    media_type = negotiate(request.headers.get("accept"), columnar)
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Not acceptable. Available: {', '.join(supported_formats(columnar))}"
         )
+    return media_type
+
+DATABASE_LABELS = {UP: "🟢 Connected", MOCK: "🟡 Mock Mode", DOWN: "🔴 Disconnected"}
+AI_LABELS = {UP: "🟢 Available", NOT_CONFIGURED: "🟡 Fallback Mode", DOWN: "🔴 Unreachable"}
+
+def _ai_status() -> str:
+    """Up while any provider is; the router fails over, so one down provider is not an outage"""
+    statuses = [health_monitor.status(provider) for provider in ai_service.router.api_keys]
+    if UP in statuses:
+        return UP
+    if all(status == NOT_CONFIGURED for status in statuses):
+        return NOT_CONFIGURED
+    return DOWN if DOWN in statuses else PENDING
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint (last background probe results, no I/O)"""
+    supabase_status = health_monitor.status("supabase")
+    ai_status = _ai_status()
+    if health_monitor.stale:
+        status = "🟡 Starting" if not health_monitor.probe_runs else "🟡 Probes Stalled"
+    elif supabase_status == DOWN or ai_status == DOWN:
+        status = "🟡 Degraded"
+    else:
+        status = "🟢 Healthy"
+    
+    return {
+        "status": status,
+        "database": DATABASE_LABELS.get(supabase_status, "⚪ Unknown"),
+        "timestamp": travel_service.get_current_timestamp(),
+        "services": {
+            "fastapi": "🟢 Running",
+            "supabase": DATABASE_LABELS.get(supabase_status, "⚪ Unknown"),
+            "ai": AI_LABELS.get(ai_status, "⚪ Unknown")
+        },
+        "probes": health_monitor.snapshot()
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe for load balancers: 503 until the database is reachable"""
+    ready = health_monitor.ready()
+    content = {
+        "ready": ready,
+        "database": health_monitor.status("supabase"),
+        "stale": health_monitor.stale,
+        "timestamp": travel_service.get_current_timestamp()
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=content)
 
 # Destination endpoints
 @app.get("/api/destinations")
 async def get_destinations(
+    request: Request,
     limit: Optional[int] = Query(20, description="Number of destinations to return"),
     featured: Optional[bool] = Query(None, description="Filter by featured status"),
-    category: Optional[str] = Query(None, description="Filter by category")
+    category: Optional[str] = Query(None, description="Filter by category"),
+    sort: Optional[str] = Query(None, description="Sort by rating, price_from, name or created_at (enables cursor paging)"),
+    order: Optional[str] = Query(None, description="asc or desc (defaults per sort field)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
-    """Get all destinations with optional filters"""
+    """Get all destinations with optional filters (JSON, MessagePack or Arrow IPC by Accept)"""
+    projection = _fields(fields)
+    media_type = _media_type(request)
+    if sort or cursor:
+        if not 1 <= limit <= PAGE_MAX_LIMIT:
+            raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+        try:
+            destinations, next_cursor, sort, order = await travel_service.get_destinations_page(
+                limit=limit,
+                sort=sort,
+                order=order,
+                cursor=cursor,
+                featured=featured,
+                category=category,
+                fields=projection
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching destinations: {str(e)}")
+        return render(media_type, {
+            "destinations": destinations,
+            "count": len(destinations),
+            "next_cursor": next_cursor,
+            "filters": {
+                "limit": limit,
+                "featured": featured,
+                "category": category,
+                "sort": sort,
+                "order": order
+            }
+        }, "destinations", projection)
+    
     try:
         destinations = await travel_service.get_destinations(
             limit=limit,
             featured=featured,
-            category=category
+            category=category,
+            fields=projection
         )
-        return {
+        return render(media_type, {
             "destinations": destinations,
             "count": len(destinations),
             "filters": {
@@ -128,18 +269,98 @@ async def get_destinations(
                 "featured": featured,
                 "category": category
             }
-        }
+        }, "destinations", projection)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching destinations: {str(e)}")
 
+# Bulk endpoints (registered before /{destination_id} so "bulk" is not read as an id)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+def _bulk_items(payload: dict, key: str) -> list:
+    """The list under `key` in a bulk payload, rejecting a missing or oversized one"""
+    items = payload.get(key)
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail=f"Body must be an object with a '{key}' list")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+    return items
+
+@app.get("/api/destinations/export")
+async def export_destinations(
+    request: Request,
+    export_format: Optional[str] = Query(None, alias="format", description="ndjson or csv (defaults from Accept, then ndjson)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Stream every destination as NDJSON or CSV without loading the table into memory"""
+    projection = _fields(fields)
+    fmt = exchange_format(export_format, request.headers.get("accept"))
+    if fmt is None:
+        raise HTTPException(status_code=406, detail=f"Export formats: {', '.join(EXPORT_FORMATS)}")
+    return StreamingResponse(
+        travel_service.export_destinations(fmt, projection),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="destinations.{fmt}"'}
+    )
+
+@app.post("/api/destinations/import")
+async def import_destinations(
+    request: Request,
+    import_format: Optional[str] = Query(None, alias="format", description="ndjson or csv (defaults from Content-Type)"),
+    mode: str = Query("create", description="create (new rows) or upsert (rows with ids)")
+):
+    """Load an NDJSON or CSV body in bounded batches through the bulk write path"""
+    fmt = exchange_format(import_format, request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Import formats: {', '.join(EXPORT_FORMATS)}")
+    if mode not in ("create", "upsert"):
+        raise HTTPException(status_code=400, detail="mode must be 'create' or 'upsert'")
+    try:
+        summary = await travel_service.import_destinations(request.stream(), fmt, upsert=mode == "upsert")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error importing destinations: {str(e)}")
+    return FastJSONResponse(summary, status_code=400 if "aborted" in summary else 200)
+
+@app.post("/api/destinations/bulk")
+async def bulk_create_destinations(payload: dict):
+    """Create many destinations: {"destinations": [...]}; results are reported per item"""
+    items = _bulk_items(payload, "destinations")
+    try:
+        return FastJSONResponse(await travel_service.bulk_create_destinations(items))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating destinations: {str(e)}")
+
+@app.put("/api/destinations/bulk")
+async def bulk_upsert_destinations(payload: dict):
+    """Insert or replace many destinations by id: {"destinations": [{"id": ..., ...}]}"""
+    items = _bulk_items(payload, "destinations")
+    try:
+        return FastJSONResponse(await travel_service.bulk_upsert_destinations(items))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error upserting destinations: {str(e)}")
+
+@app.delete("/api/destinations/bulk")
+async def bulk_delete_destinations(payload: dict):
+    """Delete many destinations: {"ids": [...]}"""
+    ids = _bulk_items(payload, "ids")
+    try:
+        return FastJSONResponse(await travel_service.bulk_delete_destinations(ids))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deleting destinations: {str(e)}")
+
 @app.get("/api/destinations/{destination_id}")
-async def get_destination(destination_id: int):
+async def get_destination(
+    request: Request,
+    destination_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get a specific destination by ID"""
+    projection = _fields(fields)
+    media_type = _media_type(request, columnar=False)
     try:
-        destination = await travel_service.get_destination_by_id(destination_id)
+        destination = await travel_service.get_destination_by_id(destination_id, projection)
         if not destination:
             raise HTTPException(status_code=404, detail="Destination not found")
-        return {"destination": destination}
+        return render(media_type, {"destination": destination})
     except HTTPException:
         raise
     except Exception as e:
@@ -147,18 +368,14 @@ async def get_destination(destination_id: int):
 
 @app.post("/api/destinations")
 async def create_destination(destination_data: dict):
-    """Create a new destination"""
+    """Create a new destination (validated like /api/destinations/bulk items)"""
     try:
-        # Validate required fields
-        required_fields = ['name', 'location', 'state', 'description', 'category', 'rating', 'price_from']
-        for field in required_fields:
-            if field not in destination_data:
-                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
-        
         new_destination = await travel_service.create_destination_dict(destination_data)
         return {"destination": new_destination, "message": "Destination created successfully"}
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating destination: {str(e)}")
 
@@ -172,6 +389,8 @@ async def update_destination(destination_id: int, destination_data: dict):
         return {"destination": updated_destination, "message": "Destination updated successfully"}
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating destination: {str(e)}")
 
@@ -191,44 +410,151 @@ async def delete_destination(destination_id: int):
 # Search endpoints
 @app.get("/api/search/destinations")
 async def search_destinations(
+    request: Request,
     query: str = Query(..., description="Search query"),
-    limit: Optional[int] = Query(10, description="Number of results to return")
+    limit: Optional[int] = Query(10, description="Number of results to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Search destinations by name, location, or description"""
+    if limit is None or not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+    projection = _fields(fields)
+    media_type = _media_type(request)
     try:
-        results = await travel_service.search_destinations(query, limit)
-        return {
+        results = await travel_service.search_destinations(query, limit, projection)
+        return render(media_type, {
             "query": query,
             "results": results,
             "count": len(results)
-        }
+        }, "results", projection)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching destinations: {str(e)}")
 
+@app.get("/api/search/suggest")
+async def suggest_destinations(
+    q: str = Query(..., description="Prefix typed so far"),
+    limit: Optional[int] = Query(8, description="Number of suggestions to return")
+):
+    """Typeahead suggestions by name, location or state prefix"""
+    if limit is None or not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+    try:
+        suggestions = await travel_service.suggest_destinations(q, limit)
+        return FastJSONResponse({
+            "query": q,
+            "suggestions": suggestions,
+            "count": len(suggestions)
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching suggestions: {str(e)}")
+
 # AI Chat endpoints
+def _sse(payload: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+def _use_response_cache(request: Request) -> bool:
+    """Clients can opt out of cached AI answers with Cache-Control: no-cache"""
+    cache_control = request.headers.get("cache-control", "").lower()
+    return "no-cache" not in cache_control and "no-store" not in cache_control
+
+def _wants_stream(request: Request, chat_data: dict) -> bool:
+    """Stream when the client asks for it via the body or the Accept header"""
+    return bool(chat_data.get('stream')) or "text/event-stream" in request.headers.get("accept", "")
+
+def _record_turn(session_id: str, message: str, response: str):
+    """Keep the exchange in the session"""
+    sessions.append(session_id, "user", message)
+    if response:
+        sessions.append(session_id, "assistant", response)
+
 @app.post("/api/chat")
-async def chat_with_ai(chat_data: dict):
-    """Chat with AI travel assistant"""
+async def chat_with_ai(chat_data: dict, request: Request):
+    """Chat with AI travel assistant (set "stream": true for server-sent events).
+    
+    Send the "session_id" from the previous reply (or an X-Session-ID header) and
+    only the new message; the server keeps the history. Clients that still send
+    "conversation_history" get it used as-is.
+    """
     try:
         message = chat_data.get('message', '')
-        conversation_history = chat_data.get('conversation_history', [])
         
         if not message:
             raise HTTPException(status_code=400, detail="Message is required")
         
+        session_id = sessions.resolve(chat_data.get('session_id') or request.headers.get("x-session-id"))
+        if 'conversation_history' in chat_data:
+            conversation_history, summary = chat_data.get('conversation_history') or [], ""
+        else:
+            conversation_history, summary = sessions.context(session_id)
+        
         # Get destinations data for context
-        destinations = await travel_service.get_destinations(limit=20)
+        destinations = await travel_service.get_destinations(limit=20, as_models=False)
+        # Classify once (after the catalog is loaded, so place names link); the linked
+        # destination ids lead retrieval and the same intent drives the answer
+        await travel_service.load_catalog()
+        intent = ai_service.analyze_intent(message)
+        # Relevance-ranked destinations for the prompt, bounded regardless of catalog size
+        context_destinations = await travel_service.retrieve_destinations(
+            message, k=int(os.getenv("RETRIEVAL_TOP_K", "8")), destination_ids=intent["destination_ids"]
+        )
+        use_cache = _use_response_cache(request)
+        # Filled with the prompt's token count and what fit in the budget
+        prompt_report: Dict[str, Any] = {}
+        
+        if _wants_stream(request, chat_data):
+            async def event_stream():
+                tokens = []
+                try:
+                    async for token in ai_service.stream_message(
+                        message,
+                        conversation_history,
+                        destinations,
+                        catalog_version=travel_service.catalog_version,
+                        use_cache=use_cache,
+                        context_destinations=context_destinations,
+                        summary=summary,
+                        report=prompt_report,
+                        intent=intent
+                    ):
+                        tokens.append(token)
+                        yield _sse({"token": token})
+                    _record_turn(session_id, message, "".join(tokens))
+                    yield _sse({
+                        "done": True,
+                        "session_id": session_id,
+                        "prompt": prompt_report,
+                        "provider": "FastAPI + Supabase",
+                        "timestamp": travel_service.get_current_timestamp()
+                    })
+                except Exception as e:
+                    yield _sse({"error": f"Error processing chat: {str(e)}"})
+            
+            return StreamingResponse(
+                event_stream(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Session-ID": session_id}
+            )
         
         # Process with AI service
         response = await ai_service.process_message(
             message,
             conversation_history,
-            destinations
+            destinations,
+            catalog_version=travel_service.catalog_version,
+            use_cache=use_cache,
+            context_destinations=context_destinations,
+            summary=summary,
+            report=prompt_report,
+            intent=intent
         )
+        _record_turn(session_id, message, response)
         
         return {
             "response": response,
             "success": True,
+            "session_id": session_id,
+            "prompt": prompt_report,
             "provider": "FastAPI + Supabase",
             "timestamp": travel_service.get_current_timestamp()
         }
@@ -237,34 +563,41 @@ async def chat_with_ai(chat_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
 
+@app.delete("/api/chat/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    """Forget a conversation (e.g. when the user starts a new chat)"""
+    return {"deleted": sessions.delete(session_id), "session_id": session_id}
+
 # System status endpoint
 @app.get("/api/system-status")
 async def get_system_status():
     """Get system status information"""
     try:
-        # Test database connection
-        db_connected = await supabase_client.test_connection()
+        # Last background probe result
+        db_connected = health_monitor.status("supabase") == UP
         
-        # Count destinations
-        destinations_count = 0
-        if db_connected:
-            destinations = await travel_service.get_destinations(limit=1000)
-            destinations_count = len(destinations)
+        # Exact count from the in-memory catalog (or a count=exact query)
+        catalog_stats = await travel_service.get_catalog_stats()
         
         return {
             "database": {
                 "supabase": {
                     "connected": db_connected,
-                    "destinations": destinations_count,
+                    "destinations": catalog_stats["total"],
+                    "last_modified": catalog_stats["last_modified"],
                     "mode": "live_data" if db_connected else "mock_data"
                 }
             },
             "ai": {
-                "groq": {
-                    "configured": bool(os.getenv("GROQ_API_KEY")),
-                    "available": True,
-                    "model": "llama-3.1-70b-versatile"
+                **{
+                    provider: {
+                        "configured": bool(api_key),
+                        "available": health_monitor.status(provider) in (UP, PENDING) if api_key else False,
+                        "model": provider_setting(provider, "model")
+                    }
+                    for provider, api_key in ai_service.router.api_keys.items()
                 },
+                "routing": ai_service.router.ranked() or ["local"],
                 "fastapi": {
                     "active": True,
                     "version": "1.0.0"
@@ -279,43 +612,75 @@ async def get_system_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting system status: {str(e)}")
 
+@app.get("/api/catalog/stats")
+async def get_catalog_stats():
+    """Exact destination counts per category and state, and when the catalog last changed"""
+    try:
+        return await travel_service.get_catalog_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting catalog stats: {str(e)}")
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Get cache and performance counters"""
+    return {
+        "catalog_cache": travel_service.cache.stats(),
+        "db_read_coalescing": {**supabase_client.reads.stats(), "enabled": supabase_client.coalesce_reads},
+        "catalog_version": travel_service.catalog_version,
+        "catalog": travel_service.catalog.stats(),
+        "bulk_writes": travel_service.bulk_writer.stats(),
+        "suggest": travel_service.suggest_index.stats(),
+        "gazetteer": travel_service.gazetteer.stats(),
+        "chat_sessions": sessions.stats(),
+        "prompts": ai_service.prompts.stats(),
+        "llm_router": ai_service.router.stats(),
+        "http_clients": http_clients.stats(),
+        "health": health_monitor.snapshot(),
+        "http_cache": {**etag_policy.stats(), "brotli": BROTLI_AVAILABLE},
+        "formats": {"msgpack": MSGPACK_AVAILABLE, "arrow": ARROW_AVAILABLE},
+        "response_cache": ai_service.response_cache.stats(),
+        "intent_rules": ai_service.intents.stats(),
+        "timestamp": travel_service.get_current_timestamp()
+    }
+
 # Analytics endpoints
 @app.get("/api/analytics/popular-destinations")
-async def get_popular_destinations(limit: Optional[int] = Query(5, description="Number of popular destinations")):
+async def get_popular_destinations(
+    limit: Optional[int] = Query(5, description="Number of popular destinations"),
+    category: Optional[str] = Query(None, description="Only destinations in this category"),
+    state: Optional[str] = Query(None, description="Only destinations in this state")
+):
     """Get most popular destinations by rating"""
+    if limit is None or not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
     try:
-        destinations = await travel_service.get_destinations(limit=100)
-        popular = sorted(destinations, key=lambda x: x.rating, reverse=True)[:limit]
-        return {
+        popular = await travel_service.get_popular_destinations(limit, category, state)
+        return FastJSONResponse({
             "popular_destinations": popular,
             "count": len(popular)
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting popular destinations: {str(e)}")
 
 @app.get("/api/analytics/budget-ranges")
-async def get_budget_ranges():
+async def get_budget_ranges(
+    edges: Optional[str] = Query(None, description="Comma-separated bucket edges, e.g. 10000,20000,40000"),
+    group_by: Optional[str] = Query(None, description="Add a breakdown by 'category' or 'state'")
+):
     """Get budget analysis across all destinations"""
+    if group_by is not None and group_by not in GROUP_FIELDS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(GROUP_FIELDS)}")
     try:
-        destinations = await travel_service.get_destinations(limit=1000)
+        bucket_edges = parse_edges(edges) if edges else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="edges must be comma-separated finite numbers")
+    
+    try:
+        analysis = await travel_service.get_budget_analysis(bucket_edges, group_by)
         
-        if not destinations:
+        if not analysis:
             return {"budget_analysis": "No data available"}
         
-        prices = [dest.price_from for dest in destinations]
-        
-        analysis = {
-            "min_price": min(prices),
-            "max_price": max(prices),
-            "avg_price": sum(prices) // len(prices),
-            "budget_ranges": {
-                "budget": len([p for p in prices if p < 15000]),
-                "mid_range": len([p for p in prices if 15000 <= p < 30000]),
-                "luxury": len([p for p in prices if p >= 30000])
-            },
-            "total_destinations": len(destinations)
-        }
-        
         return {"budget_analysis": analysis}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing budget ranges: {str(e)}")
@@ -21,6 +21,9 @@ class DestinationBase(BaseModel):
 class DestinationCreate(DestinationBase):
     pass
 
+class DestinationUpsert(DestinationBase):
+    id: int
+
 class DestinationUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=200)
     location: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -0,0 +1,130 @@
+"""
+Keyset Pagination
+Opaque (sort value, id) cursors and per-field sorted views of the catalog
+"""
+
+import base64
+import bisect
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalog import CatalogIndex
+
+# Sortable fields and their default direction
+SORT_FIELDS = {"rating": "desc", "price_from": "asc", "name": "asc", "created_at": "desc"}
+
+# JSON type of each field's cursor value (NULL sorts last and is always allowed)
+_CURSOR_TYPES = {"rating": (int, float), "price_from": (int, float), "name": (str,), "created_at": (str,)}
+
+Cursor = Tuple[str, str, Any, int]
+
+def encode_cursor(sort: str, order: str, value: Any, destination_id: int) -> str:
+    """Opaque cursor pointing just past (value, id) in the given ordering"""
+    raw = json.dumps([sort, order, value, destination_id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort, order, value, destination_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if sort not in SORT_FIELDS or order not in ("asc", "desc") or type(destination_id) is not int:
+        raise ValueError("Invalid cursor")
+    # A value of the wrong type could not be compared with the sorted view or bound in a query
+    if value is not None and (isinstance(value, bool) or not isinstance(value, _CURSOR_TYPES[sort])):
+        raise ValueError("Invalid cursor")
+    return sort, order, value, destination_id
+
+def sort_key(value: Any, destination_id: int) -> Tuple[bool, Any, int]:
+    """Ascending key with NULLs last, matching Postgres' default ordering"""
+    return value is None, value if value is not None else 0, destination_id
+
+ViewKey = Tuple[Optional[str], Optional[bool]]
+
+class SortedViews(CatalogIndex):
+    """Ascending (value, id) lists per sortable field; descending pages walk them backwards.
+
+    Every category, featured flag and category + flag combination gets its
+    own set of lists alongside the unfiltered one, so a page (filtered or
+    not) is a bisection to the cursor plus `limit` steps and page 1000 costs
+    the same as page 1.
+    """
+
+    def __init__(self):
+        self.views: Dict[ViewKey, Dict[str, List[Tuple[bool, Any, int]]]] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _view_keys(row: Dict[str, Any]) -> List[ViewKey]:
+        """(category, featured) filters a row can be listed under; None means unfiltered"""
+        category, featured = row.get("category") or None, bool(row.get("featured"))
+        return list(dict.fromkeys([(None, None), (category, None), (None, featured), (category, featured)]))
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self.rows = {row["id"]: row for row in rows}
+        grouped: Dict[ViewKey, List[Dict[str, Any]]] = {}
+        for row in rows:
+            for key in self._view_keys(row):
+                grouped.setdefault(key, []).append(row)
+        self.views = {
+            key: {field: sorted(sort_key(row.get(field), row["id"]) for row in members) for field in SORT_FIELDS}
+            for key, members in grouped.items()
+        }
+
+    def upsert(self, row: Dict[str, Any]):
+        self.remove(row["id"])
+        self.rows[row["id"]] = row
+        for key in self._view_keys(row):
+            views = self.views.setdefault(key, {field: [] for field in SORT_FIELDS})
+            for field, view in views.items():
+                bisect.insort(view, sort_key(row.get(field), row["id"]))
+
+    def remove(self, destination_id: int):
+        row = self.rows.pop(destination_id, None)
+        if row is None:
+            return
+        for key in self._view_keys(row):
+            views = self.views.get(key)
+            if views is None:
+                continue
+            for field, view in views.items():
+                entry = sort_key(row.get(field), destination_id)
+                position = bisect.bisect_left(view, entry)
+                if position < len(view) and view[position] == entry:
+                    del view[position]
+            if not views["rating"]:
+                del self.views[key]
+
+    def page(
+        self,
+        sort: str,
+        order: str,
+        limit: int,
+        after: Optional[Tuple[Any, int]] = None,
+        featured: Optional[bool] = None,
+        category: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Rows following the `after` position, and the cursor for the page after them"""
+        view = self.views.get((category or None, featured), {}).get(sort, [])
+        descending = order == "desc"
+        if after is None:
+            position = len(view) - 1 if descending else 0
+        elif descending:
+            position = bisect.bisect_left(view, sort_key(*after)) - 1
+        else:
+            position = bisect.bisect_right(view, sort_key(*after))
+
+        step = -1 if descending else 1
+        rows: List[Dict[str, Any]] = []
+        while 0 <= position < len(view) and len(rows) < limit:
+            rows.append(self.rows[view[position][2]])
+            position += step
+
+        # Every row in a filtered view matches, so any row left means another page
+        next_cursor = None
+        if rows and 0 <= position < len(view):
+            last = rows[-1]
+            next_cursor = encode_cursor(sort, order, last.get(sort), last["id"])
+        return rows, next_cursor
@@ -0,0 +1,44 @@
+"""
+Sparse Fieldsets
+`fields=` parsing, PostgREST select pushdown and per-projection response models
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import create_model
+
+DESTINATION_FIELDS = (
+    "id", "name", "location", "state", "description", "image_url",
+    "category", "rating", "price_from", "featured", "created_at"
+)
+
+Fields = Optional[Tuple[str, ...]]
+
+def parse_fields(value: Optional[str]) -> Fields:
+    """Validate a comma-separated field list; returns a canonical tuple (always with id) or None for all fields"""
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = sorted(requested - set(DESTINATION_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(DESTINATION_FIELDS)}")
+    requested.add("id")
+    # Canonical order so "name,id" and "id,name" share cache entries and models
+    return tuple(field for field in DESTINATION_FIELDS if field in requested)
+
+def select_clause(fields: Fields) -> str:
+    """PostgREST select list for a projection"""
+    return ",".join(fields) if fields else "*"
+
+def project(row: Dict[str, Any], fields: Fields) -> Dict[str, Any]:
+    return row if fields is None else {field: row.get(field) for field in fields}
+
+@lru_cache(maxsize=256)
+def projection_model(fields: Tuple[str, ...], base: type) -> Optional[type]:
+    """Pydantic model with only `fields` of `base`, keeping their types and constraints"""
+    model_fields = getattr(base, "model_fields", None)
+    if model_fields is None:
+        return None
+    definitions = {field: (model_fields[field].annotation, model_fields[field]) for field in fields}
+    return create_model(f"{base.__name__}_{'_'.join(fields)}", **definitions)
@@ -0,0 +1,222 @@
+"""
+Prompt Assembly
+Token-budgeted chat prompts: fixed sections counted once, then destinations and history fitted in priority order
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Exact counts need `pip install tiktoken` (and its encoding file); otherwise tokens are estimated
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\S")
+
+def estimate_tokens(text: str) -> int:
+    """BPE-like estimate: a word per token (long words more), digits in threes, other symbols by UTF-8 size.
+
+    Errs on the high side for English so a budget filled with estimates
+    still fits when the provider counts exactly.
+    """
+    count = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece.isascii():
+            count += 1 + len(piece) // 8
+        else:
+            count += max(1, len(piece.encode()) // 2)
+    return count
+
+class Tokenizer:
+    """Token counting with tiktoken when its encoding loads, the local estimate otherwise"""
+
+    def __init__(self, encoding: Optional[str] = None):
+        encoding = encoding or os.getenv("PROMPT_TOKENIZER", "cl100k_base")
+        self._encoding = None
+        self.name = "estimate"
+        if TIKTOKEN_AVAILABLE and encoding != "estimate":
+            try:
+                self._encoding = tiktoken.get_encoding(encoding)
+                self.name = f"tiktoken:{encoding}"
+            except Exception as e:
+                print(f"⚠️ Tokenizer {encoding} unavailable, estimating prompt tokens: {e}")
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def clip(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """The text cut to at most `max_tokens` (with an ellipsis when cut) and its token count"""
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text, tokens
+        if max_tokens <= 1:
+            return "", 0
+        if self._encoding is not None:
+            clipped = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:max_tokens - 1])
+        else:
+            clipped = text[:len(text) * (max_tokens - 1) // tokens]
+        clipped = clipped.rstrip() + "…"
+        return clipped, self.count(clipped)
+
+HEADER = "You are ARIA, an expert India travel assistant with access to real destination data.\n\nCurrent conversation:\n"
+DESTINATIONS_LABEL = "\nAvailable destinations:\n"
+SUMMARY_LABEL = "\nEarlier in this conversation:\n"
+HISTORY_LABEL = "\nRecent conversation:\n"
+GUIDELINES = """
+Guidelines:
+- Be conversational and helpful
+- Use real data from destinations provided
+- Include specific prices, ratings, and details
+- Provide actionable recommendations
+- Use emojis and formatting for better readability
+"""
+
+class PromptBuilder:
+    """Assemble the chat system prompt within a token budget.
+
+    The header, guidelines and section labels are counted once at start-up
+    and destination and history lines are memoised, so a request only
+    tokenises its query, new turns and new rows. Sections are filled in priority order:
+    the fixed text and the query always, then destinations in rank order,
+    then history newest first, then the rolling summary; whatever does not
+    fit is left out and reported.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Optional[Tokenizer] = None,
+        budget: Optional[int] = None,
+        description_tokens: Optional[int] = None,
+        turn_tokens: Optional[int] = None
+    ):
+        self.tokenizer = tokenizer or Tokenizer()
+        self.budget = budget or int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+        self.description_tokens = description_tokens or int(os.getenv("PROMPT_DESCRIPTION_TOKENS", "120"))
+        self.turn_tokens = turn_tokens or int(os.getenv("PROMPT_TURN_TOKENS", "300"))
+        count = self.tokenizer.count
+        self.fixed_tokens = sum(count(text) for text in (HEADER, DESTINATIONS_LABEL, HISTORY_LABEL, GUIDELINES))
+        self.summary_label_tokens = count(SUMMARY_LABEL)
+        # Formatted destination and history lines with their token counts; rows and
+        # session turns repeat across requests
+        self._lines: Dict[Tuple[Any, ...], Tuple[str, int]] = {}
+        self.requests = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.over_budget = 0
+        self.dropped_destinations = 0
+        self.dropped_turns = 0
+
+    def _destination_line(self, dest: Dict[str, Any]) -> Tuple[str, int]:
+        key = (
+            dest.get('id'), dest.get('name'), dest.get('location'), dest.get('state'), dest.get('description'),
+            dest.get('price_from'), dest.get('rating'), dest.get('category')
+        )
+        cached = self._lines.get(key)
+        if cached is None:
+            description, _ = self.tokenizer.clip(str(dest.get('description', 'No description')), self.description_tokens)
+            line = (
+                f"- {dest.get('name', 'Unknown')} in {dest.get('location', 'Unknown')}, {dest.get('state', 'Unknown')}: {description} "
+                f"(₹{dest.get('price_from', 0)}+ | Rating: {dest.get('rating', 0)} | Category: {dest.get('category', 'Unknown')})"
+            )
+            cached = self._remember(key, line)
+        return cached
+
+    def _turn_line(self, turn: Dict[str, str]) -> Tuple[str, int]:
+        key = ("turn", turn.get('role', 'user'), str(turn.get('content', '')))
+        cached = self._lines.get(key)
+        if cached is None:
+            content, _ = self.tokenizer.clip(key[2], self.turn_tokens)
+            cached = self._remember(key, f"{key[1]}: {content}")
+        return cached
+
+    def _remember(self, key: Tuple[Any, ...], line: str) -> Tuple[str, int]:
+        """Cache a line with its token count (+1 for the newline joining it)"""
+        if len(self._lines) >= 4096:
+            self._lines.clear()
+        cached = self._lines[key] = (line, self.tokenizer.count(line) + 1)
+        return cached
+
+    def build(
+        self,
+        message: str,
+        intent: Dict[str, Any],
+        destinations: List[Dict[str, Any]],
+        history: List[Dict[str, str]],
+        summary: str = "",
+        max_turns: int = 8
+    ) -> Tuple[str, Dict[str, Any]]:
+        """The prompt and what went into it: token count, budget and how many rows/turns fit"""
+        # A pathological message may take at most half the budget
+        message, _ = self.tokenizer.clip(message, self.budget // 2)
+        query = (
+            f"- User query: {message}\n"
+            f"- Intent: {intent['type']}\n"
+            f"- Detected entities: {', '.join(intent['entities']) if intent['entities'] else 'none'}\n"
+        )
+        used = self.fixed_tokens + self.tokenizer.count(query)
+
+        lines: List[str] = []
+        for dest in destinations:
+            line, tokens = self._destination_line(dest)
+            if used + tokens > self.budget:
+                break
+            lines.append(line)
+            used += tokens
+
+        turns: List[str] = []
+        recent = history[-max_turns:] if max_turns > 0 else []
+        for turn in reversed(recent):
+            line, tokens = self._turn_line(turn)
+            if used + tokens > self.budget:
+                break
+            turns.append(line)
+            used += tokens
+        turns.reverse()
+
+        summary_text = ""
+        if summary and used + self.summary_label_tokens + 2 <= self.budget:
+            summary, tokens = self.tokenizer.clip(summary, self.budget - used - self.summary_label_tokens - 1)
+            if summary:
+                summary_text = f"{SUMMARY_LABEL}{summary}\n"
+                used += self.summary_label_tokens + tokens + 1
+
+        prompt = (
+            f"{HEADER}{query}{DESTINATIONS_LABEL}" + "\n".join(lines) + "\n"
+            f"{summary_text}{HISTORY_LABEL}" + "\n".join(turns) + "\n"
+            f"{GUIDELINES}"
+        )
+
+        report = {
+            "prompt_tokens": used,
+            "budget": self.budget,
+            "tokenizer": self.tokenizer.name,
+            "destinations": len(lines),
+            "destinations_offered": len(destinations),
+            "history_turns": len(turns),
+            "history_offered": len(recent),
+            "summary": bool(summary_text)
+        }
+        self.requests += 1
+        self.total_tokens += used
+        self.max_tokens = max(self.max_tokens, used)
+        self.over_budget += used > self.budget
+        self.dropped_destinations += len(destinations) - len(lines)
+        self.dropped_turns += len(recent) - len(turns)
+        return prompt, report
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokenizer": self.tokenizer.name,
+            "budget": self.budget,
+            "requests": self.requests,
+            "avg_prompt_tokens": round(self.total_tokens / self.requests, 1) if self.requests else 0.0,
+            "max_prompt_tokens": self.max_tokens,
+            "over_budget": self.over_budget,
+            "dropped_destinations": self.dropped_destinations,
+            "dropped_turns": self.dropped_turns
+        }
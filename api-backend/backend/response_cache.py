@@ -0,0 +1,113 @@
+"""
+AI Response Cache
+Exact and near-duplicate cache for chat answers, keyed by normalized message,
+detected intent and catalog version
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from .cache import TTLCache
+
+_WORD_RE = re.compile(r"[a-z0-9₹]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "to", "of", "in", "on", "for", "at", "and", "or",
+    "me", "my", "i", "you", "your", "we", "us", "it", "its", "about", "what", "whats",
+    "which", "how", "can", "could", "would", "should", "do", "does", "please", "tell",
+    "some", "any", "there", "this", "that", "with", "from", "be", "give", "show"
+})
+
+def normalize_message(message: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return " ".join(_WORD_RE.findall(message.lower()))
+
+def content_terms(normalized: str) -> FrozenSet[str]:
+    """Terms used for near-duplicate matching (stopwords removed)"""
+    return frozenset(word for word in normalized.split() if word not in STOPWORDS)
+
+class ResponseCache:
+    """TTL/LRU cache of AI answers with an optional near-duplicate lookup tier"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        near_duplicates: bool = True,
+        similarity_threshold: float = 0.8
+    ):
+        self.exact = TTLCache(max_entries=max_entries, max_bytes=32 * 1024 * 1024, ttl=ttl)
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        # partition -> normalized message -> content terms, used to find near duplicates
+        self._partitions: Dict[Hashable, "OrderedDict[str, FrozenSet[str]]"] = {}
+        self.near_hits = 0
+
+    @staticmethod
+    def partition(intent: Dict[str, Any], catalog_version: int) -> Tuple:
+        """Answers are only shared between messages with the same intent, entities and catalog"""
+        return (intent["type"], tuple(sorted(intent.get("entities", []))), catalog_version)
+
+    def get(self, message: str, intent: Dict[str, Any], catalog_version: int) -> Optional[str]:
+        """Look up an answer, trying the exact key first and then near duplicates"""
+        partition = self.partition(intent, catalog_version)
+        normalized = normalize_message(message)
+        answer = self.exact.get((partition, normalized))
+        if answer is not None or not self.near_duplicates:
+            return answer
+
+        match = self._nearest(partition, content_terms(normalized))
+        if match is None:
+            return None
+        answer = self.exact.get((partition, match))
+        if answer is not None:
+            # Count the near hit as a hit, not as the miss recorded above
+            self.exact.misses -= 1
+            self.near_hits += 1
+        return answer
+
+    def set(self, message: str, intent: Dict[str, Any], catalog_version: int, answer: str):
+        """Store an answer"""
+        partition = self.partition(intent, catalog_version)
+        normalized = normalize_message(message)
+        self.exact.set((partition, normalized), answer, size=len(answer.encode()))
+
+        if self.near_duplicates:
+            # Entries from older catalog versions can never be hit again
+            for old in [key for key in self._partitions if key[2] != catalog_version]:
+                del self._partitions[old]
+            entries = self._partitions.setdefault(partition, OrderedDict())
+            entries[normalized] = content_terms(normalized)
+            entries.move_to_end(normalized)
+            while len(entries) > self.exact.max_entries:
+                entries.popitem(last=False)
+
+    def _nearest(self, partition: Hashable, terms: FrozenSet[str]) -> Optional[str]:
+        """Most similar cached message in the partition (Jaccard over content terms)"""
+        entries = self._partitions.get(partition)
+        if not entries or not terms:
+            return None
+
+        best, best_score = None, self.similarity_threshold
+        stale: List[str] = []
+        for normalized, candidate in entries.items():
+            # peek, not `in`: scanning must not refresh every entry's LRU position
+            if self.exact.peek((partition, normalized)) is None:
+                stale.append(normalized)
+                continue
+            union = len(terms | candidate)
+            score = len(terms & candidate) / union if union else 0.0
+            if score >= best_score:
+                best, best_score = normalized, score
+
+        for normalized in stale:
+            del entries[normalized]
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and occupancy"""
+        stats = self.exact.stats()
+        stats["near_duplicate_hits"] = self.near_hits
+        stats["near_duplicates_enabled"] = self.near_duplicates
+        return stats
@@ -0,0 +1,43 @@
+"""
+Fast JSON Responses
+JSONResponse that encodes dicts and pydantic models directly, skipping jsonable_encoder
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# orjson is optional (pip install orjson); the stdlib encoder is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json") if hasattr(value, "model_dump") else value.dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode to compact UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def loads(data: bytes) -> Any:
+    """Decode one JSON document"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONResponse(JSONResponse):
+    """Return this from an endpoint to bypass FastAPI's per-value jsonable_encoder walk"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
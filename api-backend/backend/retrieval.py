@@ -0,0 +1,122 @@
+"""
+Destination Retrieval
+BM25 index over the catalog used to pick the destinations relevant to a chat message
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from .catalog import CatalogIndex
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "to", "of", "in", "on", "for", "at", "and", "or",
+    "me", "my", "i", "you", "your", "we", "it", "about", "what", "which", "how", "can",
+    "do", "does", "please", "tell", "with", "from", "be", "this", "that", "some", "any",
+    "want", "like", "visit", "go", "trip", "travel", "best", "good"
+})
+
+# Field boosts: a match in the name counts more than one buried in the description
+FIELD_WEIGHTS = {"name": 3.0, "location": 2.0, "state": 2.0, "category": 1.5, "description": 1.0}
+
+# Terms present in nearly every document carry no ranking signal; skipping them
+# keeps scoring cost proportional to the selective terms of the query
+MIN_IDF = 0.1
+
+def stem(word: str) -> str:
+    """Very light plural stripping so "beaches" matches "beach" and "cities" matches "city" """
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem"""
+    return [stem(word) for word in _TOKEN_RE.findall(text.lower()) if word not in STOPWORDS]
+
+def document_terms(row: Dict[str, Any]) -> Counter:
+    """Field-weighted term frequencies for a destination row"""
+    terms: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(str(row.get(field) or "")):
+            terms[token] += weight
+    return terms
+
+class BM25Index(CatalogIndex):
+    """Okapi BM25 over name/location/state/category/description, updated incrementally"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.doc_lengths: Dict[int, float] = {}
+        self.doc_terms: Dict[int, List[str]] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self._total_length = 0.0
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self.postings = {}
+        self.doc_lengths = {}
+        self.doc_terms = {}
+        self.rows = {}
+        self._total_length = 0.0
+        for row in rows:
+            self._add(row)
+
+    def upsert(self, row: Dict[str, Any]):
+        self.remove(row["id"])
+        self._add(row)
+
+    def remove(self, destination_id: int):
+        self.rows.pop(destination_id, None)
+        length = self.doc_lengths.pop(destination_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self.doc_terms.pop(destination_id, []):
+            docs = self.postings[term]
+            docs.pop(destination_id, None)
+            if not docs:
+                del self.postings[term]
+
+    def _add(self, row: Dict[str, Any]):
+        destination_id = row["id"]
+        terms = document_terms(row)
+        length = sum(terms.values())
+        self.rows[destination_id] = row
+        self.doc_lengths[destination_id] = length
+        self.doc_terms[destination_id] = list(terms)
+        self._total_length += length
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[destination_id] = frequency
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score for every destination matching at least one query term"""
+        count = len(self.doc_lengths)
+        if not count:
+            return {}
+        average_length = self._total_length / count
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            if idf < MIN_IDF:
+                continue
+            for destination_id, frequency in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[destination_id] / average_length)
+                scores[destination_id] = scores.get(destination_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, k: int = 8) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top-k (score, row) pairs, best first"""
+        top = heapq.nlargest(k, self.scores(query).items(), key=lambda item: item[1])
+        return [(score, self.rows[destination_id]) for destination_id, score in top]
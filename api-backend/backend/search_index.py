@@ -0,0 +1,260 @@
+"""
+Destination Search Index
+In-memory inverted index with prefix matching, typo tolerance and ranked scoring
+"""
+
+import bisect
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+from .catalog import CatalogIndex
+from .retrieval import stem
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+FIELD_WEIGHTS = {"name": 4.0, "location": 3.0, "state": 2.0, "category": 2.0, "description": 1.0}
+
+# Score multipliers by how a query token matched an indexed term
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+
+# Typo tolerance is only applied to alphabetic tokens long enough for one edit to be meaningful;
+# three letters covers short place names such as "goa" typed as "gao"
+MIN_TYPO_LENGTH = 3
+
+def search_tokens(text: str) -> List[str]:
+    """Lowercase and split into stemmed tokens (no stopword removal; names like "The Himalayas" matter)"""
+    return [stem(word) for word in _TOKEN_RE.findall(text.lower())]
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True when a and b differ by at most one insertion, deletion, substitution or adjacent swap"""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    if la > lb:
+        a, b = b, a
+    # b is one character longer than a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+class SearchIndex(CatalogIndex):
+    """Inverted index over name, location, state, category and description.
+
+    Each term keeps a dict of destination id -> field weight for membership
+    tests, plus a list of (-weight, -rating, id) kept sorted so the best rows
+    for a term can be read off the front without scanning the whole posting.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.ranked: Dict[str, List[Tuple[float, float, int]]] = {}
+        self.doc_terms: Dict[int, Dict[str, Tuple[float, float, int]]] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.vocabulary: List[str] = []
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self.postings = {}
+        self.ranked = {}
+        self.doc_terms = {}
+        self.rows = {}
+        self._deletes = {}
+        for row in rows:
+            for term, key in self._index(row).items():
+                self.ranked.setdefault(term, []).append(key)
+        for entries in self.ranked.values():
+            entries.sort()
+        self.vocabulary = sorted(self.postings)
+        for term in self.vocabulary:
+            self._add_deletes(term)
+
+    def upsert(self, row: Dict[str, Any]):
+        self.remove(row["id"])
+        for term, key in self._index(row).items():
+            entries = self.ranked.get(term)
+            if entries is None:
+                self.ranked[term] = [key]
+                bisect.insort(self.vocabulary, term)
+                self._add_deletes(term)
+            else:
+                bisect.insort(entries, key)
+
+    def remove(self, destination_id: int):
+        self.rows.pop(destination_id, None)
+        for term, key in self.doc_terms.pop(destination_id, {}).items():
+            docs = self.postings[term]
+            docs.pop(destination_id, None)
+            entries = self.ranked[term]
+            position = bisect.bisect_left(entries, key)
+            if position < len(entries) and entries[position] == key:
+                del entries[position]
+            if not docs:
+                del self.postings[term]
+                del self.ranked[term]
+                self._drop_term(term)
+
+    def _index(self, row: Dict[str, Any]) -> Dict[str, Tuple[float, float, int]]:
+        """Add a row to the postings and return its ranked-list key per term"""
+        destination_id = row["id"]
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in search_tokens(str(row.get(field) or "")):
+                # Keep the strongest field a term appears in
+                weights[token] = max(weights.get(token, 0.0), weight)
+
+        rating = float(row.get("rating") or 0)
+        keys = {}
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[destination_id] = weight
+            keys[term] = (-weight, -rating, destination_id)
+        self.rows[destination_id] = row
+        self.doc_terms[destination_id] = keys
+        return keys
+
+    def _add_deletes(self, term: str):
+        if len(term) < MIN_TYPO_LENGTH or term.isdigit():
+            return
+        for variant in _deletes(term) | {term}:
+            self._deletes.setdefault(variant, set()).add(term)
+
+    def _drop_term(self, term: str):
+        position = bisect.bisect_left(self.vocabulary, term)
+        if position < len(self.vocabulary) and self.vocabulary[position] == term:
+            del self.vocabulary[position]
+        if len(term) < MIN_TYPO_LENGTH or term.isdigit():
+            return
+        for variant in _deletes(term) | {term}:
+            terms = self._deletes.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[variant]
+
+    def expand(self, token: str, prefix: bool = True, max_expansions: int = 50) -> Dict[str, float]:
+        """Indexed terms a query token can match, with their match-quality multiplier"""
+        matches: Dict[str, float] = {}
+        if token in self.postings:
+            matches[token] = EXACT
+            # "42" should not also match 420-429 once it matches exactly
+            if token.isdigit():
+                prefix = False
+
+        if prefix:
+            start = bisect.bisect_left(self.vocabulary, token)
+            for term in self.vocabulary[start:start + max_expansions]:
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX)
+
+        if not matches and len(token) >= MIN_TYPO_LENGTH and not token.isdigit():
+            candidates: Set[str] = set()
+            for variant in _deletes(token) | {token}:
+                candidates |= self._deletes.get(variant, set())
+            for term in candidates:
+                if within_one_edit(token, term):
+                    matches[term] = TYPO
+        return matches
+
+    def _factor(self, term: str, quality: float) -> float:
+        """Score multiplier for a term: idf times match quality"""
+        return math.log(1 + max(len(self.rows), 1) / len(self.postings[term])) * quality
+
+    def _scorers(self, matches: Dict[str, float]) -> List[Tuple[Dict[int, float], float]]:
+        """(postings, factor) pairs for a token's matched terms, computed once per query"""
+        return [(self.postings[term], self._factor(term, quality)) for term, quality in matches.items()]
+
+    @staticmethod
+    def _token_score(destination_id: int, scorers: List[Tuple[Dict[int, float], float]]) -> float:
+        """Best score a destination gets for one query token (0 when it does not match)"""
+        best = 0.0
+        for docs, factor in scorers:
+            weight = docs.get(destination_id)
+            if weight is not None and weight * factor > best:
+                best = weight * factor
+        return best
+
+    def _top_single(self, matches: Dict[str, float], limit: int) -> List[int]:
+        """Top rows for a one-token query, merged lazily from the per-term ranked lists"""
+        if limit <= 0:
+            return []
+        streams = []
+        for term, quality in matches.items():
+            factor = self._factor(term, quality)
+            # Ranked keys are negated, so ascending order is best first
+            streams.append(((negated_weight * factor, negated_rating, destination_id)
+                            for negated_weight, negated_rating, destination_id in self.ranked[term]))
+
+        best: List[int] = []
+        seen: Set[int] = set()
+        for _, _, destination_id in heapq.merge(*streams):
+            if destination_id not in seen:
+                seen.add(destination_id)
+                best.append(destination_id)
+                if len(best) == limit:
+                    break
+        return best
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked rows matching every query token (falling back to any token), best first"""
+        tokens = list(dict.fromkeys(search_tokens(query)))
+        if not tokens or limit <= 0:
+            return []
+
+        # Prefix-expand only the last token, the one the user may still be typing
+        expansions = [self.expand(token, prefix=index == len(tokens) - 1) for index, token in enumerate(tokens)]
+        matching = [matches for matches in expansions if matches]
+        if not matching:
+            return []
+
+        def size(matches: Dict[str, float]) -> int:
+            return sum(len(self.postings[term]) for term in matches)
+
+        if len(matching) == len(expansions):
+            if len(matching) == 1:
+                return [self.rows[destination_id] for destination_id in self._top_single(matching[0], limit)]
+
+            # Every token must match: walk the rarest token's rows and test the others by lookup
+            driver = min(matching, key=size)
+            candidates: Set[int] = set()
+            for term in driver:
+                candidates.update(self.postings[term])
+            scorers = [self._scorers(matches) for matches in matching]
+            scored = []
+            for destination_id in candidates:
+                total = 0.0
+                for token_scorers in scorers:
+                    score = self._token_score(destination_id, token_scorers)
+                    if not score:
+                        break
+                    total += score
+                else:
+                    scored.append((total, float(self.rows[destination_id].get("rating") or 0), destination_id))
+            if scored:
+                return [self.rows[destination_id] for _, _, destination_id in heapq.nlargest(limit, scored)]
+
+        # No row matches every token: rank rows matching any of them
+        candidates = set()
+        for matches in matching:
+            for term in matches:
+                candidates.update(self.postings[term])
+        scorers = [self._scorers(matches) for matches in matching]
+        scored = [
+            (sum(self._token_score(destination_id, token_scorers) for token_scorers in scorers),
+             float(self.rows[destination_id].get("rating") or 0),
+             destination_id)
+            for destination_id in candidates
+        ]
+        return [self.rows[destination_id] for _, _, destination_id in heapq.nlargest(limit, scored)]
@@ -4,92 +4,255 @@ Travel and AI services for the FastAPI backend
 """
 
 import os
+import asyncio
+import time
+import uuid
+import heapq
 import httpx
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Sequence, Union, Tuple, AsyncIterator
 from datetime import datetime
 import json
+from functools import lru_cache
+from pydantic import TypeAdapter
 
 from .database import SupabaseClient
+from .cache import TTLCache
+from .http_clients import HTTPClientManager
+from .llm_router import LLMRouter
+from .response_cache import ResponseCache
+from .catalog import CatalogStore, CatalogUnavailable
+from .retrieval import BM25Index
+from .search_index import SearchIndex
+from .suggest import SuggestIndex, SUGGESTION_FIELDS
+from .gazetteer import Gazetteer
+from .aggregates import AggregateIndex
+from .pagination import SortedViews, SORT_FIELDS, decode_cursor, encode_cursor
+from .projection import Fields, project, projection_model, select_clause
+from .bulk import BulkWriter, bulk_report, validate_batch
+from .intents import IntentClassifier
+from .prompts import PromptBuilder
+from .exchange import encode_export, import_records, iter_records
+
+@lru_cache(maxsize=256)
+def list_adapter(model: type) -> Any:
+    """Cached TypeAdapter validating a whole list of rows in one call"""
+    return TypeAdapter(List[model])
 
 # Try to import models, fallback to simple dict operations
 try:
-    from .models import Destination, DestinationCreate, DestinationUpdate
+    from .models import Destination, DestinationCreate, DestinationUpdate, DestinationUpsert
     USE_MODELS = True
 except ImportError:
     try:
-        from .models_simple import Destination, DestinationCreate, DestinationUpdate
+        from .models_simple import Destination, DestinationCreate, DestinationUpdate, DestinationUpsert
         USE_MODELS = True
     except ImportError:
         USE_MODELS = False
 
+CATEGORIES = ['Heritage', 'Nature', 'Beach', 'Spiritual', 'Adventure']
+
+REQUIRED_FIELDS = ['name', 'location', 'state', 'description', 'category', 'rating', 'price_from']
+
+# Routes read through the TTL-cached database queries rather than the catalog snapshot
+DB_READ_PATHS = ("/api/destinations",)
+
+def check_destination(destination_data: Dict[str, Any], partial: bool = False):
+    """Manual destination checks for dict payloads; raises ValueError. `partial` skips required fields."""
+    if not partial:
+        # Validate required fields
+        for field in REQUIRED_FIELDS:
+            if field not in destination_data:
+                raise ValueError(f"Missing required field: {field}")
+    
+    # Validate category
+    if 'category' in destination_data and destination_data['category'] not in CATEGORIES:
+        raise ValueError(f"Category must be one of: {', '.join(CATEGORIES)}")
+    
+    # Validate rating
+    if 'rating' in destination_data and not (0 <= destination_data['rating'] <= 5):
+        raise ValueError("Rating must be between 0 and 5")
+    
+    # Validate price
+    if 'price_from' in destination_data and destination_data['price_from'] < 0:
+        raise ValueError("Price must be non-negative")
+
+def validate_destination(destination_data: Any, partial: bool = False) -> Dict[str, Any]:
+    """Validate one destination payload with the same rules as bulk writes; raises ValueError.
+    
+    Returns the row to write: every field for a create, only the sent fields
+    for a `partial` update.
+    """
+    if not isinstance(destination_data, dict):
+        raise ValueError("Each destination must be an object")
+    if not USE_MODELS:
+        check_destination(destination_data, partial)
+        return dict(destination_data) if partial else {"image_url": None, "featured": False, **destination_data}
+    
+    valid, invalid = validate_batch([destination_data], list_adapter(DestinationUpdate if partial else DestinationCreate))
+    if invalid:
+        raise ValueError(invalid[0])
+    row = valid[0][1]
+    return {field: value for field, value in row.items() if field in destination_data} if partial else row
+
 class TravelService:
     def __init__(self, supabase_client: SupabaseClient):
         self.db = supabase_client
+        self.cache = TTLCache(
+            max_entries=int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(os.getenv("CATALOG_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+            ttl=float(os.getenv("CATALOG_CACHE_TTL", "60"))
+        )
+        # Bumped on every write so derived caches can tell the catalog changed
+        self.catalog_version = 0
+        # Distinguishes this process's version counters from other workers'
+        self.instance_id = uuid.uuid4().hex[:8]
+        # Full in-memory catalog and the indexes kept in sync with it
+        self.catalog = CatalogStore(supabase_client)
+        self.retriever = self.catalog.register(BM25Index())
+        self.search_index = self.catalog.register(SearchIndex())
+        self.suggest_index = self.catalog.register(SuggestIndex())
+        self.aggregates = self.catalog.register(AggregateIndex())
+        self.sorted_views = self.catalog.register(SortedViews())
+        self.gazetteer = self.catalog.register(Gazetteer())
+        # Rows from our own database skip response-model validation unless disabled
+        self.trusted_rows = os.getenv("TRUSTED_DB_ROWS", "true").lower() == "true"
+        self.bulk_writer = BulkWriter()
+        self.export_page_size = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+        self.import_batch_size = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    
+    def _invalidate_catalog(
+        self,
+        row: Optional[Dict[str, Any]] = None,
+        removed_id: Optional[int] = None,
+        rows: Sequence[Dict[str, Any]] = (),
+        removed_ids: Sequence[int] = ()
+    ):
+        """Drop cached catalog reads after a write and apply it to the in-memory catalog"""
+        self.cache.clear()
+        self.catalog_version += 1
+        for changed in ([row] if row is not None else []) + list(rows):
+            self.catalog.upsert(changed)
+        for destination_id in ([removed_id] if removed_id is not None else []) + list(removed_ids):
+            self.catalog.remove(destination_id)
+    
+    async def catalog_etag(self, path: str = "") -> str:
+        """Opaque token that changes whenever the read at `path` could return something different.
+
+        Local writes bump catalog_version. Reads answered from a loaded snapshot
+        add its reload generation (a stale snapshot is reloaded in the
+        background); database reads, and every read while no snapshot is
+        loaded, add the DB-cache TTL window instead, so changes made outside
+        this process expire with the cache.
+        """
+        self.catalog.refresh_in_background()
+        token = f"{self.instance_id}-{self.catalog_version}-{self.catalog.generation}"
+        if path.startswith(DB_READ_PATHS) or not self.catalog.loaded:
+            token += f"-{int(time.time() // self.cache.ttl):x}"
+        return token
     
     async def get_destinations(
         self, 
         limit: int = 20, 
         featured: Optional[bool] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        fields: Fields = None,
+        as_models: bool = True
     ) -> List[Union[Dict[str, Any], Any]]:
-        """Get destinations with optional filters"""
-        data = await self.db.get_destinations(limit, featured, category)
+        """Get destinations with optional filters, optionally only the given fields"""
+        key = ("destinations", limit, featured, category, fields)
+        data = self.cache.get(key)
+        if data is None:
+            version = self.catalog_version
+            data = await self.db.get_destinations(limit, featured, category, columns=select_clause(fields))
+            data = [project(dest, fields) for dest in data]
+            # A write landed while this read was in flight; don't cache what it may have missed
+            if self.catalog_version == version:
+                self.cache.set(key, data)
         
-        if USE_MODELS:
-            try:
-                return [Destination(**dest) for dest in data]
-            except Exception as e:
-                print(f"⚠️ Model conversion failed, returning raw data: {e}")
-                return data
-        else:
+        return self._to_models(data, fields) if as_models else data
+    
+    def _to_models(self, data: List[Dict[str, Any]], fields: Fields = None) -> List[Union[Dict[str, Any], Any]]:
+        """Validate rows as Destination models (or the projection's model) in one batch.
+
+        In trusted mode rows from our own database are returned as-is; they
+        were validated on the way in.
+        """
+        if not USE_MODELS or self.trusted_rows:
+            return data
+        model = Destination if fields is None else projection_model(fields, Destination)
+        if model is None:
+            return data
+        try:
+            return list_adapter(model).validate_python(data)
+        except Exception as e:
+            print(f"⚠️ Model conversion failed, returning raw data: {e}")
             return data
     
-    async def get_destination_by_id(self, destination_id: int) -> Optional[Union[Dict[str, Any], Any]]:
+    async def get_destinations_page(
+        self,
+        limit: int = 20,
+        sort: Optional[str] = None,
+        order: Optional[str] = None,
+        cursor: Optional[str] = None,
+        featured: Optional[bool] = None,
+        category: Optional[str] = None,
+        fields: Fields = None
+    ) -> Tuple[List[Union[Dict[str, Any], Any]], Optional[str], str, str]:
+        """Keyset-paginated destinations; returns (page, next cursor, sort, order)"""
+        after = None
+        if cursor:
+            cursor_sort, cursor_order, value, last_id = decode_cursor(cursor)
+            if (sort and sort != cursor_sort) or (order and order != cursor_order):
+                raise ValueError("Cursor was issued for a different sort order")
+            sort, order, after = cursor_sort, cursor_order, (value, last_id)
+        sort = sort or "rating"
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+        order = order or SORT_FIELDS[sort]
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        
+        try:
+            await self.catalog.ensure_loaded()
+            data, next_cursor = self.sorted_views.page(sort, order, limit, after, featured, category)
+        except CatalogUnavailable as e:
+            print(f"⚠️ Catalog unavailable for paging, using a database keyset query: {e}")
+            # Fetch one extra row to know whether another page exists
+            # The cursor needs the sort column even when the projection leaves it out
+            columns = select_clause(tuple(dict.fromkeys(fields + (sort,)))) if fields else "*"
+            data = await self.db.get_destinations_page(
+                sort, order == "desc", limit + 1, after, featured, category, columns=columns
+            )
+            next_cursor = None
+            if len(data) > limit:
+                data = data[:limit]
+                next_cursor = encode_cursor(sort, order, data[-1].get(sort), data[-1]["id"])
+        
+        data = [project(dest, fields) for dest in data]
+        return self._to_models(data, fields), next_cursor, sort, order
+    
+    async def get_destination_by_id(self, destination_id: int, fields: Fields = None) -> Optional[Union[Dict[str, Any], Any]]:
         """Get a specific destination by ID"""
-        data = await self.db.get_destination_by_id(destination_id)
+        data = await self.db.get_destination_by_id(destination_id, columns=select_clause(fields))
         
         if not data:
             return None
-            
-        if USE_MODELS:
-            try:
-                return Destination(**data)
-            except Exception as e:
-                print(f"⚠️ Model conversion failed, returning raw data: {e}")
-                return data
-        else:
-            return data
+        
+        return self._to_models([project(data, fields)], fields)[0]
     
     async def create_destination(self, destination: Any) -> Union[Dict[str, Any], Any]:
         """Create a new destination using Pydantic model"""
         if USE_MODELS:
             data = await self.db.create_destination(destination.dict())
+            self._invalidate_catalog(row=data)
             return Destination(**data)
         else:
             raise Exception("Models not available, use create_destination_dict instead")
     
     async def create_destination_dict(self, destination_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new destination using dictionary data"""
-        # Validate required fields
-        required_fields = ['name', 'location', 'state', 'description', 'category', 'rating', 'price_from']
-        for field in required_fields:
-            if field not in destination_data:
-                raise ValueError(f"Missing required field: {field}")
-        
-        # Validate category
-        allowed_categories = ['Heritage', 'Nature', 'Beach', 'Spiritual', 'Adventure']
-        if destination_data['category'] not in allowed_categories:
-            raise ValueError(f"Category must be one of: {', '.join(allowed_categories)}")
-        
-        # Validate rating
-        if not (0 <= destination_data['rating'] <= 5):
-            raise ValueError("Rating must be between 0 and 5")
-        
-        # Validate price
-        if destination_data['price_from'] < 0:
-            raise ValueError("Price must be non-negative")
-        
-        data = await self.db.create_destination(destination_data)
+        data = await self.db.create_destination(validate_destination(destination_data))
+        self._invalidate_catalog(row=data)
         return data
     
     async def update_destination(self, destination_id: int, destination: Any) -> Optional[Union[Dict[str, Any], Any]]:
@@ -98,71 +261,361 @@ class TravelService:
             # Only include non-None fields
             update_data = {k: v for k, v in destination.dict().items() if v is not None}
             data = await self.db.update_destination(destination_id, update_data)
+            self._invalidate_catalog(row=data)
             return Destination(**data) if data else None
         else:
             raise Exception("Models not available, use update_destination_dict instead")
     
     async def update_destination_dict(self, destination_id: int, destination_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing destination using dictionary data"""
-        # Validate category if provided
-        if 'category' in destination_data:
-            allowed_categories = ['Heritage', 'Nature', 'Beach', 'Spiritual', 'Adventure']
-            if destination_data['category'] not in allowed_categories:
-                raise ValueError(f"Category must be one of: {', '.join(allowed_categories)}")
-        
-        # Validate rating if provided
-        if 'rating' in destination_data:
-            if not (0 <= destination_data['rating'] <= 5):
-                raise ValueError("Rating must be between 0 and 5")
-        
-        # Validate price if provided
-        if 'price_from' in destination_data:
-            if destination_data['price_from'] < 0:
-                raise ValueError("Price must be non-negative")
-        
-        data = await self.db.update_destination(destination_id, destination_data)
+        data = await self.db.update_destination(destination_id, validate_destination(destination_data, partial=True))
+        self._invalidate_catalog(row=data)
         return data
     
     async def delete_destination(self, destination_id: int) -> bool:
         """Delete a destination"""
-        return await self.db.delete_destination(destination_id)
+        deleted = await self.db.delete_destination(destination_id)
+        self._invalidate_catalog(removed_id=destination_id if deleted else None)
+        return deleted
     
-    async def search_destinations(self, query: str, limit: int = 10) -> List[Union[Dict[str, Any], Any]]:
-        """Search destinations by text"""
-        data = await self.db.search_destinations(query, limit)
-        
+    def _validate_batch(self, items: List[Any], with_id: bool = False) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, str]]:
+        """Validate a bulk payload; returns (index, row) pairs to write and errors by index"""
         if USE_MODELS:
-            try:
-                return [Destination(**dest) for dest in data]
-            except Exception as e:
-                print(f"⚠️ Model conversion failed, returning raw data: {e}")
-                return data
+            valid, invalid = validate_batch(items, list_adapter(DestinationUpsert if with_id else DestinationCreate))
         else:
-            return data
+            valid, invalid = [], {}
+            for index, item in enumerate(items):
+                try:
+                    if with_id and not (isinstance(item, dict) and isinstance(item.get("id"), int)):
+                        raise ValueError("Missing required field: id")
+                    valid.append((index, validate_destination(item)))
+                except (ValueError, TypeError) as e:
+                    invalid[index] = str(e)
+        
+        if with_id:
+            # Postgres rejects an upsert that touches the same row twice
+            seen = set()
+            for index, row in list(valid):
+                if row["id"] in seen:
+                    invalid[index] = f"Duplicate id in batch: {row['id']}"
+                seen.add(row["id"])
+            valid = [(index, row) for index, row in valid if index not in invalid]
+        return valid, invalid
+    
+    async def bulk_create_destinations(self, items: List[Any]) -> Dict[str, Any]:
+        """Validate a batch in one pass and insert it with chunked multi-row statements"""
+        valid, invalid = self._validate_batch(items)
+        written, failed = await self.bulk_writer.run(self.db.insert_destinations, valid)
+        self._invalidate_catalog(rows=list(written.values()))
+        return bulk_report(len(items), "created", written, failed, invalid)
+    
+    async def bulk_upsert_destinations(self, items: List[Any]) -> Dict[str, Any]:
+        """Validate a batch of full destinations with ids and insert-or-replace them in chunks"""
+        valid, invalid = self._validate_batch(items, with_id=True)
+        
+        async def upsert(rows: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+            by_id = {row["id"]: row for row in await self.db.upsert_destinations(rows)}
+            return [by_id.get(row["id"]) for row in rows]
+        
+        written, failed = await self.bulk_writer.run(upsert, valid)
+        self._invalidate_catalog(rows=list(written.values()))
+        ids = {index: row["id"] for index, row in valid}
+        return bulk_report(len(items), "upserted", written, failed, invalid, ids)
+    
+    async def bulk_delete_destinations(self, destination_ids: List[Any]) -> Dict[str, Any]:
+        """Delete destinations by id with chunked `id=in.(...)` statements"""
+        valid, invalid = [], {}
+        for index, destination_id in enumerate(destination_ids):
+            if isinstance(destination_id, int) and not isinstance(destination_id, bool):
+                valid.append((index, destination_id))
+            else:
+                invalid[index] = f"Invalid id: {destination_id!r}"
+        
+        async def delete(chunk: List[int]) -> List[Optional[Dict[str, Any]]]:
+            deleted = set(await self.db.delete_destinations(chunk))
+            return [{"id": destination_id} if destination_id in deleted else None for destination_id in chunk]
+        
+        written, failed = await self.bulk_writer.run(delete, valid)
+        self._invalidate_catalog(removed_ids=[row["id"] for row in written.values() if row])
+        return bulk_report(len(destination_ids), "deleted", written, failed, invalid, dict(valid))
+    
+    def export_destinations(self, fmt: str, fields: Fields = None) -> AsyncIterator[bytes]:
+        """Stream the whole table as NDJSON or CSV, paging through the database by id"""
+        pages = self.db.iter_destinations(self.export_page_size, columns=select_clause(fields))
+        return encode_export(pages, fmt, fields)
+    
+    async def import_destinations(self, chunks: AsyncIterator[bytes], fmt: str, upsert: bool = False) -> Dict[str, Any]:
+        """Parse an NDJSON or CSV upload incrementally and write it through the bulk path in batches"""
+        write = self.bulk_upsert_destinations if upsert else self.bulk_create_destinations
+        return await import_records(iter_records(chunks, fmt), write, self.import_batch_size)
+    
+    async def search_destinations(self, query: str, limit: int = 10, fields: Fields = None) -> List[Union[Dict[str, Any], Any]]:
+        """Search destinations by text"""
+        try:
+            await self.catalog.ensure_loaded()
+            data = self.search_index.search(query, limit)
+        except Exception as e:
+            print(f"⚠️ Search index unavailable, querying database: {e}")
+            data = await self.db.search_destinations(query, limit, columns=select_clause(fields))
+        
+        return self._to_models([project(dest, fields) for dest in data], fields)
+    
+    async def suggest_destinations(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Typeahead suggestions for a name/location/state prefix"""
+        try:
+            await self.catalog.ensure_loaded()
+        except Exception as e:
+            print(f"⚠️ Catalog unavailable for suggestions, querying database: {e}")
+            rows = await self.db.search_destinations(prefix, limit)
+            return [{field: row.get(field) for field in SUGGESTION_FIELDS} for row in rows]
+        return self.suggest_index.suggest(prefix, limit)
+    
+    async def _aggregates(self) -> AggregateIndex:
+        """The live aggregates, or ones computed from a capped fetch when the catalog cannot load"""
+        try:
+            await self.catalog.ensure_loaded()
+            return self.aggregates
+        except Exception as e:
+            print(f"⚠️ Catalog unavailable for analytics, aggregating a database sample: {e}")
+            aggregates = AggregateIndex(self.aggregates.edges, self.aggregates.labels)
+            aggregates.rebuild(await self.db.get_destinations(limit=1000))
+            return aggregates
+    
+    async def get_popular_destinations(
+        self,
+        limit: int = 5,
+        category: Optional[str] = None,
+        state: Optional[str] = None
+    ) -> List[Union[Dict[str, Any], Any]]:
+        """Highest-rated destinations across the whole catalog"""
+        data = (await self._aggregates()).popular(limit, category, state)
+        return self._to_models(data)
+    
+    async def get_catalog_stats(self) -> Dict[str, Any]:
+        """Exact destination counts (total, per category, per state) and last-modified time"""
+        try:
+            await self.catalog.ensure_loaded()
+            return {
+                **self.aggregates.counts(),
+                "last_modified": self.catalog.last_modified_iso(),
+                "source": "catalog"
+            }
+        except Exception as e:
+            print(f"⚠️ Catalog unavailable for stats, counting in the database: {e}")
+        
+        # Cleared with the rest of the catalog cache on every write
+        key = ("catalog_stats",)
+        stats = self.cache.get(key)
+        if stats is None:
+            version = self.catalog_version
+            total, *per_category = await asyncio.gather(
+                self.db.count_destinations(),
+                *(self.db.count_destinations(category=category) for category in CATEGORIES)
+            )
+            stats = {
+                "total": total,
+                "by_category": dict(zip(CATEGORIES, per_category)),
+                "by_state": {},
+                "last_modified": None,
+                "source": "count"
+            }
+            if self.catalog_version == version:
+                self.cache.set(key, stats)
+        return stats
+    
+    async def get_budget_analysis(
+        self,
+        edges: Optional[List[float]] = None,
+        group_by: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Price statistics and budget bucket counts across the whole catalog"""
+        return (await self._aggregates()).budget_analysis(edges, group_by)
+    
+    async def load_catalog(self) -> bool:
+        """Make sure the catalog and its indexes are loaded; False when the database is unavailable"""
+        try:
+            await self.catalog.ensure_loaded()
+            return True
+        except Exception as e:
+            print(f"⚠️ Catalog unavailable: {e}")
+            return False
+    
+    async def retrieve_destinations(
+        self,
+        query: str,
+        k: int = 8,
+        destination_ids: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Top-k catalog destinations relevant to a free-text query, topped up with the best rated.
+        
+        `destination_ids` are the destinations the query names, as already linked
+        by the chat intent; without them the query is linked here.
+        """
+        if not await self.load_catalog():
+            return []
+        
+        # Destinations the message names come first, then the BM25 ranking
+        if destination_ids is None:
+            destination_ids = self.gazetteer.link(query, k)["destination_ids"]
+        hits = [self.gazetteer.rows[destination_id] for destination_id in destination_ids[:k] if destination_id in self.gazetteer.rows]
+        seen = {row["id"] for row in hits}
+        hits.extend(row for _, row in self.retriever.search(query, k) if row["id"] not in seen)
+        if len(hits) < k:
+            seen = {row["id"] for row in hits}
+            best_rated = heapq.nlargest(
+                k,
+                self.catalog.rows.values(),
+                key=lambda row: (bool(row.get("featured")), row.get("rating") or 0)
+            )
+            hits.extend(row for row in best_rated if row["id"] not in seen)
+        return hits[:k]
     
     def get_current_timestamp(self) -> str:
         """Get current timestamp as ISO string"""
         return datetime.now().isoformat()
 
 class AIService:
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    def __init__(self, http_clients: Optional[HTTPClientManager] = None, gazetteer: Optional[Gazetteer] = None):
+        self.http_clients = http_clients or HTTPClientManager()
+        # Chat completions go to the fastest healthy provider with a key, hedged and failed over
+        self.router = LLMRouter(self.http_clients)
+        self.response_cache = ResponseCache(
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+            near_duplicates=os.getenv("RESPONSE_CACHE_NEAR_DUPLICATES", "true").lower() == "true",
+            similarity_threshold=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.8"))
+        )
+        self.intents = IntentClassifier()
+        # Links place names in messages to catalog destinations when given
+        self.gazetteer = gazetteer
+        self.context_turns = int(os.getenv("CHAT_CONTEXT_TURNS", "8"))
+        self.prompts = PromptBuilder()
     
     async def process_message(
         self, 
         message: str, 
         conversation_history: List[Dict[str, str]], 
-        destinations: List[Any]
+        destinations: List[Any],
+        catalog_version: int = 0,
+        use_cache: bool = True,
+        context_destinations: Optional[List[Dict[str, Any]]] = None,
+        summary: str = "",
+        report: Optional[Dict[str, Any]] = None,
+        intent: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Process user message and generate AI response"""
+        """Process user message and generate AI response.
         
+        `report`, when given, is filled with the prompt's size and the answering
+        provider ("local" for the built-in answers), or "cached": true. Pass the
+        `intent` from analyze_intent when the caller already classified the message.
+        """
         # Analyze intent
-        intent = self._analyze_intent(message)
+        intent = intent or self.analyze_intent(message)
+        
+        cacheable = use_cache and self._is_cacheable(intent, conversation_history)
+        if cacheable:
+            cached = self.response_cache.get(message, intent, catalog_version)
+            if cached is not None:
+                if report is not None:
+                    report["cached"] = True
+                return cached
+        
+        destinations_data, context, prompt_report = self._prepare(
+            message, intent, conversation_history, destinations, context_destinations, summary
+        )
+        if report is not None:
+            report.update(prompt_report)
+        
+        routed = await self.router.complete(self._messages(context, message)) if self.router.providers else None
+        if routed is not None:
+            response, provider = routed
+        else:
+            response, provider = self._generate_local_response(intent, destinations_data, message), "local"
+        if report is not None:
+            report["llm_provider"] = provider
+        
+        # A local answer given because every provider failed is not worth keeping
+        if cacheable and (routed is not None or not self.router.providers):
+            self.response_cache.set(message, intent, catalog_version, response)
+        return response
+    
+    async def stream_message(
+        self, 
+        message: str, 
+        conversation_history: List[Dict[str, str]], 
+        destinations: List[Any],
+        catalog_version: int = 0,
+        use_cache: bool = True,
+        context_destinations: Optional[List[Dict[str, Any]]] = None,
+        summary: str = "",
+        report: Optional[Dict[str, Any]] = None,
+        intent: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Process user message and yield the AI response as it is generated"""
+        intent = intent or self.analyze_intent(message)
+        
+        cacheable = use_cache and self._is_cacheable(intent, conversation_history)
+        if cacheable:
+            cached = self.response_cache.get(message, intent, catalog_version)
+            if cached is not None:
+                if report is not None:
+                    report["cached"] = True
+                yield cached
+                return
+        
+        destinations_data, context, prompt_report = self._prepare(
+            message, intent, conversation_history, destinations, context_destinations, summary
+        )
+        if report is not None:
+            report.update(prompt_report)
+        
+        tokens = []
+        if self.router.providers:
+            # The router sets report["llm_provider"] once a provider starts answering
+            async for token in self.router.stream(self._messages(context, message), report=report):
+                tokens.append(token)
+                yield token
+        if tokens:
+            response = "".join(tokens)
+        else:
+            response = self._generate_local_response(intent, destinations_data, message)
+            if report is not None:
+                report["llm_provider"] = "local"
+            yield response
         
+        if cacheable and (tokens or not self.router.providers):
+            self.response_cache.set(message, intent, catalog_version, response)
+    
+    def _is_cacheable(self, intent: Dict[str, Any], conversation_history: List[Dict[str, str]]) -> bool:
+        """Only share answers for self-contained questions.
+        
+        Follow-ups like "tell me more" depend on the conversation, so with history
+        present we only cache messages that name a destination themselves.
+        """
+        return not conversation_history or bool(intent["entities"])
+    
+    def _prepare(
+        self, 
+        message: str, 
+        intent: Dict[str, Any],
+        conversation_history: List[Dict[str, str]], 
+        destinations: List[Any],
+        context_destinations: Optional[List[Dict[str, Any]]] = None,
+        summary: str = ""
+    ) -> Tuple[List[Dict[str, Any]], str, Dict[str, Any]]:
+        """Convert destinations and build the prompt context for a message.
+        
+        `context_destinations` are the retrieved, relevance-ranked rows for the
+        prompt; without them the first 10 of `destinations` are used.
+        """
         # Convert destinations to dict format for processing
         destinations_data = []
         for dest in destinations:
-            if hasattr(dest, 'dict'):
+            if isinstance(dest, dict):
+                destinations_data.append(dest)
+            elif hasattr(dest, 'model_dump'):
+                destinations_data.append(dest.model_dump())
+            elif hasattr(dest, 'dict'):
                 destinations_data.append(dest.dict())
             elif hasattr(dest, '__dict__'):
                 destinations_data.append(dest.__dict__)
@@ -170,130 +623,48 @@ class AIService:
                 destinations_data.append(dest)
         
         # Build context with destinations data
-        context = self._build_context(message, intent, destinations_data, conversation_history)
-        
-        if self.groq_api_key:
-            return await self._generate_with_groq(context, message)
-        else:
-            return self._generate_local_response(intent, destinations_data, message)
-    
-    def _analyze_intent(self, message: str) -> Dict[str, Any]:
-        """Analyze user intent from message"""
-        message_lower = message.lower()
-        
-        intent_type = "general"
-        entities = []
-        
-        # Intent detection
-        if "itinerary" in message_lower or "plan" in message_lower:
-            intent_type = "itinerary"
-        elif any(word in message_lower for word in ["budget", "cost", "price", "money"]):
-            intent_type = "budget"
-        elif any(word in message_lower for word in ["food", "eat", "cuisine", "restaurant"]):
-            intent_type = "food"
-        elif any(word in message_lower for word in ["culture", "festival", "tradition"]):
-            intent_type = "culture"
-        elif any(word in message_lower for word in ["weather", "season", "best time"]):
-            intent_type = "timing"
-        
-        # Entity extraction (destinations)
-        destination_keywords = [
-            "delhi", "agra", "jaipur", "mumbai", "goa", "kerala", "rajasthan",
-            "himalayas", "manali", "taj mahal", "backwaters", "golden triangle"
-        ]
-        
-        for keyword in destination_keywords:
-            if keyword in message_lower:
-                entities.append(keyword)
-                if intent_type == "general":
-                    intent_type = "destination"
-        
-        return {
-            "type": intent_type,
-            "entities": entities,
-            "confidence": 0.8
-        }
+        prompt_destinations = context_destinations or destinations_data[:10]
+        context, report = self._build_context(message, intent, prompt_destinations, conversation_history, summary)
+        return destinations_data, context, report
+    
+    def analyze_intent(self, message: str) -> Dict[str, Any]:
+        """Classify the message's intent and the destinations it names"""
+        intent = self.intents.classify(message)
+        intent["destination_ids"] = []
+        if self.gazetteer is not None:
+            linked = self.gazetteer.link(message)
+            intent["destination_ids"] = linked["destination_ids"]
+            intent["entities"] += [entity for entity in linked["entities"] if entity not in intent["entities"]]
+            if linked["destination_ids"] and intent["type"] == self.intents.rules.default_intent:
+                intent["type"] = self.intents.rules.entity_intent
+                intent["confidence"] = round(len(intent["entities"]) / (len(intent["entities"]) + 1.0), 2)
+        return intent
     
     def _build_context(
         self, 
         message: str, 
         intent: Dict[str, Any], 
         destinations: List[Dict[str, Any]],
-        conversation_history: List[Dict[str, str]]
-    ) -> str:
-        """Build context for AI response generation"""
-        
-        destinations_text = "\n".join([
-            f"- {dest.get('name', 'Unknown')} in {dest.get('location', 'Unknown')}, {dest.get('state', 'Unknown')}: {dest.get('description', 'No description')} "
-            f"(₹{dest.get('price_from', 0)}+ | Rating: {dest.get('rating', 0)} | Category: {dest.get('category', 'Unknown')})"
-            for dest in destinations[:10]
-        ])
-        
-        history_text = "\n".join([
-            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-            for msg in conversation_history[-3:]
-        ])
-        
-        context = f"""You are ARIA, an expert India travel assistant with access to real destination data.
-
-Current conversation:
-- User query: {message}
-- Intent: {intent['type']}
-- Detected entities: {', '.join(intent['entities']) if intent['entities'] else 'none'}
-
-Available destinations:
-{destinations_text}
-
-Recent conversation:
-{history_text}
-
-Guidelines:
-- Be conversational and helpful
-- Use real data from destinations provided
-- Include specific prices, ratings, and details
-- Provide actionable recommendations
-- Use emojis and formatting for better readability
-"""
-        return context
+        conversation_history: List[Dict[str, str]],
+        summary: str = ""
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build context for AI response generation within the prompt token budget"""
+        return self.prompts.build(
+            message, intent, destinations, conversation_history, summary, max_turns=self.context_turns
+        )
     
-    async def _generate_with_groq(self, context: str, message: str) -> str:
-        """Generate response using Groq API"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.groq.com/openai/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.groq_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "llama-3.1-70b-versatile",
-                        "messages": [
-                            {"role": "system", "content": context},
-                            {"role": "user", "content": message}
-                        ],
-                        "max_tokens": 1000,
-                        "temperature": 0.7
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    raise Exception(f"Groq API error: {response.status_code}")
-                    
-        except Exception as e:
-            print(f"❌ Groq API error: {e}")
-            return "I'm having trouble connecting to the AI service. Please try again later."
+    def _messages(self, context: str, message: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": context},
+            {"role": "user", "content": message}
+        ]
     
     def _generate_local_response(self, intent: Dict[str, Any], destinations: List[Dict[str, Any]], message: str) -> str:
         """Generate local response based on intent"""
         intent_type = intent["type"]
         
         if intent_type == "destination":
-            return self._generate_destination_response(destinations, intent["entities"])
+            return self._generate_destination_response(destinations, intent["entities"], intent.get("destination_ids"))
         elif intent_type == "budget":
             return self._generate_budget_response(destinations)
         elif intent_type == "food":
@@ -305,19 +676,28 @@ Guidelines:
         else:
             return self._generate_general_response(destinations)
     
-    def _generate_destination_response(self, destinations: List[Dict[str, Any]], entities: List[str]) -> str:
+    def _generate_destination_response(
+        self,
+        destinations: List[Dict[str, Any]],
+        entities: List[str],
+        destination_ids: Optional[List[int]] = None
+    ) -> str:
         """Generate destination-specific response"""
-        if entities:
-            # Find matching destinations
+        matching = []
+        if destination_ids and self.gazetteer is not None:
+            # Already resolved against the whole catalog, best match first
+            matching = [self.gazetteer.rows[destination_ids[0]]] if destination_ids[0] in self.gazetteer.rows else []
+        elif entities:
+            # Without a gazetteer, look for the names among the destinations at hand
             matching = [
                 dest for dest in destinations
                 if any(entity in dest.get('name', '').lower() or entity in dest.get('location', '').lower() 
                       for entity in entities)
             ]
             
-            if matching:
-                dest = matching[0]
-                return f"""🏛️ **{dest.get('name', 'Unknown')}** in {dest.get('location', 'Unknown')}, {dest.get('state', 'Unknown')}
+        if matching:
+            dest = matching[0]
+            return f"""🏛️ **{dest.get('name', 'Unknown')}** in {dest.get('location', 'Unknown')}, {dest.get('state', 'Unknown')}
 
 {dest.get('description', 'No description available')}
 
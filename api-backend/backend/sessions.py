@@ -0,0 +1,168 @@
+"""
+Conversation Sessions
+Server-side chat history per session ID: recent turns plus a rolling summary, bounded in memory
+"""
+
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Client-chosen IDs are accepted if they look like one of ours; anything else gets a fresh ID
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+# Rough per-turn bookkeeping cost on top of the text itself
+TURN_OVERHEAD = 64
+
+def gist(text: str, max_chars: int) -> str:
+    """First sentence of a turn, whitespace collapsed and clipped, for the rolling summary"""
+    # Only the opening of a long answer can end up in the gist
+    text = " ".join(text[:max_chars * 2].split())
+    text = _SENTENCE_END_RE.split(text, 1)[0]
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+class Session:
+    """Recent turns of one conversation, oldest first, and a summary of the ones folded out"""
+
+    __slots__ = ("turns", "summary", "bytes", "touched_at", "total_turns")
+
+    def __init__(self):
+        self.turns: Deque[Dict[str, str]] = deque()
+        self.summary = ""
+        self.bytes = 0
+        self.touched_at = time.monotonic()
+        self.total_turns = 0
+
+class SessionStore:
+    """LRU of sessions with idle expiry, a per-session byte cap and a global byte cap.
+
+    When a session grows past `max_turns` or `session_max_bytes`, its oldest
+    turns are folded into the summary (one clipped sentence each) and the
+    summary keeps only its most recent `summary_max_chars`, so a session's
+    footprint is fixed however long the conversation runs.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        session_max_bytes: Optional[int] = None,
+        max_turns: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        summary_max_chars: Optional[int] = None
+    ):
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+        self.max_bytes = max_bytes or int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.session_max_bytes = session_max_bytes or int(os.getenv("SESSION_MAX_BYTES_PER_SESSION", str(16 * 1024)))
+        self.max_turns = max_turns or int(os.getenv("SESSION_MAX_TURNS", "8"))
+        self.idle_seconds = idle_seconds or float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+        self.summary_max_chars = summary_max_chars or int(os.getenv("SESSION_SUMMARY_MAX_CHARS", "1200"))
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._bytes = 0
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.folded_turns = 0
+
+    def resolve(self, session_id: Optional[str]) -> str:
+        """The session ID to use for a request: the client's if well-formed, else a new one"""
+        if session_id and _SESSION_ID_RE.match(session_id):
+            return session_id
+        return uuid.uuid4().hex
+
+    def context(self, session_id: str) -> Tuple[List[Dict[str, str]], str]:
+        """Recent turns (oldest first) and the summary of earlier ones; empty for unknown sessions"""
+        session = self._get(session_id)
+        if session is None:
+            return [], ""
+        return list(session.turns), session.summary
+
+    def append(self, session_id: str, role: str, content: str):
+        """Record a turn, folding old turns into the summary to stay within the session cap"""
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = Session()
+            self.created += 1
+        self._sessions.move_to_end(session_id)
+        session.touched_at = time.monotonic()
+
+        # A single oversized turn is clipped so it can never exceed the cap on its own
+        limit = max(self.session_max_bytes // 2, 1)
+        if len(content.encode()) > limit:
+            content = content.encode()[:limit].decode(errors="ignore")
+        before = session.bytes
+        session.turns.append({"role": role, "content": content})
+        session.total_turns += 1
+        session.bytes += len(content.encode()) + TURN_OVERHEAD
+
+        while len(session.turns) > 1 and (
+            len(session.turns) > self.max_turns or session.bytes > self.session_max_bytes
+        ):
+            self._fold(session)
+
+        self._bytes += session.bytes - before
+        while self._sessions and (len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._sessions)))
+            self.evicted += 1
+
+    def delete(self, session_id: str) -> bool:
+        if session_id not in self._sessions:
+            return False
+        self._drop(session_id)
+        return True
+
+    def _fold(self, session: Session):
+        """Move the oldest turn into the summary"""
+        turn = session.turns.popleft()
+        session.bytes -= len(turn["content"].encode()) + TURN_OVERHEAD
+        line = f"{turn['role']}: {gist(turn['content'], 160)}"
+        summary = f"{session.summary}\n{line}" if session.summary else line
+        if len(summary) > self.summary_max_chars:
+            # Keep the latest lines; the oldest context matters least
+            summary = summary[-self.summary_max_chars:]
+            summary = summary[summary.find("\n") + 1:] if "\n" in summary else summary
+        session.bytes += len(summary.encode()) - len(session.summary.encode())
+        session.summary = summary
+        self.folded_turns += 1
+
+    def _get(self, session_id: str) -> Optional[Session]:
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            session.touched_at = time.monotonic()
+        return session
+
+    def _expire_idle(self):
+        """Least recently used sessions sit at the front, so expiry stops at the first live one"""
+        deadline = time.monotonic() - self.idle_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.touched_at >= deadline:
+                break
+            self._drop(session_id)
+            self.expired += 1
+
+    def _drop(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.bytes
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire_idle()
+        return {
+            "sessions": len(self._sessions),
+            "bytes": self._bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "session_max_bytes": self.session_max_bytes,
+            "max_turns": self.max_turns,
+            "idle_seconds": self.idle_seconds,
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "folded_turns": self.folded_turns
+        }
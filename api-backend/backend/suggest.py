@@ -0,0 +1,182 @@
+"""
+Destination Suggestions
+Sorted-array prefix index over names, locations and states for typeahead
+"""
+
+import bisect
+import heapq
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .cache import TTLCache
+from .catalog import CatalogIndex
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+SUGGEST_FIELDS = ("name", "location", "state")
+
+# Fields returned to the typeahead; the full row is fetched when a suggestion is picked
+SUGGESTION_FIELDS = ("id", "name", "location", "state", "category", "rating", "featured", "image_url")
+
+# Prefixes matching more keys than this first try walking (at most this many) destinations in rank order
+RANGE_SCAN_LIMIT = 2048
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace to single spaces"""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+def suggestion_keys(row: Dict[str, Any]) -> Set[str]:
+    """Every string a prefix can match for a row: each field, and each field from every word onward.
+
+    "Golden Temple" yields "golden temple" and "temple", so both "gol" and "tem" find it.
+    """
+    keys: Set[str] = set()
+    for field in SUGGEST_FIELDS:
+        words = normalize(str(row.get(field) or "")).split()
+        for start in range(len(words)):
+            keys.add(" ".join(words[start:]))
+    return keys
+
+def prefixes(keys: Set[str]) -> Set[str]:
+    return {key[:end] for key in keys for end in range(1, len(key) + 1)}
+
+def rank_key(row: Dict[str, Any]) -> Tuple[bool, float, str, int]:
+    """Sort key putting featured destinations first, then higher ratings"""
+    return not row.get("featured"), -float(row.get("rating") or 0), row.get("name") or "", row["id"]
+
+class SuggestIndex(CatalogIndex):
+    """Prefix lookups over a sorted (key, id) array with cached top-N results per prefix.
+
+    Writes patch the cached lists of the prefixes they touch instead of
+    dropping them, so hot one- and two-letter prefixes stay cached.
+    """
+
+    def __init__(self, max_results: Optional[int] = None):
+        self.max_results = max_results or int(os.getenv("SUGGEST_MAX_RESULTS", "10"))
+        self.entries: List[Tuple[str, int]] = []
+        self.ranked: List[Tuple[bool, float, str, int]] = []
+        self.doc_keys: Dict[int, Set[str]] = {}
+        self.doc_rank: Dict[int, Tuple[bool, float, str, int]] = {}
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        # prefix -> [(rank key, id, suggestion)], best first
+        self.cache = TTLCache(
+            max_entries=int(os.getenv("SUGGEST_CACHE_MAX_ENTRIES", "20000")),
+            max_bytes=int(os.getenv("SUGGEST_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            ttl=float(os.getenv("SUGGEST_CACHE_TTL", "3600"))
+        )
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        self.rows = {}
+        self.doc_keys = {}
+        self.doc_rank = {}
+        entries = []
+        for row in rows:
+            entries.extend((key, row["id"]) for key in self._add(row))
+        entries.sort()
+        self.entries = entries
+        self.ranked = sorted(self.doc_rank.values())
+        self.cache.clear()
+
+    def upsert(self, row: Dict[str, Any]):
+        destination_id = row["id"]
+        old_keys = self.doc_keys.get(destination_id, set())
+        old_rank = self.doc_rank.get(destination_id)
+        self._detach(destination_id)
+
+        keys = self._add(row)
+        for key in keys:
+            bisect.insort(self.entries, (key, destination_id))
+        rank = self.doc_rank[destination_id]
+        bisect.insort(self.ranked, rank)
+
+        new_prefixes = prefixes(keys)
+        for prefix in prefixes(old_keys) - new_prefixes:
+            self._drop_if_listed(prefix, destination_id)
+        suggestion = self._suggestion(row)
+        for prefix in new_prefixes:
+            cached = self.cache.peek(prefix)
+            if cached is not None:
+                self._patch(prefix, cached, rank, old_rank, destination_id, suggestion)
+
+    def remove(self, destination_id: int):
+        old_keys = self.doc_keys.get(destination_id, set())
+        self._detach(destination_id)
+        for prefix in prefixes(old_keys):
+            self._drop_if_listed(prefix, destination_id)
+
+    def _add(self, row: Dict[str, Any]) -> Set[str]:
+        keys = suggestion_keys(row)
+        self.rows[row["id"]] = row
+        self.doc_keys[row["id"]] = keys
+        self.doc_rank[row["id"]] = rank_key(row)
+        return keys
+
+    def _detach(self, destination_id: int):
+        """Take a row out of the key array and rank order, leaving the cache alone"""
+        self.rows.pop(destination_id, None)
+        for key in self.doc_keys.pop(destination_id, set()):
+            self._delete_sorted(self.entries, (key, destination_id))
+        rank = self.doc_rank.pop(destination_id, None)
+        if rank is not None:
+            self._delete_sorted(self.ranked, rank)
+
+    @staticmethod
+    def _delete_sorted(items: list, item):
+        position = bisect.bisect_left(items, item)
+        if position < len(items) and items[position] == item:
+            del items[position]
+
+    def _drop_if_listed(self, prefix: str, destination_id: int):
+        """A row left a cached list; the next lookup refills it"""
+        cached = self.cache.peek(prefix)
+        if cached is not None and any(entry[1] == destination_id for entry in cached):
+            self.cache.delete(prefix)
+
+    def _patch(self, prefix: str, cached: list, rank, old_rank, destination_id: int, suggestion: Dict[str, Any]):
+        """Apply a changed row to a cached top-N list in place"""
+        position = next((i for i, entry in enumerate(cached) if entry[1] == destination_id), None)
+        if position is not None:
+            if old_rank is not None and rank > old_rank:
+                # Demoted: whatever ranked just below the list may now belong in it
+                self.cache.delete(prefix)
+                return
+            del cached[position]
+        elif len(cached) >= self.max_results and rank > cached[-1][0]:
+            return
+        bisect.insort(cached, (rank, destination_id, suggestion))
+        del cached[self.max_results:]
+
+    def _suggestion(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: row.get(field) for field in SUGGESTION_FIELDS}
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Best destinations (featured first, then rating) whose name, location or state starts with `prefix`"""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        cached = self.cache.get(prefix)
+        if cached is None:
+            cached = self._lookup(prefix)
+            self.cache.set(prefix, cached, size=256 * len(cached))
+        return [suggestion for _, _, suggestion in cached[:min(limit, self.max_results)]]
+
+    def _lookup(self, prefix: str) -> list:
+        start = bisect.bisect_left(self.entries, (prefix,))
+        end = bisect.bisect_left(self.entries, (prefix + "\uffff",), lo=start)
+        best = []
+        if end - start > RANGE_SCAN_LIMIT:
+            # Broad prefix: the top-ranked rows usually match, so walk rank order for a bounded number of steps
+            for rank in self.ranked[:RANGE_SCAN_LIMIT]:
+                if any(key.startswith(prefix) for key in self.doc_keys[rank[-1]]):
+                    best.append(rank)
+                    if len(best) == self.max_results:
+                        break
+        if len(best) < self.max_results:
+            destination_ids = {destination_id for _, destination_id in self.entries[start:end]}
+            best = heapq.nsmallest(self.max_results, (self.doc_rank[destination_id] for destination_id in destination_ids))
+        return [(rank, rank[-1], self._suggestion(self.rows[rank[-1]])) for rank in best]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self.entries), "destinations": len(self.rows), "cache": self.cache.stats()}
@@ -12,10 +12,12 @@ async def get_api_status():
     """Get comprehensive API status"""
     try:
         async with httpx.AsyncClient() as client:
-            # Test basic connectivity
-            health_response = await client.get("http://localhost:8000/health", timeout=5.0)
-            system_response = await client.get("http://localhost:8000/api/system-status", timeout=5.0)
-            destinations_response = await client.get("http://localhost:8000/api/destinations?limit=1", timeout=5.0)
+            # Test basic connectivity (health and system status are served from the server's probe cache)
+            health_response, system_response, destinations_response = await asyncio.gather(
+                client.get("http://localhost:8000/health", timeout=5.0),
+                client.get("http://localhost:8000/api/system-status", timeout=5.0),
+                client.get("http://localhost:8000/api/destinations?limit=1", timeout=5.0)
+            )
             
             return {
                 "online": True,
@@ -61,6 +63,9 @@ def print_dashboard(status):
         if 'services' in health:
             for service, service_status in health['services'].items():
                 print(f"   {service.title()}: {service_status}")
+        checks = health.get('probes', {}).get('checks', {})
+        for name, check in checks.items():
+            print(f"   Last {name} probe: {check.get('checked_at') or 'pending'}")
         print()
     
     # System Status
@@ -97,6 +102,7 @@ def print_dashboard(status):
     print("   📖 API Docs: http://localhost:8000/docs")
     print("   🔧 Admin Panel: http://localhost:8000/redoc")
     print("   ❤️ Health Check: http://localhost:8000/health")
+    print("   ✅ Readiness: http://localhost:8000/ready")
     print("   🏛️ Destinations: http://localhost:8000/api/destinations")
     print()
     
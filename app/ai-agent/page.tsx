@@ -58,6 +58,8 @@ export default function AIAgentPage() {
   const [messages, setMessages] = useState<Message[]>([])
   const [inputMessage, setInputMessage] = useState("")
   const [isTyping, setIsTyping] = useState(false)
+  // The server keeps the conversation; we only hold the ID it hands back
+  const [sessionId, setSessionId] = useState<string | null>(null)
   const [systemStatus, setSystemStatus] = useState<SystemStatus | null>(null)
   const [selectedType, setSelectedType] = useState("chat")
   const [showSetupGuide, setShowSetupGuide] = useState(false)
@@ -123,15 +125,50 @@ export default function AIAgentPage() {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          Accept: "text/event-stream, application/json",
         },
         body: JSON.stringify({
           message: currentMessage,             // <-- Changed from "question" to "message"
-          conversationHistory: messages,       // <-- Added conversationHistory to match backend
+          session_id: sessionId,               // <-- History lives server-side under this ID
+          stream: true,
         }),
       })
 
+      // Streamed reply: render tokens as they arrive
+      if (response.ok && response.body && (response.headers.get("content-type") ?? "").includes("text/event-stream")) {
+        const aiId = messages.length + 2
+        setMessages((prev) => [...prev, { id: aiId, text: "", sender: "ai", timestamp: new Date(), type: "text" }])
+        setIsTyping(false)
+
+        const reader = response.body.getReader()
+        const decoder = new TextDecoder()
+        let buffer = ""
+
+        while (true) {
+          const { done, value } = await reader.read()
+          if (done) break
+          buffer += decoder.decode(value, { stream: true })
+
+          const events = buffer.split("\n\n")
+          buffer = events.pop() ?? ""
+          for (const event of events) {
+            if (!event.startsWith("data:")) continue
+            const payload = JSON.parse(event.slice(5))
+            if (payload.error) throw new Error(payload.error)
+            if (payload.session_id) setSessionId(payload.session_id)
+            if (payload.token) {
+              setMessages((prev) =>
+                prev.map((msg) => (msg.id === aiId ? { ...msg, text: msg.text + payload.token } : msg)),
+              )
+            }
+          }
+        }
+        return
+      }
+
       const data = await response.json()
 
+      if (data.session_id) setSessionId(data.session_id)
       if (data.response) {  // Check if backend returned a response
         const aiResponse: Message = {
           id: messages.length + 2,
@@ -10,7 +10,10 @@ export async function GET() {
 
 export async function POST(request: NextRequest) {
   try {
-    const { message } = await request.json()
+    const { message, stream, session_id } = await request.json()
+    // Only the new message travels; the backend keeps the conversation under this ID
+    const sessionId = typeof session_id === "string" ? session_id : request.headers.get("x-session-id")
+    const wantsStream = stream === true || (request.headers.get("accept") ?? "").includes("text/event-stream")
 
     if (!message || typeof message !== "string") {
       return NextResponse.json({ success: false, error: "Message is required" }, { status: 400 })
@@ -23,7 +26,7 @@ export async function POST(request: NextRequest) {
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify({ question: message }),
+      body: JSON.stringify({ question: message, stream: wantsStream, session_id: sessionId }),
     })
 
     if (!fastApiResponse.ok) {
@@ -31,11 +34,24 @@ export async function POST(request: NextRequest) {
       throw new Error(`FastAPI error (${fastApiResponse.status}): ${errorText}`)
     }
 
+    // Pipe server-sent events straight through so tokens reach the browser as they arrive
+    if (wantsStream && fastApiResponse.body) {
+      return new Response(fastApiResponse.body, {
+        headers: {
+          "Content-Type": "text/event-stream",
+          "Cache-Control": "no-cache",
+          "X-Accel-Buffering": "no",
+          "X-Session-ID": fastApiResponse.headers.get("x-session-id") ?? "",
+        },
+      })
+    }
+
     const data = await fastApiResponse.json()
 
     return NextResponse.json({
       success: true,
       response: data.response,
+      session_id: data.session_id,
       timestamp: new Date().toISOString(),
     })
   } catch (error) {
@@ -1,11 +1,17 @@
 import os
+import time
+import asyncio
 from pathlib import Path
-from openai import OpenAI
+from openai import AsyncOpenAI
 from langgraph.graph import StateGraph
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator, Tuple
 from supabase import create_client
 from dotenv import load_dotenv
+from .http_clients import build_openrouter_http_client
+from .retrieval import BM25Index
+from .prompts import PromptBuilder
+from .llm_router import LLMRouter, Route
 
 # ✅ Load environment variables from .env.local using absolute path
 dotenv_path = Path(__file__).resolve().parent / ".env.local"
@@ -26,72 +32,149 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 if not OPENROUTER_API_KEY:
     raise ValueError("OPENROUTER_API_KEY missing.")
 
-# ✅ Initialize Supabase and OpenRouter clients
+# ✅ Initialize Supabase and OpenRouter clients (OpenRouter shares one pooled async HTTP client)
 supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
-openrouter_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY
+openrouter_http_client = build_openrouter_http_client()
+openrouter_client = AsyncOpenAI(
+    base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+    api_key=OPENROUTER_API_KEY,
+    http_client=openrouter_http_client
 )
 
+# ✅ Supabase concurrency limit (the sync client runs on worker threads)
+supabase_limit = asyncio.Semaphore(int(os.getenv("SUPABASE_MAX_CONCURRENCY", "16")))
+
+# ✅ Model routes, hedged and failed over by the router: DeepSeek on OpenRouter, then optionally
+#    a second OpenRouter model and Groq (which shares the pooled HTTP client)
+LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+openrouter_concurrency = int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "32"))
+llm_routes = [Route("openrouter:deepseek", openrouter_client, os.getenv("OPENROUTER_MODEL", "deepseek/deepseek-chat"), openrouter_concurrency, LATENCY_WINDOW)]
+if os.getenv("OPENROUTER_FALLBACK_MODEL"):
+    llm_routes.append(Route(f"openrouter:{os.getenv('OPENROUTER_FALLBACK_MODEL')}", openrouter_client, os.getenv("OPENROUTER_FALLBACK_MODEL"), openrouter_concurrency, LATENCY_WINDOW))
+if os.getenv("GROQ_API_KEY"):
+    groq_client = AsyncOpenAI(
+        base_url=os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1"),
+        api_key=os.getenv("GROQ_API_KEY"),
+        http_client=openrouter_http_client
+    )
+    llm_routes.append(Route("groq", groq_client, os.getenv("GROQ_MODEL", "llama-3.1-70b-versatile"), int(os.getenv("GROQ_MAX_CONCURRENCY", "32")), LATENCY_WINDOW))
+llm_router = LLMRouter(llm_routes)
+
+# ✅ Run a Supabase query builder off the event loop
+async def run_supabase(query):
+    async with supabase_limit:
+        return await asyncio.to_thread(query.execute)
+
 # ✅ Agent state model
 class AgentState(BaseModel):
     messages: List[dict]
+    summary: str = ""
+    prompt: dict = {}
 
-# ✅ Format destination info into prompt
-def format_prompt(user_query: str, destinations: List[dict]) -> str:
+# ✅ Prompt within PROMPT_TOKEN_BUDGET: destinations, then history, then summary — returns (prompt, size report)
+prompt_builder = PromptBuilder()
+
+def format_prompt(user_query: str, destinations: List[dict], history: Optional[List[dict]] = None, summary: str = "") -> Tuple[str, dict]:
+    return prompt_builder.build(user_query, destinations, history, summary)
+
+# ✅ Answer from the retrieved rows when no model route could — better than an apology
+def local_answer(destinations: List[dict]) -> str:
     if not destinations:
-        return f"The user asked: '{user_query}'\nBut no destination data is available."
-
-    context = "\n".join([
-        f"- {d['name']} in {d['location']}, {d['state']}: {d.get('description', '')}"
-        for d in destinations
-    ])
-
-    return (
-        f"You are a helpful travel assistant.\n"
-        f"The user asked: '{user_query}'\n\n"
-        f"Here are destination listings from the travel database:\n{context}\n\n"
-        f"Now respond intelligently to the user's query using this data. Be natural, friendly, and specific."
-    )
+        return "Sorry, I couldn't generate a response right now. Please try again."
+    lines = [f"- {d.get('name')} in {d.get('location')}, {d.get('state')}" for d in destinations[:5]]
+    return "I can't reach the AI service right now, but these destinations match your question:\n" + "\n".join(lines)
 
-# ✅ DeepSeek via OpenRouter call
-def call_deepseek(prompt: str) -> Optional[str]:
+# ✅ Fetch destination rows (None on failure)
+async def fetch_destinations() -> Optional[List[dict]]:
     try:
-        response = openrouter_client.chat.completions.create(
-            model="deepseek/deepseek-chat",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content
+        result = await run_supabase(supabase_client.table("destinations").select("*"))
+        return result.data if hasattr(result, "data") else []
     except Exception as e:
-        print(f"🚨 DeepSeek API error:", e)
+        print(f"❌ Supabase fetch error:", e)
         return None
 
+# ✅ Relevance index over the whole catalog, rebuilt every CATALOG_REFRESH_SECONDS
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "8"))
+CATALOG_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+_catalog_index: Optional[BM25Index] = None
+_catalog_loaded_at = 0.0
+_catalog_lock = asyncio.Lock()
+_catalog_refresh: Optional[asyncio.Task] = None
+
+def _catalog_stale() -> bool:
+    return _catalog_index is None or time.monotonic() - _catalog_loaded_at > CATALOG_REFRESH_SECONDS
+
+# ✅ Fetch the catalog and swap in a new index (False if the fetch failed)
+async def _reload_catalog() -> bool:
+    global _catalog_index, _catalog_loaded_at
+
+    async with _catalog_lock:
+        if not _catalog_stale():
+            return True
+        destinations = await fetch_destinations()
+        if destinations is None:
+            return False
+        # ✅ Build off the event loop so requests served from the old index keep flowing
+        _catalog_index = await asyncio.to_thread(BM25Index, destinations)
+        _catalog_loaded_at = time.monotonic()
+        return True
+
+# ✅ Top-k destinations relevant to the query (None if the catalog can't be loaded) —
+#    only the first load waits; a stale index keeps serving while a background task rebuilds it
+async def retrieve_destinations(user_query: str) -> Optional[List[dict]]:
+    global _catalog_refresh
+
+    if _catalog_index is None:
+        if not await _reload_catalog():
+            return None
+    elif _catalog_stale() and (_catalog_refresh is None or _catalog_refresh.done()):
+        _catalog_refresh = asyncio.ensure_future(_reload_catalog())
+
+    return _catalog_index.search(user_query, RETRIEVAL_TOP_K)
+
+# ✅ Streaming counterpart of query_node — yields answer tokens as they arrive
+async def stream_answer(user_query: str, history: Optional[List[dict]] = None, summary: str = "", report: Optional[dict] = None) -> AsyncIterator[str]:
+    print(f"📩 User query (stream): {user_query}")
+
+    destinations = await retrieve_destinations(user_query)
+    if destinations is None:
+        yield "Sorry, I couldn't fetch destination data due to a server error."
+        return
+
+    sent_any = False
+    prompt, prompt_report = format_prompt(user_query, destinations, history, summary)
+    if report is not None:
+        report.update(prompt_report)
+    async for token in llm_router.stream(prompt, report):
+        sent_any = True
+        yield token
+
+    if not sent_any:
+        if report is not None:
+            report["llm_provider"] = "local"
+        yield local_answer(destinations)
+
 # ✅ Main query handler node
-def query_node(state: AgentState) -> AgentState:
+async def query_node(state: AgentState) -> AgentState:
     user_query = state.messages[-1]["content"]
     print(f"📩 User query: {user_query}")
 
-    try:
-        result = supabase_client.table("destinations").select("*").execute()
-        destinations = result.data if hasattr(result, "data") else []
-    except Exception as e:
-        print(f"❌ Supabase fetch error:", e)
+    destinations = await retrieve_destinations(user_query)
+    if destinations is None:
         state.messages.append({
             "role": "assistant",
             "content": "Sorry, I couldn't fetch destination data due to a server error."
         })
         return state
 
-    prompt = format_prompt(user_query, destinations)
-    answer = call_deepseek(prompt)
-
-    if not answer:
-        answer = "Sorry, I couldn't generate a response right now. Please try again."
+    prompt, state.prompt = format_prompt(user_query, destinations, state.messages[:-1], state.summary)
+    routed = await llm_router.complete(prompt)
+    answer, state.prompt["llm_provider"] = routed if routed else (local_answer(destinations), "local")
 
     state.messages.append({"role": "assistant", "content": answer})
     return state
 
-# ✅ Build LangGraph
+# ✅ Build LangGraph (async node — run with graph.ainvoke)
 def build_graph():
     builder = StateGraph(AgentState)
     builder.add_node("query_node", query_node)
@@ -0,0 +1,46 @@
+import os
+from typing import Any, Dict
+
+import httpx
+
+# ✅ HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ✅ Request / new-connection counters for the shared OpenRouter pool
+openrouter_stats: Dict[str, int] = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0}
+
+async def _trace(event: str, info: Dict[str, Any]):
+    if event == "connection.connect_tcp.complete":
+        openrouter_stats["connections_opened"] += 1
+    elif event == "connection.start_tls.complete":
+        openrouter_stats["tls_handshakes"] += 1
+
+async def _on_request(request: httpx.Request):
+    openrouter_stats["requests"] += 1
+    request.extensions["trace"] = _trace
+
+# ✅ One keep-alive pool for the whole process, handed to the async OpenAI SDK
+def build_openrouter_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(float(os.getenv("OPENROUTER_TIMEOUT", "60")), connect=10.0),
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+        ),
+        http2=HTTP2_AVAILABLE and os.getenv("LLM_HTTP2", "true").lower() == "true",
+        event_hooks={"request": [_on_request]}
+    )
+
+def connection_stats() -> Dict[str, Any]:
+    requests = openrouter_stats["requests"]
+    reused = max(requests - openrouter_stats["connections_opened"], 0)
+    return {
+        **openrouter_stats,
+        "reused_connections": reused,
+        "reuse_ratio": round(reused / requests, 4) if requests else 0.0
+    }
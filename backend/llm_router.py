@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+# ✅ One upstream model: its client, concurrency limit, rolling latencies and failure streak
+class Route:
+    def __init__(self, name: str, client: AsyncOpenAI, model: str, max_concurrency: int, window: int):
+        self.name = name
+        self.client = client
+        self.model = model
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.latencies = deque(maxlen=window)
+        self.stats = {"requests": 0, "failures": 0, "wins": 0, "cancelled": 0}
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# ✅ Routes ranked by median latency (time to first token when streaming); a route that
+#    hasn't answered within its p95 gets a hedge on the next one, a failure fails over at once,
+#    the first answer wins and the rest are cancelled — None means every route failed
+class LLMRouter:
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+        self.hedge_quantile = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+        self.hedge_min_delay = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.25"))
+        self.hedge_default_delay = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "2.0"))
+        self.min_samples = int(os.getenv("LLM_MIN_SAMPLES", "10"))
+        self.failure_threshold = int(os.getenv("LLM_FAILURE_THRESHOLD", "3"))
+        self.cooldown = float(os.getenv("LLM_COOLDOWN_SECONDS", "30"))
+        self.deadline = float(os.getenv("LLM_DEADLINE_SECONDS", "60"))
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "exhausted": 0}
+
+    # ✅ Healthy routes fastest first; routes cooling down after repeated failures go last
+    def ranked(self) -> List[Route]:
+        now = time.monotonic()
+
+        def key(route: Route):
+            median = route.quantile(0.5) if len(route.latencies) >= self.min_samples else None
+            return (route.open_until > now, median if median is not None else self.hedge_default_delay, self.routes.index(route))
+
+        return sorted(self.routes, key=key)
+
+    def hedge_delay(self, route: Route) -> float:
+        if len(route.latencies) < self.min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, route.quantile(self.hedge_quantile))
+
+    def _succeeded(self, route: Route, latency: float):
+        route.latencies.append(latency)
+        route.consecutive_failures = 0
+        route.open_until = 0.0
+
+    def _failed(self, route: Route, error: BaseException):
+        route.stats["failures"] += 1
+        route.consecutive_failures += 1
+        print(f"🚨 {route.name} API error:", error)
+        if route.consecutive_failures >= self.failure_threshold:
+            route.open_until = time.monotonic() + self.cooldown
+
+    async def _race(self, attempt: Callable[[Route], Awaitable[Any]], discard: Optional[Callable[[Any], Awaitable[None]]] = None) -> Optional[Tuple[Any, Route]]:
+        order = self.ranked()
+        if not order:
+            return None
+        self.stats["requests"] += 1
+        deadline = time.monotonic() + self.deadline
+        pending: Dict[asyncio.Future, Route] = {}
+        launched: List[Route] = []
+
+        def launch():
+            route = order[len(launched)]
+            launched.append(route)
+            route.stats["requests"] += 1
+            pending[asyncio.ensure_future(attempt(route))] = route
+
+        launch()
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = len(launched) < len(order)
+                wait = min(self.hedge_delay(launched[-1]), remaining) if more else remaining
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if more:
+                        self.stats["hedged"] += 1
+                        launch()
+                    continue
+
+                winner = None
+                for task in done:
+                    route = pending.pop(task)
+                    if task.exception() is not None:
+                        self._failed(route, task.exception())
+                    elif winner is None:
+                        winner = (task.result(), route)
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is not None:
+                    winner[1].stats["wins"] += 1
+                    if winner[1] is not order[0]:
+                        self.stats["hedge_wins"] += 1
+                    return winner
+                # ✅ Everything in flight failed — fail over now rather than waiting out the hedge delay
+                if not pending and len(launched) < len(order):
+                    launch()
+            self.stats["exhausted"] += 1
+            return None
+        finally:
+            for task, route in pending.items():
+                task.cancel()
+                route.stats["cancelled"] += 1
+            if pending:
+                for result in await asyncio.gather(*pending, return_exceptions=True):
+                    if discard is not None and not isinstance(result, BaseException):
+                        await discard(result)
+
+    async def _complete_once(self, route: Route, prompt: str) -> str:
+        start = time.perf_counter()
+        async with route.limit:
+            response = await route.client.chat.completions.create(
+                model=route.model,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        answer = response.choices[0].message.content
+        if not answer:
+            raise RuntimeError("empty completion")
+        self._succeeded(route, time.perf_counter() - start)
+        return answer
+
+    # ✅ (answer, route name) from whichever route answers first, or None
+    async def complete(self, prompt: str) -> Optional[Tuple[str, str]]:
+        routed = await self._race(lambda route: self._complete_once(route, prompt))
+        return (routed[0], routed[1].name) if routed else None
+
+    async def _tokens(self, route: Route, prompt: str) -> AsyncIterator[str]:
+        async with route.limit:
+            stream = await route.client.chat.completions.create(
+                model=route.model,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+            # ✅ Close the response even when a losing hedge is aclose()d, so its pooled connection is freed
+            try:
+                async for chunk in stream:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        yield token
+            finally:
+                await stream.response.aclose()
+
+    async def _first_token(self, route: Route, prompt: str) -> Tuple[str, AsyncIterator[str]]:
+        start = time.perf_counter()
+        tokens = self._tokens(route, prompt)
+        try:
+            first = await tokens.__anext__()
+        except StopAsyncIteration:
+            raise RuntimeError("empty stream")
+        except BaseException:
+            await tokens.aclose()
+            raise
+        self._succeeded(route, time.perf_counter() - start)
+        return first, tokens
+
+    # ✅ Hedging only covers the wait for the first token — after that the stream is committed
+    async def stream(self, prompt: str, report: Optional[dict] = None) -> AsyncIterator[str]:
+        async def close(result):
+            await result[1].aclose()
+
+        routed = await self._race(lambda route: self._first_token(route, prompt), discard=close)
+        if routed is None:
+            return
+        (first, tokens), route = routed
+        if report is not None:
+            report["llm_provider"] = route.name
+        try:
+            yield first
+            async for token in tokens:
+                yield token
+        except Exception as e:
+            # ✅ A truncated answer must not pass for a complete one
+            self._failed(route, e)
+            raise
+        finally:
+            await tokens.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        routes = {}
+        for route in self.routes:
+            p50, p95 = route.quantile(0.5), route.quantile(0.95)
+            routes[route.name] = {
+                **route.stats,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "circuit_open": route.open_until > now
+            }
+        return {**self.stats, "ranked": [route.name for route in self.ranked()], "routes": routes}
@@ -1,11 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from .agent import build_graph, supabase_client  # <- ✅ import supabase client from agent.py
+from typing import List, Optional
+import json
+from contextlib import asynccontextmanager
+from .agent import build_graph, stream_answer, run_supabase, supabase_client, openrouter_http_client, prompt_builder, llm_router  # <- ✅ import supabase client from agent.py
+from .http_clients import connection_stats
+from .sessions import SessionStore
 
-app = FastAPI()
+# ✅ Close the shared OpenRouter connection pool on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await openrouter_http_client.aclose()
+
+app = FastAPI(lifespan=lifespan)
 graph = build_graph()
+sessions = SessionStore()
 
 # Enable CORS (relax for now, tighten in production)
 app.add_middleware(
@@ -23,25 +35,60 @@ async def root():
         "message": "Welcome to Travel Agent AI API. Use POST /query with {'question': 'your question'}"
     }
 
-# ✅ Input model for /query
+# ✅ GET /metrics — OpenRouter connection reuse, session/prompt sizes and LLM routing
+@app.get("/metrics")
+async def metrics():
+    return {"openrouter": connection_stats(), "sessions": sessions.stats(), "prompts": {"tokenizer": prompt_builder.tokenizer.name, "budget": prompt_builder.budget, **prompt_builder.stats}, "llm_router": llm_router.snapshot()}
+
+# ✅ Input model for /query — send back the session_id from the last reply instead of the history
 class QueryRequest(BaseModel):
     question: str
+    stream: bool = False
+    session_id: Optional[str] = None
+
+# ✅ Server-sent events: {"token": ...} per chunk, then {"done": true, "session_id": ..., "prompt": {...}}
+#    — or {"error": ...} if the model stream breaks, in which case the turn isn't recorded
+async def sse_tokens(question: str, session_id: str, history: List[dict], summary: str):
+    tokens, report = [], {}
+    try:
+        async for token in stream_answer(question, history, summary, report):
+            tokens.append(token)
+            yield f"data: {json.dumps({'token': token})}\n\n"
+    except Exception as e:
+        yield f"data: {json.dumps({'error': f'Stream interrupted: {e}'})}\n\n"
+        return
+    sessions.append(session_id, "user", question)
+    sessions.append(session_id, "assistant", "".join(tokens))
+    yield f"data: {json.dumps({'done': True, 'session_id': session_id, 'prompt': report})}\n\n"
 
-# ✅ POST /query — AI travel planner endpoint
+# ✅ POST /query — AI travel planner endpoint (set "stream": true for SSE)
 @app.post("/query")
 async def run_agent(request: QueryRequest):
     user_input = request.question
+    session_id = sessions.resolve(request.session_id)
+    history, summary = sessions.context(session_id)
+    if request.stream:
+        return StreamingResponse(
+            sse_tokens(user_input, session_id, history, summary),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Session-ID": session_id}
+        )
+
     initial_state = {
-        "messages": [{"role": "user", "content": user_input}]
+        "messages": history + [{"role": "user", "content": user_input}],
+        "summary": summary
     }
-    result = graph.invoke(initial_state)
-    return {"response": result["messages"][-1]["content"]}
+    result = await graph.ainvoke(initial_state)
+    answer = result["messages"][-1]["content"]
+    sessions.append(session_id, "user", user_input)
+    sessions.append(session_id, "assistant", answer)
+    return {"response": answer, "session_id": session_id, "prompt": result.get("prompt", {})}
 
 # ✅ NEW: GET /destinations — all places from Supabase
 @app.get("/destinations")
 async def get_all_destinations():
     try:
-        response = supabase_client.table("destinations").select("*").execute()
+        response = await run_supabase(supabase_client.table("destinations").select("*"))
         return JSONResponse(content={"destinations": response.data})
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -51,7 +98,7 @@ async def get_all_destinations():
 async def get_destinations_by_category(category: str):
     try:
         category = category.capitalize()  # Normalize category input
-        response = supabase_client.table("destinations").select("*").eq("category", category).execute()
+        response = await run_supabase(supabase_client.table("destinations").select("*").eq("category", category))
         return JSONResponse(content={"destinations": response.data})
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
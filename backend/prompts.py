@@ -0,0 +1,142 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# ✅ Exact token counts need `pip install tiktoken` (plus its encoding file) — otherwise estimate
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\S")
+
+# ✅ BPE-like estimate that errs high for English, so an estimated budget still fits
+def estimate_tokens(text: str) -> int:
+    count = 0
+    for piece in _PIECE_RE.findall(text):
+        count += 1 + len(piece) // 8 if piece.isascii() else max(1, len(piece.encode()) // 2)
+    return count
+
+class Tokenizer:
+    def __init__(self):
+        encoding = os.getenv("PROMPT_TOKENIZER", "cl100k_base")
+        self._encoding = None
+        self.name = "estimate"
+        if TIKTOKEN_AVAILABLE and encoding != "estimate":
+            try:
+                self._encoding = tiktoken.get_encoding(encoding)
+                self.name = f"tiktoken:{encoding}"
+            except Exception as e:
+                print(f"⚠️ Tokenizer {encoding} unavailable, estimating prompt tokens:", e)
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def clip(self, text: str, max_tokens: int) -> str:
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+        if max_tokens <= 1:
+            return ""
+        if self._encoding is not None:
+            clipped = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:max_tokens - 1])
+        else:
+            clipped = text[:len(text) * (max_tokens - 1) // tokens]
+        return clipped.rstrip() + "…"
+
+INTRO = "You are a helpful travel assistant.\n"
+LISTINGS_LABEL = "Here are destination listings from the travel database:\n"
+SUMMARY_LABEL = "Earlier in this conversation:\n"
+HISTORY_LABEL = "Recent conversation:\n"
+INSTRUCTIONS = "Now respond intelligently to the user's query using this data. Be natural, friendly, and specific."
+
+# ✅ Fills PROMPT_TOKEN_BUDGET in priority order: fixed text + question, destinations (ranked),
+#    history (newest first), then the summary — fixed sections are counted once at start-up
+class PromptBuilder:
+    def __init__(self):
+        self.tokenizer = Tokenizer()
+        self.budget = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+        self.description_tokens = int(os.getenv("PROMPT_DESCRIPTION_TOKENS", "120"))
+        self.turn_tokens = int(os.getenv("PROMPT_TURN_TOKENS", "300"))
+        self.fixed_tokens = sum(self.tokenizer.count(text) for text in (INTRO, LISTINGS_LABEL, INSTRUCTIONS)) + 4
+        self.section_tokens = {label: self.tokenizer.count(label) for label in (SUMMARY_LABEL, HISTORY_LABEL)}
+        self._lines: Dict[tuple, Tuple[str, int]] = {}
+        self.stats = {"requests": 0, "total_tokens": 0, "max_tokens": 0, "dropped_destinations": 0, "dropped_turns": 0}
+
+    def _line(self, d: dict) -> Tuple[str, int]:
+        key = (d.get("id"), d.get("name"), d.get("location"), d.get("state"), d.get("description"))
+        if key not in self._lines:
+            if len(self._lines) >= 4096:
+                self._lines.clear()
+            line = f"- {d['name']} in {d['location']}, {d['state']}: {self.tokenizer.clip(str(d.get('description', '')), self.description_tokens)}"
+            self._lines[key] = (line, self.tokenizer.count(line) + 1)
+        return self._lines[key]
+
+    # ✅ Session turns come back every request — keep their clipped line + count
+    def _turn(self, turn: dict) -> Tuple[str, int]:
+        key = ("turn", turn["role"], turn["content"])
+        if key not in self._lines:
+            if len(self._lines) >= 4096:
+                self._lines.clear()
+            line = f"{turn['role']}: {self.tokenizer.clip(turn['content'], self.turn_tokens)}"
+            self._lines[key] = (line, self.tokenizer.count(line) + 1)
+        return self._lines[key]
+
+    def build(self, user_query: str, destinations: List[dict], history: Optional[List[dict]] = None, summary: str = "") -> Tuple[str, dict]:
+        question = f"The user asked: '{self.tokenizer.clip(user_query, self.budget // 2)}'\n\n"
+        used = self.fixed_tokens + self.tokenizer.count(question)
+
+        lines = []
+        for d in destinations:
+            line, tokens = self._line(d)
+            if used + tokens > self.budget:
+                break
+            lines.append(line)
+            used += tokens
+
+        turns = []
+        history = history or []
+        if history and used + self.section_tokens[HISTORY_LABEL] < self.budget:
+            used += self.section_tokens[HISTORY_LABEL]
+            for turn in reversed(history):
+                line, tokens = self._turn(turn)
+                if used + tokens > self.budget:
+                    break
+                turns.append(line)
+                used += tokens
+            turns.reverse()
+            if not turns:
+                used -= self.section_tokens[HISTORY_LABEL]
+
+        summary_text = ""
+        room = self.budget - used - self.section_tokens[SUMMARY_LABEL] - 2
+        if summary and room > 1:
+            summary = self.tokenizer.clip(summary, room)
+            summary_text = f"{SUMMARY_LABEL}{summary}\n\n"
+            used += self.section_tokens[SUMMARY_LABEL] + self.tokenizer.count(summary) + 2
+
+        history_text = f"{HISTORY_LABEL}" + "\n".join(turns) + "\n\n" if turns else ""
+        if destinations:
+            prompt = f"{INTRO}{summary_text}{history_text}{question}{LISTINGS_LABEL}" + "\n".join(lines) + f"\n\n{INSTRUCTIONS}"
+        else:
+            prompt = f"{summary_text}{history_text}{question.rstrip()}\nBut no destination data is available."
+
+        report = {
+            "prompt_tokens": used,
+            "budget": self.budget,
+            "tokenizer": self.tokenizer.name,
+            "destinations": len(lines),
+            "destinations_offered": len(destinations),
+            "history_turns": len(turns),
+            "history_offered": len(history),
+            "summary": bool(summary_text)
+        }
+        self.stats["requests"] += 1
+        self.stats["total_tokens"] += used
+        self.stats["max_tokens"] = max(self.stats["max_tokens"], used)
+        self.stats["dropped_destinations"] += len(destinations) - len(lines)
+        self.stats["dropped_turns"] += len(history) - len(turns)
+        return prompt, report
@@ -0,0 +1,73 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List
+
+# ✅ Tokenizer shared by documents and queries
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "to", "of", "in", "on", "for", "at", "and", "or",
+    "me", "my", "i", "you", "your", "we", "it", "about", "what", "which", "how", "can",
+    "do", "does", "please", "tell", "with", "from", "be", "this", "that", "some", "any",
+    "want", "like", "visit", "go", "trip", "travel", "best", "good"
+})
+
+# ✅ A match in the name counts more than one in the description
+FIELD_WEIGHTS = {"name": 3.0, "location": 2.0, "state": 2.0, "category": 1.5, "description": 1.0}
+
+# ✅ Terms found in nearly every row carry no ranking signal — skip them
+MIN_IDF = 0.1
+
+def stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in _TOKEN_RE.findall(text.lower()) if word not in STOPWORDS]
+
+# ✅ Okapi BM25 over the destination table, built once per catalog load
+class BM25Index:
+    def __init__(self, rows: List[dict], k1: float = 1.2, b: float = 0.75):
+        self.rows = rows
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.lengths: List[float] = []
+        for position, row in enumerate(rows):
+            terms: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(str(row.get(field) or "")):
+                    terms[token] += weight
+            self.lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, {})[position] = frequency
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def search(self, query: str, k: int) -> List[dict]:
+        count = len(self.rows)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            if idf < MIN_IDF:
+                continue
+            for position, frequency in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.average_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        top = [position for position, _ in heapq.nlargest(k, scores.items(), key=lambda item: item[1])]
+        if len(top) < k:
+            # Top up with the best-rated destinations so general questions still get context
+            seen = set(top)
+            best_rated = heapq.nlargest(k, range(count), key=lambda position: self.rows[position].get("rating") or 0)
+            top.extend(position for position in best_rated if position not in seen)
+        return [self.rows[position] for position in top[:k]]
@@ -0,0 +1,101 @@
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# ✅ Client-sent IDs are kept only if they look like ours; anything else gets a fresh ID
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+def gist(text: str, max_chars: int = 160) -> str:
+    text = _SENTENCE_END_RE.split(" ".join(text[:max_chars * 2].split()), 1)[0]
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+# ✅ One conversation: recent turns (oldest first) + a rolling summary of older ones
+class Session:
+    __slots__ = ("turns", "summary", "bytes", "touched_at")
+
+    def __init__(self):
+        self.turns: Deque[Dict[str, str]] = deque()
+        self.summary = ""
+        self.bytes = 0
+        self.touched_at = time.monotonic()
+
+# ✅ LRU of sessions with idle expiry, a per-session byte cap and a global byte cap —
+#    old turns fold into the summary, so a long chat never grows past its cap
+class SessionStore:
+    def __init__(self):
+        self.max_sessions = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+        self.max_bytes = int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.session_max_bytes = int(os.getenv("SESSION_MAX_BYTES_PER_SESSION", str(16 * 1024)))
+        self.max_turns = int(os.getenv("SESSION_MAX_TURNS", "8"))
+        self.idle_seconds = float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+        self.summary_max_chars = int(os.getenv("SESSION_SUMMARY_MAX_CHARS", "1200"))
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._bytes = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def resolve(self, session_id: Optional[str]) -> str:
+        if session_id and _SESSION_ID_RE.match(session_id):
+            return session_id
+        return uuid.uuid4().hex
+
+    def context(self, session_id: str) -> Tuple[List[Dict[str, str]], str]:
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return [], ""
+        self._sessions.move_to_end(session_id)
+        session.touched_at = time.monotonic()
+        return list(session.turns), session.summary
+
+    def append(self, session_id: str, role: str, content: str):
+        self._expire_idle()
+        session = self._sessions.setdefault(session_id, Session())
+        self._sessions.move_to_end(session_id)
+        session.touched_at = time.monotonic()
+
+        # ✅ An oversized turn is clipped so it can't blow the cap on its own
+        content = content.encode()[:max(self.session_max_bytes // 2, 1)].decode(errors="ignore")
+        before = session.bytes
+        session.turns.append({"role": role, "content": content})
+        session.bytes += len(content.encode())
+        while len(session.turns) > 1 and (len(session.turns) > self.max_turns or session.bytes > self.session_max_bytes):
+            self._fold(session)
+
+        self._bytes += session.bytes - before
+        while self._sessions and (len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._sessions)))
+            self.evicted += 1
+
+    def _fold(self, session: Session):
+        turn = session.turns.popleft()
+        session.bytes -= len(turn["content"].encode())
+        line = f"{turn['role']}: {gist(turn['content'])}"
+        summary = f"{session.summary}\n{line}" if session.summary else line
+        if len(summary) > self.summary_max_chars:
+            # ✅ Keep the latest lines — the oldest context matters least
+            summary = summary[-self.summary_max_chars:]
+            summary = summary[summary.find("\n") + 1:] if "\n" in summary else summary
+        session.bytes += len(summary.encode()) - len(session.summary.encode())
+        session.summary = summary
+
+    # ✅ Least recently used sessions sit at the front, so expiry stops at the first live one
+    def _expire_idle(self):
+        deadline = time.monotonic() - self.idle_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.touched_at >= deadline:
+                break
+            self._drop(session_id)
+            self.expired += 1
+
+    def _drop(self, session_id: str):
+        self._bytes -= self._sessions.pop(session_id).bytes
+
+    def stats(self) -> Dict[str, int]:
+        self._expire_idle()
+        return {"sessions": len(self._sessions), "bytes": self._bytes, "expired": self.expired, "evicted": self.evicted}
@@ -0,0 +1,85 @@
+"""
+LangGraph Agent Concurrency Load Test
+Sends N concurrent POST /query requests to the agent backend (backend/main.py)
+backed by a stub PostgREST server and a stub OpenRouter server, and checks that
+the requests overlap instead of running one after another
+
+Usage: python benchmarks/bench_agent_concurrency.py [--requests 20] [--llm-delay 0.3] [--db-delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+import uvicorn
+from stub_llm import StubLLM
+from stub_postgrest import StubPostgREST, make_rows
+
+def serve(app) -> str:
+    """Run the app under uvicorn on a background thread and return its URL"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return "http://%s:%d" % sock.getsockname()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="stub completion latency in seconds")
+    parser.add_argument("--db-delay", type=float, default=0.05, help="stub query latency in seconds")
+    args = parser.parse_args()
+
+    postgrest = StubPostgREST(make_rows(50), delay=args.db_delay).start()
+    llm = StubLLM(first_token_delay=args.llm_delay).start()
+    os.environ.update({
+        "SUPABASE_URL": postgrest.url,
+        "SUPABASE_KEY": "stub.service.key",
+        "OPENROUTER_API_KEY": "stub-key",
+        "OPENROUTER_BASE_URL": llm.url,
+    })
+
+    from backend.main import app
+
+    base_url = serve(app)
+    single = args.llm_delay + args.db_delay
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def ask(i: int) -> float:
+            start = time.perf_counter()
+            response = await client.post("/query", json={"question": f"Where should I go? #{i}"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        await ask(-1)  # warm up connections
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(ask(i) for i in range(args.requests)))
+        wall = time.perf_counter() - start
+
+    serial_estimate = single * args.requests
+    print(f"🚀 {args.requests} concurrent /query calls (stub db {args.db_delay * 1000:.0f} ms, llm {args.llm_delay * 1000:.0f} ms)")
+    print("=" * 50)
+    print(f"   wall time:            {wall:6.2f} s")
+    print(f"   serialized estimate:  {serial_estimate:6.2f} s")
+    print(f"   mean request latency: {sum(latencies) / len(latencies):6.2f} s")
+    print(f"   overlap factor:       {sum(latencies) / wall:6.1f}x")
+    print("✅ requests overlap" if wall < serial_estimate / 2 else "❌ requests are serialized")
+
+    postgrest.stop()
+    llm.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
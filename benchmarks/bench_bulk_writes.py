@@ -0,0 +1,95 @@
+"""
+Bulk Write Throughput Benchmark
+Loads a partner catalog into the FastAPI app backed by the local stub PostgREST
+server, one POST /api/destinations per row (sequential and concurrent) versus
+POST /api/destinations/bulk, and reports rows per second
+
+Usage: python benchmarks/bench_bulk_writes.py [--rows 1000] [--delay 0.005] [--chunk 500]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+from stub_postgrest import StubPostgREST, make_rows
+
+def partner_rows(count: int, offset: int):
+    """New destinations without ids, as a partner feed would send them"""
+    rows = make_rows(count)
+    for row in rows:
+        del row["id"], row["created_at"]
+        row["name"] = f"Partner {offset} {row['name']}"
+    return rows
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=0.005, help="stub round trip in seconds")
+    parser.add_argument("--chunk", type=int, default=500, help="BULK_CHUNK_SIZE")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests for the concurrent per-row run")
+    args = parser.parse_args()
+
+    stub = StubPostgREST(make_rows(1000), delay=args.delay).start()
+    os.environ["SUPABASE_URL"] = stub.url
+    os.environ["SUPABASE_ANON_KEY"] = "stub.anon.key"
+    os.environ.pop("SUPABASE_SERVICE_ROLE_KEY", None)
+    os.environ["BULK_CHUNK_SIZE"] = str(args.chunk)
+
+    from backend.main import app, supabase_client, travel_service
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=600) as client:
+        # Warm the in-memory catalog so every write also updates the indexes
+        await client.get("/api/search/destinations", params={"query": "destination"})
+
+        async def per_row_sequential(rows):
+            for row in rows:
+                (await client.post("/api/destinations", json=row)).raise_for_status()
+
+        async def per_row_concurrent(rows):
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def one(row):
+                async with semaphore:
+                    (await client.post("/api/destinations", json=row)).raise_for_status()
+
+            await asyncio.gather(*(one(row) for row in rows))
+
+        async def bulk(rows):
+            response = await client.post("/api/destinations/bulk", json={"destinations": rows})
+            response.raise_for_status()
+            assert response.json()["counts"] == {"created": len(rows)}, response.json()["counts"]
+
+        print(f"📥 Loading {args.rows:,} rows, stub round trip {args.delay * 1000:.0f} ms, chunk {args.chunk}")
+        print("=" * 66)
+        runs = (
+            ("per-row POST, sequential", per_row_sequential),
+            (f"per-row POST, {args.concurrency} in flight", per_row_concurrent),
+            ("bulk POST", bulk)
+        )
+        baseline = None
+        for offset, (label, load) in enumerate(runs):
+            before = stub.requests
+            start = time.perf_counter()
+            await load(partner_rows(args.rows, offset))
+            elapsed = time.perf_counter() - start
+            rate = args.rows / elapsed
+            baseline = baseline or rate
+            print(
+                f"{label:>28}: {rate:>9,.0f} rows/s | {elapsed:6.2f} s | "
+                f"{stub.requests - before:>5} statements | {rate / baseline:6.1f}x"
+            )
+
+    print(f"\n📊 {travel_service.bulk_writer.stats()}")
+    supabase_client.close()
+    stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Read Coalescing Benchmark
+Fires bursts of concurrent identical catalog reads (featured page loads and the
+chat path's get_destinations(limit=20)) at the FastAPI app backed by the local
+stub PostgREST server, with single-flight coalescing on and off, and reports how
+many queries reached the database
+
+Usage: python benchmarks/bench_coalescing.py [--concurrency 200] [--delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+from stub_postgrest import StubPostgREST, make_rows
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.05, help="stub query latency in seconds")
+    args = parser.parse_args()
+
+    stub = StubPostgREST(make_rows(200), delay=args.delay).start()
+    os.environ["SUPABASE_URL"] = stub.url
+    os.environ["SUPABASE_ANON_KEY"] = "stub.anon.key"
+    os.environ.pop("SUPABASE_SERVICE_ROLE_KEY", None)
+
+    from backend.main import app, etag_policy, supabase_client, travel_service
+
+    await travel_service.catalog.ensure_loaded()
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=60) as client:
+        async def page_loads():
+            responses = await asyncio.gather(*(
+                client.get("/api/destinations", params={"featured": "true"}) for _ in range(args.concurrency)
+            ))
+            assert all(response.status_code == 200 for response in responses)
+
+        async def chat_lookups():
+            # What each /api/chat call does before prompting the model
+            await asyncio.gather(*(
+                travel_service.get_destinations(limit=20, as_models=False) for _ in range(args.concurrency)
+            ))
+
+        print(f"🔀 {args.concurrency} concurrent identical reads, stub delay {args.delay * 1000:.0f} ms (cold cache)")
+        print("=" * 70)
+        for label, burst in (("featured page loads", page_loads), ("chat get_destinations", chat_lookups)):
+            for coalesce in (False, True):
+                supabase_client.coalesce_reads = coalesce
+                travel_service.cache.clear()
+                etag_policy.cache.clear()
+                before, start = stub.requests, time.perf_counter()
+                await burst()
+                elapsed = (time.perf_counter() - start) * 1000
+                print(
+                    f"{label:>22} | coalescing {'on ' if coalesce else 'off'} | "
+                    f"{stub.requests - before:>4} DB queries | {elapsed:7.1f} ms"
+                )
+
+    print(f"\n📊 {supabase_client.reads.stats()}")
+    supabase_client.close()
+    stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
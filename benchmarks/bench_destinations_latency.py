@@ -0,0 +1,90 @@
+"""
+Destinations Latency Benchmark
+Fires concurrent /api/destinations requests at the FastAPI app backed by a
+local stub PostgREST server and reports p50/p99 latency, comparing the
+worker-pool data layer with inline (blocking) execution
+
+Usage: python benchmarks/bench_destinations_latency.py [--requests 200] [--delay 0.02] [--workers 32]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+import uvicorn
+from stub_postgrest import StubPostgREST, make_rows
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def serve(app) -> str:
+    """Run the app under uvicorn on a background thread and return its URL"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return "http://%s:%d" % sock.getsockname()
+
+async def run_burst(base_url: str, requests: int) -> list:
+    """Send a burst of concurrent requests and return per-request latency in ms"""
+    limits = httpx.Limits(max_connections=requests)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def one():
+            start = time.perf_counter()
+            response = await client.get("/api/destinations", params={"limit": 20})
+            response.raise_for_status()
+            return (time.perf_counter() - start) * 1000
+        
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub query latency in seconds")
+    parser.add_argument("--workers", type=int, default=32, help="SUPABASE_MAX_CONCURRENCY")
+    args = parser.parse_args()
+    
+    stub = StubPostgREST(make_rows(200), delay=args.delay).start()
+    os.environ["SUPABASE_URL"] = stub.url
+    os.environ["SUPABASE_ANON_KEY"] = "stub.anon.key"
+    os.environ.pop("SUPABASE_SERVICE_ROLE_KEY", None)
+    os.environ["SUPABASE_MAX_CONCURRENCY"] = str(args.workers)
+    
+    from backend.main import app, supabase_client
+    
+    async def inline_execute(query):
+        return query.execute()
+    
+    print(f"🚀 {args.requests} concurrent requests, stub delay {args.delay * 1000:.0f} ms")
+    print("=" * 50)
+    
+    base_url = serve(app)
+    offload = await run_burst(base_url, args.requests)
+    supabase_client._execute = inline_execute
+    inline = await run_burst(base_url, args.requests)
+    
+    for label, latencies in (("worker pool", offload), ("inline (before)", inline)):
+        print(
+            f"{label:>16}: p50 {percentile(latencies, 50):8.1f} ms | "
+            f"p99 {percentile(latencies, 99):8.1f} ms | max {max(latencies):8.1f} ms"
+        )
+    
+    supabase_client.close()
+    stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
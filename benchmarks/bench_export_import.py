@@ -0,0 +1,140 @@
+"""
+Catalog Export / Import Memory Benchmark
+Streams the whole table out of /api/destinations/export (NDJSON and CSV) and a
+generated upload into /api/destinations/import, with the stub PostgREST server in
+a child process, and reports throughput and how far this process' RSS grew
+
+Usage: python benchmarks/bench_export_import.py [--sizes 20000,200000]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+import uvicorn
+from stub_postgrest import StubPostgREST, make_rows
+
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE / 1024 / 1024
+
+class PeakRSS:
+    """Sample this process' RSS every few milliseconds while a block runs"""
+
+    def __enter__(self):
+        self.start = self.peak = rss_mb()
+        self.running = True
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def _sample(self):
+        while self.running:
+            self.peak = max(self.peak, rss_mb())
+            time.sleep(0.005)
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+
+    @property
+    def growth(self) -> float:
+        return self.peak - self.start
+
+def run_stub(rows: int, conn):
+    stub = StubPostgREST(make_rows(rows), delay=0.0).start()
+    conn.send(stub.url)
+    conn.recv()
+    stub.stop()
+
+def serve(app) -> str:
+    """Run the app under uvicorn on a background thread and return its URL"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return "http://%s:%d" % sock.getsockname()
+
+async def upload(rows: int):
+    """Generate an NDJSON upload lazily, 1000 rows per chunk"""
+    from backend.responses import dumps
+    for start in range(0, rows, 1000):
+        chunk = make_rows(min(1000, rows - start))
+        for row in chunk:
+            del row["id"], row["created_at"]
+        yield b"".join(dumps(row) + b"\n" for row in chunk)
+
+async def measure(base_url: str, rows: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        for fmt in ("ndjson", "csv"):
+            size, start = 0, time.perf_counter()
+            with PeakRSS() as rss:
+                async with client.stream("GET", "/api/destinations/export", params={"format": fmt}) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_raw():
+                        size += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{rows:>8,} | export {fmt:<6} | {rows / elapsed:>9,.0f} rows/s | "
+                f"{size / 1024 / 1024:>7.1f} MB | RSS +{rss.growth:6.1f} MB"
+            )
+
+        start = time.perf_counter()
+        with PeakRSS() as rss:
+            response = await client.post(
+                "/api/destinations/import",
+                content=upload(rows),
+                headers={"Content-Type": "application/x-ndjson"}
+            )
+        elapsed = time.perf_counter() - start
+        counts = response.json()["counts"]
+        print(
+            f"{rows:>8,} | import ndjson | {rows / elapsed:>9,.0f} rows/s | "
+            f"{counts.get('created', 0):>7,} ok | RSS +{rss.growth:6.1f} MB"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="20000,200000")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.sizes.split(",")]
+    stubs = []
+    for rows in sizes:
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=run_stub, args=(rows, child), daemon=True)
+        process.start()
+        stubs.append((rows, parent.recv(), parent, process))
+
+    os.environ["SUPABASE_ANON_KEY"] = "stub.anon.key"
+    os.environ.pop("SUPABASE_SERVICE_ROLE_KEY", None)
+    from backend.database import SupabaseClient
+    from backend.main import app, travel_service
+
+    base_url = serve(app)
+    print(f"🚚 Streaming export/import, RSS at start {rss_mb():.0f} MB")
+    print("=" * 74)
+    for rows, url, parent, process in stubs:
+        os.environ["SUPABASE_URL"] = url
+        travel_service.db = SupabaseClient()
+        asyncio.run(measure(base_url, rows))
+        parent.send("stop")
+        process.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Catalog Response Format Benchmark
+Server encode CPU, consumer decode CPU and payload size (raw and gzip) of a
+/api/destinations body as JSON, MessagePack and Arrow IPC, for bulk catalog pulls
+
+Usage: python benchmarks/bench_formats.py [--sizes 10000,100000]
+"""
+
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_postgrest import make_rows
+
+def cpu_ms(fn, budget: float = 1.0) -> float:
+    """Average CPU milliseconds per call, repeating for about `budget` seconds"""
+    fn()
+    calls, start = 0, time.process_time()
+    while time.process_time() - start < budget:
+        fn()
+        calls += 1
+    return (time.process_time() - start) * 1000 / max(calls, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    from backend.formats import ARROW, JSON, MSGPACK, render, supported_formats
+    from backend.responses import ORJSON_AVAILABLE
+
+    def decoder(media_type):
+        if media_type == MSGPACK:
+            import msgpack
+            return msgpack.unpackb
+        if media_type == ARROW:
+            import pyarrow as pa
+            return lambda body: pa.ipc.open_stream(body).read_all()
+        if ORJSON_AVAILABLE:
+            import orjson
+            return orjson.loads
+        import json
+        return json.loads
+
+    formats = supported_formats()
+    missing = [name for name, media_type in (("msgpack", MSGPACK), ("pyarrow", ARROW)) if media_type not in formats]
+    if missing:
+        print(f"⚠️ Not installed, skipped: {', '.join(missing)} (pip install {' '.join(missing)})")
+
+    labels = {JSON: f"JSON ({'orjson' if ORJSON_AVAILABLE else 'stdlib'})", MSGPACK: "MessagePack", ARROW: "Arrow IPC"}
+    print("📦 /api/destinations body by format")
+    print("=" * 91)
+    print(f"{'rows':>7} | {'format':<15} | {'encode':>10} | {'decode':>10} | {'size':>9} | {'gzip':>9} | {'vs JSON':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+        content = {"destinations": rows, "count": len(rows), "filters": {"limit": len(rows)}}
+        baseline = None
+        for media_type in formats:
+            encode = lambda: render(media_type, content, "destinations").body
+            body = encode()
+            elapsed = cpu_ms(encode)
+            decode = decoder(media_type)
+            decoded = cpu_ms(lambda: decode(body))
+            compressed = len(gzip.compress(body, compresslevel=6))
+            baseline = baseline or len(body)
+            print(
+                f"{size:>7,} | {labels[media_type]:<15} | {elapsed:>7.1f} ms | {decoded:>7.2f} ms | {len(body) / 1024:>6.0f} KB | "
+                f"{compressed / 1024:>6.0f} KB | {len(body) / baseline:>7.0%}"
+            )
+
+if __name__ == "__main__":
+    main()
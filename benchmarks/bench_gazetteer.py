@@ -0,0 +1,101 @@
+"""
+Gazetteer Entity Linking Benchmark
+Resolves chat messages naming catalog destinations with the gazetteer and with the
+previous nested any(entity in name or entity in location) scan over the catalog,
+across catalog sizes, plus index build and single-row update cost
+
+Usage: python benchmarks/bench_gazetteer.py [--sizes 1000,10000,100000] [--messages 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+
+SYLLABLES = ["ra", "ja", "pur", "ga", "la", "ma", "nal", "ko", "dar", "shi", "van", "tha", "bad", "gar", "ha", "li"]
+KINDS = ["Fort", "Temple", "Lake", "Palace", "Beach", "Falls", "Caves", "Ghat", "Sanctuary", "Bazaar"]
+TEMPLATES = [
+    "Tell me about {name}",
+    "Is {name} worth a visit in winter?",
+    "How do I get from {location} to {name}?",
+    "Plan 3 days around {location}",
+    "What should I eat near {name}?",
+]
+
+def place(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+def catalog(count: int):
+    rng = random.Random(count)
+    towns = [place(rng) for _ in range(max(count // 20, 10))]
+    states = [place(rng) + " Pradesh" for _ in range(28)]
+    return [
+        {
+            "id": i,
+            "name": f"{place(rng)} {rng.choice(KINDS)}",
+            "location": rng.choice(towns),
+            "state": rng.choice(states),
+            "rating": round(rng.uniform(3, 5), 1),
+            "featured": i % 7 == 0
+        }
+        for i in range(1, count + 1)
+    ]
+
+def legacy_match(rows, entities):
+    """The scan _generate_destination_response did, given already-extracted entities"""
+    return [
+        dest for dest in rows
+        if any(entity in dest.get('name', '').lower() or entity in dest.get('location', '').lower()
+               for entity in entities)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    from backend.gazetteer import Gazetteer
+
+    print("📍 Linking chat messages to destinations")
+    print("=" * 92)
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = catalog(size)
+        rng = random.Random(7)
+        picks = [rng.choice(rows) for _ in range(args.messages)]
+        messages = [rng.choice(TEMPLATES).format(**row) for row in picks]
+
+        gazetteer = Gazetteer()
+        start = time.perf_counter()
+        gazetteer.rebuild(rows)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        linked = [gazetteer.link(message) for message in messages]
+        link_us = (time.perf_counter() - start) / len(messages) * 1e6
+        hits = sum(row["id"] in result["destination_ids"] for row, result in zip(picks, linked))
+
+        # Hand the old scan the right entity (the legacy extractor only knew 12 names)
+        sample = picks[:max(1, min(len(picks), 2_000_000 // size))]
+        start = time.perf_counter()
+        for row in sample:
+            legacy_match(rows, [row["name"].lower()])
+        legacy_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        start = time.perf_counter()
+        for row in rows[:500]:
+            gazetteer.upsert(dict(row, name=row["name"] + " View"))
+        upsert_us = (time.perf_counter() - start) / 500 * 1e6
+
+        print(
+            f"{size:>8,} rows | link {link_us:7.1f} us/msg (target in top {gazetteer.max_ids}: {hits / len(messages):.0%}) | "
+            f"nested scan {legacy_us:>10,.1f} us/msg | build {build_ms:7.1f} ms | upsert {upsert_us:5.1f} us"
+        )
+    print(f"\n📊 {gazetteer.stats()}")
+
+if __name__ == "__main__":
+    main()
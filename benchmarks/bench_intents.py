@@ -0,0 +1,117 @@
+"""
+Intent Classifier Benchmark
+Messages per second of the compiled single-pass classifier versus the previous
+substring-scan _analyze_intent, with the shipped rules and with a catalog-sized
+entity list, plus the messages where the two disagree
+
+Usage: python benchmarks/bench_intents.py [--messages 20000] [--entities 500]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+
+TEMPLATES = [
+    "Plan a {days} day itinerary for {place}",
+    "Can you explain the history of {place}?",
+    "What's the weather like in {place} in {month}?",
+    "How much does a trip to {place} cost?",
+    "Best street food and restaurants in {place}",
+    "Tell me about festivals and traditions in {place}",
+    "Great places to visit near {place}",
+    "When is the best time to visit {place}?",
+    "Is {place} affordable for a family of four?",
+    "I want a relaxing holiday, any suggestions?",
+    "What should I eat in {place}?",
+    "hello there",
+]
+PLACES = ["Goa", "Jaipur", "Kerala", "Manali", "the Taj Mahal", "Delhi", "Rishikesh", "Mumbai", "the Himalayas"]
+MONTHS = ["January", "April", "July", "December"]
+
+LEGACY_KEYWORDS = [
+    "delhi", "agra", "jaipur", "mumbai", "goa", "kerala", "rajasthan",
+    "himalayas", "manali", "taj mahal", "backwaters", "golden triangle"
+]
+
+def legacy_intent(message: str, destination_keywords=LEGACY_KEYWORDS):
+    """The substring-scan implementation this replaces"""
+    message_lower = message.lower()
+    intent_type = "general"
+    entities = []
+    if "itinerary" in message_lower or "plan" in message_lower:
+        intent_type = "itinerary"
+    elif any(word in message_lower for word in ["budget", "cost", "price", "money"]):
+        intent_type = "budget"
+    elif any(word in message_lower for word in ["food", "eat", "cuisine", "restaurant"]):
+        intent_type = "food"
+    elif any(word in message_lower for word in ["culture", "festival", "tradition"]):
+        intent_type = "culture"
+    elif any(word in message_lower for word in ["weather", "season", "best time"]):
+        intent_type = "timing"
+    for keyword in destination_keywords:
+        if keyword in message_lower:
+            entities.append(keyword)
+            if intent_type == "general":
+                intent_type = "destination"
+    return {"type": intent_type, "entities": entities, "confidence": 0.8}
+
+def messages(count: int):
+    rng = random.Random(7)
+    return [
+        rng.choice(TEMPLATES).format(days=rng.randint(2, 10), place=rng.choice(PLACES), month=rng.choice(MONTHS))
+        for _ in range(count)
+    ]
+
+def throughput(classify, corpus) -> float:
+    start = time.perf_counter()
+    for message in corpus:
+        classify(message)
+    return len(corpus) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--entities", type=int, default=500, help="destination names in the scaled rule set")
+    args = parser.parse_args()
+
+    from backend.intents import CompiledRules, DEFAULT_RULES, IntentClassifier
+
+    classifier = IntentClassifier(path="")
+    corpus = messages(args.messages)
+
+    # Every catalog destination as an entity, the way a catalog-backed rule set grows
+    names = [f"{place} {index}" for index in range(args.entities // len(PLACES) + 1) for place in PLACES][:args.entities]
+    scaled_keywords = LEGACY_KEYWORDS + [name.lower() for name in names]
+    scaled_rules = CompiledRules({**DEFAULT_RULES, "entities": {
+        **DEFAULT_RULES["entities"], **{name.lower(): [name.lower()] for name in names}
+    }})
+
+    print(f"🧭 Intent classification over {args.messages:,} messages")
+    print("=" * 72)
+    for label, legacy_fn, compiled_fn, size in (
+        ("shipped rules", legacy_intent, classifier.classify, classifier.rules.size),
+        (f"+{args.entities} entities", lambda message: legacy_intent(message, scaled_keywords), scaled_rules.classify, scaled_rules.size)
+    ):
+        legacy = throughput(legacy_fn, corpus)
+        compiled = throughput(compiled_fn, corpus)
+        print(
+            f"{label:>16} ({size:>4} patterns) | substring scans {legacy:>9,.0f} msg/s | "
+            f"compiled {compiled:>9,.0f} msg/s | {compiled / legacy:5.2f}x"
+        )
+
+    print("\nWhere they disagree:")
+    shown = set()
+    for message in corpus:
+        before, after = legacy_intent(message), classifier.classify(message)
+        template = (before["type"], after["type"])
+        if before["type"] != after["type"] and template not in shown:
+            shown.add(template)
+            print(f"  {message!r}: {before['type']} -> {after['type']} ({after['confidence']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+LLM Connection Reuse Benchmark
+Compares a fresh httpx.AsyncClient per chat message (the old Groq path) with
+the pooled HTTPClientManager clients against a local TLS stub LLM server
+
+Usage: python benchmarks/bench_llm_connections.py [--requests 200] [--concurrency 20] [--no-tls]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import httpx
+from stub_llm import StubLLM, make_self_signed_cert
+
+PAYLOAD = {
+    "model": "llama-3.1-70b-versatile",
+    "messages": [{"role": "user", "content": "Tell me about Kerala backwaters"}],
+    "max_tokens": 1000
+}
+
+async def measure(send, requests: int, concurrency: int) -> list:
+    """Run `send` `requests` times with bounded concurrency; return latencies in ms"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await send()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+def report(label: str, latencies: list, connections: int):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:>22}: mean {statistics.mean(latencies):7.2f} ms | p50 {statistics.median(latencies):7.2f} ms | "
+        f"p99 {p99:7.2f} ms | connections {connections}"
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.005, help="stub first-token latency in seconds")
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+
+    cert_dir = None if args.no_tls else make_self_signed_cert()
+    if cert_dir:
+        os.environ["SSL_CERT_FILE"] = os.path.join(cert_dir, "cert.pem")
+    stub = StubLLM(first_token_delay=args.delay, cert_dir=cert_dir).start()
+    os.environ["GROQ_BASE_URL"] = stub.url
+
+    from backend.http_clients import HTTPClientManager
+
+    print(f"🚀 {args.requests} chat completions, concurrency {args.concurrency}, {stub.scheme.upper()} stub")
+    print("=" * 50)
+
+    before_requests = stub.requests
+
+    async def fresh_client():
+        async with httpx.AsyncClient(base_url=stub.url) as client:
+            response = await client.post("/chat/completions", json=PAYLOAD)
+            response.raise_for_status()
+
+    fresh = await measure(fresh_client, args.requests, args.concurrency)
+    report("fresh client (before)", fresh, stub.requests - before_requests)
+
+    manager = HTTPClientManager()
+    await manager.start()
+
+    async def pooled_client():
+        response = await manager.client("groq").post("/chat/completions", json=PAYLOAD)
+        response.raise_for_status()
+
+    pooled = await measure(pooled_client, args.requests, args.concurrency)
+    stats = manager.stats()["providers"]["groq"]
+    report("pooled manager", pooled, stats["connections_opened"])
+    print(f"{'reuse ratio':>22}: {stats['reuse_ratio']:.2%} ({stats['tls_handshakes']} TLS handshakes)")
+
+    await manager.close()
+    stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
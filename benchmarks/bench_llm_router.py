@@ -0,0 +1,140 @@
+"""
+LLM Router Benchmark
+Chat completion latency against simulated providers with heavy-tailed response
+times: one provider alone versus the hedged router over two, then failover when
+the faster provider starts erroring and when it goes down entirely
+
+Usage: python benchmarks/bench_llm_router.py [--requests 400] [--concurrency 20] [--scale 1.0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+
+import httpx
+
+MESSAGES = [{"role": "user", "content": "Plan a week in Kerala on a budget"}]
+REPLY = "Start in Kochi, take a houseboat from Alleppey, then head up to Munnar."
+
+class FakeProvider:
+    """Lognormal latency with occasional multi-second stalls and an error rate"""
+
+    def __init__(self, median: float, stall_rate: float, stall: float, error_rate: float, scale: float, seed: int):
+        self.median = median * scale
+        self.stall_rate = stall_rate
+        self.stall = stall * scale
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.cancelled = 0
+
+    def latency(self) -> float:
+        if self.rng.random() < self.stall_rate:
+            return self.stall * self.rng.uniform(1.0, 2.0)
+        return self.median * self.rng.lognormvariate(0.0, 0.35)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        try:
+            await asyncio.sleep(self.latency())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.rng.random() < self.error_rate:
+            return httpx.Response(503, json={"error": "overloaded"})
+        if json.loads(request.content).get("stream"):
+            chunks = [f"data: {json.dumps({'choices': [{'delta': {'content': word + ' '}}]})}\n\n" for word in REPLY.split()]
+            return httpx.Response(200, content="".join(chunks) + "data: [DONE]\n\n", headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": REPLY}}]})
+
+def fake_clients(providers: Dict[str, FakeProvider]):
+    from backend.http_clients import HTTPClientManager
+
+    class FakeClients(HTTPClientManager):
+        """Pooled-client stand-in whose transports answer in-process"""
+
+        def client(self, provider: str) -> httpx.AsyncClient:
+            client = self._clients.get(provider)
+            if client is None:
+                client = self._clients[provider] = httpx.AsyncClient(
+                    base_url="http://provider.test", transport=httpx.MockTransport(providers[provider].handle)
+                )
+            return client
+
+    return FakeClients()
+
+async def run(label: str, providers: Dict[str, FakeProvider], names: list, requests: int, concurrency: int, stream: bool = False):
+    from backend.llm_router import LLMRouter
+
+    clients = fake_clients(providers)
+    router = LLMRouter(clients, providers=names)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, fallbacks = [], 0
+
+    async def one():
+        nonlocal fallbacks
+        async with semaphore:
+            start = time.perf_counter()
+            if stream:
+                tokens = [token async for token in router.stream(MESSAGES)]
+                answered = bool(tokens)
+            else:
+                answered = await router.complete(MESSAGES) is not None
+            latencies.append((time.perf_counter() - start) * 1000)
+            fallbacks += not answered
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    await clients.close()
+
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    sent = sum(provider.requests for provider in providers.values())
+    print(
+        f"{label:>30} | p50 {pick(0.5):7.1f} ms | p95 {pick(0.95):7.1f} ms | p99 {pick(0.99):7.1f} ms | "
+        f"max {ordered[-1]:7.1f} ms | upstream x{sent / requests:4.2f} | local fallback {fallbacks}"
+    )
+    return router
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every simulated latency")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    os.environ.setdefault("LLM_HEDGE_MIN_DELAY", str(0.05 * args.scale))
+    os.environ.setdefault("LLM_HEDGE_DEFAULT_DELAY", str(0.4 * args.scale))
+    os.environ.setdefault("LLM_COOLDOWN_SECONDS", "5")
+
+    def providers(groq_errors: float = 0.0, groq_stalls: float = 0.06):
+        return {
+            "groq": FakeProvider(0.08, groq_stalls, 1.5, groq_errors, args.scale, seed=1),
+            "openrouter": FakeProvider(0.15, 0.03, 2.0, 0.0, args.scale, seed=2),
+        }
+
+    print(f"🔀 {args.requests} chat completions, concurrency {args.concurrency}")
+    print("=" * 128)
+    asyncio.run(run("groq only", providers(), ["groq"], args.requests, args.concurrency))
+    asyncio.run(run("openrouter only", providers(), ["openrouter"], args.requests, args.concurrency))
+    router = asyncio.run(run("hedged groq + openrouter", providers(), ["groq", "openrouter"], args.requests, args.concurrency))
+    print(f"{'':>30} | hedged {router.hedged}, won by the hedge {router.hedge_wins}")
+    asyncio.run(run("hedged, streaming (TTFT)", providers(), ["groq", "openrouter"], args.requests, args.concurrency, stream=True))
+    asyncio.run(run("groq only, 30% errors", providers(groq_errors=0.3), ["groq"], args.requests, args.concurrency))
+    asyncio.run(run("failover, groq 30% errors", providers(groq_errors=0.3), ["groq", "openrouter"], args.requests, args.concurrency))
+    router = asyncio.run(run("failover, groq down", providers(groq_errors=1.0, groq_stalls=0.0), ["groq", "openrouter"], args.requests, args.concurrency))
+    groq = router.stats()["by_provider"]["groq"]
+    print(f"{'':>30} | groq attempts {groq['requests']} of {args.requests} (circuit open: {groq['circuit_open']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Prompt Size vs Catalog Size Benchmark
+Compares the prompt built from the whole destination table (the old agent
+behaviour) with the BM25 top-k retrieval prompt as the catalog grows
+
+Usage: python benchmarks/bench_prompt_size.py [--sizes 100,1000,10000,100000] [--k 8]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_postgrest import make_rows
+
+QUERIES = [
+    "Tell me about beaches in State 3",
+    "Plan a heritage trip around Town 42",
+    "What adventure destinations do you have?",
+]
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English)"""
+    return len(text) // 4
+
+def full_table_prompt(query: str, rows) -> str:
+    context = "\n".join(
+        f"- {d['name']} in {d['location']}, {d['state']}: {d.get('description', '')}" for d in rows
+    )
+    return f"The user asked: '{query}'\n\nHere are destination listings from the travel database:\n{context}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--k", type=int, default=8)
+    args = parser.parse_args()
+
+    from backend.retrieval import BM25Index
+    from backend.services import AIService
+
+    ai = AIService()
+    print(f"📏 Prompt tokens (≈chars/4) — full table vs BM25 top-{args.k}")
+    print("=" * 78)
+    print(f"{'catalog':>9} | {'full table':>12} | {'top-k':>7} | {'index build':>12} | {'retrieval':>10}")
+
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+
+        start = time.perf_counter()
+        index = BM25Index()
+        index.rebuild(rows)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        full_tokens, topk_tokens, retrieval_ms = 0, 0, 0.0
+        for query in QUERIES:
+            full_tokens += approx_tokens(full_table_prompt(query, rows))
+            start = time.perf_counter()
+            hits = [row for _, row in index.search(query, args.k)]
+            retrieval_ms += (time.perf_counter() - start) * 1000
+            intent = ai.analyze_intent(query)
+            topk_tokens += approx_tokens(ai._build_context(query, intent, hits, []))
+
+        runs = len(QUERIES)
+        print(
+            f"{size:>9,} | {full_tokens // runs:>12,} | {topk_tokens // runs:>7,} | "
+            f"{build_ms:>9.0f} ms | {retrieval_ms / runs:>7.2f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
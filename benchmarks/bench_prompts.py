@@ -0,0 +1,61 @@
+"""
+Prompt Budget Benchmark
+Token count and build time of the chat system prompt with unbounded concatenation
+(the previous _build_context) versus the budgeted PromptBuilder, as destination
+descriptions and conversation turns grow
+
+Usage: python benchmarks/bench_prompts.py [--budget 3000] [--builds 500]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+
+WORDS = ["heritage", "fort", "palace", "backwaters", "spice", "market", "sunset", "trek", "temple", "₹2,500", "monsoon", "beach"]
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=3000)
+    parser.add_argument("--builds", type=int, default=500)
+    args = parser.parse_args()
+
+    from backend.prompts import PromptBuilder, Tokenizer
+
+    tokenizer = Tokenizer()
+    unbounded = PromptBuilder(tokenizer, budget=10 ** 9, description_tokens=10 ** 9, turn_tokens=10 ** 9)
+    budgeted = PromptBuilder(tokenizer, budget=args.budget)
+    intent = {"type": "destination", "entities": ["kerala"]}
+
+    print(f"🧮 Chat prompt size ({tokenizer.name}), budget {args.budget} tokens")
+    print("=" * 96)
+    for description_words, turn_words in ((30, 40), (150, 200), (600, 800)):
+        rng = random.Random(description_words)
+        destinations = [
+            {"id": i, "name": f"Place {i}", "location": "Kochi", "state": "Kerala", "description": text(rng, description_words),
+             "price_from": 9000 + i, "rating": 4.5, "category": "Nature"}
+            for i in range(8)
+        ]
+        history = [{"role": role, "content": text(rng, turn_words)} for _ in range(4) for role in ("user", "assistant")]
+
+        for label, builder in (("unbounded", unbounded), ("budgeted", budgeted)):
+            start = time.perf_counter()
+            for _ in range(args.builds):
+                prompt, report = builder.build("Plan 4 days in Kerala", intent, destinations, history, "user: earlier question")
+            elapsed = (time.perf_counter() - start) / args.builds * 1e6
+            print(
+                f"desc {description_words:>3}w, turns {turn_words:>3}w | {label:>9} | {report['prompt_tokens']:>6,} tokens | "
+                f"{report['destinations']}/{report['destinations_offered']} destinations | "
+                f"{report['history_turns']}/{report['history_offered']} turns | {elapsed:7.1f} us/build"
+            )
+    print(f"\n📊 {budgeted.stats()}")
+
+if __name__ == "__main__":
+    main()
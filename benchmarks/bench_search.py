@@ -0,0 +1,69 @@
+"""
+Destination Search Benchmark
+Compares the in-memory SearchIndex with the substring scan used by the old
+search path (the same `query in field.lower()` test PostgREST's ilike performs,
+minus the network) on a synthetic catalog
+
+Usage: python benchmarks/bench_search.py [--rows 100000] [--repeat 200]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_postgrest import make_rows
+
+QUERIES = ["Town 42", "destination 9999", "heritage", "tow", "destnation 123", "state 7 beach"]
+
+def ilike_scan(rows, query: str, limit: int = 10):
+    query_lower = query.lower()
+    return [
+        row for row in rows
+        if query_lower in row["name"].lower()
+        or query_lower in row["location"].lower()
+        or query_lower in row["description"].lower()
+    ][:limit]
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from backend.search_index import SearchIndex
+
+    rows = make_rows(args.rows)
+    start = time.perf_counter()
+    index = SearchIndex()
+    index.rebuild(rows)
+    print(f"🔍 {args.rows:,} destinations — index built in {(time.perf_counter() - start):.2f} s")
+    print("=" * 78)
+    print(f"{'query':>18} | {'index p50':>10} | {'index p99':>10} | {'scan p50':>10} | {'hits':>4}")
+
+    for query in QUERIES:
+        index_p50, index_p99 = timed(lambda: index.search(query, 10), args.repeat)
+        scan_p50, _ = timed(lambda: ilike_scan(rows, query), max(args.repeat // 20, 3))
+        hits = len(index.search(query, 10))
+        print(f"{query!r:>18} | {index_p50:>7.3f} ms | {index_p99:>7.3f} ms | {scan_p50:>7.2f} ms | {hits:>4}")
+
+    row = dict(rows[0], name="Destination Renamed", description="Freshly updated description text.")
+    upsert_p50, upsert_p99 = timed(lambda: index.upsert(row), args.repeat)
+    print(f"\n✏️  incremental upsert: p50 {upsert_p50:.3f} ms | p99 {upsert_p99:.3f} ms")
+
+if __name__ == "__main__":
+    main()
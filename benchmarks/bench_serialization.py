@@ -0,0 +1,63 @@
+"""
+Destination Response CPU Benchmark
+Per-request CPU to turn catalog rows into a /api/destinations response body:
+the old path (one Destination model per row, jsonable_encoder, stdlib JSON)
+versus batched TypeAdapter validation and trusted rows with the fast encoder
+
+Usage: python benchmarks/bench_serialization.py [--sizes 20,1000,10000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_postgrest import make_rows
+
+def cpu_ms(fn, budget: float = 1.0) -> float:
+    """Average CPU milliseconds per call, repeating for about `budget` seconds"""
+    fn()
+    calls, start = 0, time.process_time()
+    while time.process_time() - start < budget:
+        fn()
+        calls += 1
+    return (time.process_time() - start) * 1000 / calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="20,1000,10000")
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from backend.models import Destination
+    from backend.responses import FastJSONResponse, ORJSON_AVAILABLE
+    from backend.services import list_adapter
+
+    def envelope(destinations):
+        return {"destinations": destinations, "count": len(destinations), "filters": {"limit": len(destinations)}}
+
+    def before(rows):
+        models = [Destination(**row) for row in rows]
+        return JSONResponse(jsonable_encoder(envelope(models))).body
+
+    def validated(rows):
+        return FastJSONResponse(envelope(list_adapter(Destination).validate_python(rows))).body
+
+    def trusted(rows):
+        return FastJSONResponse(envelope(rows)).body
+
+    print(f"🧮 CPU per /api/destinations response (encoder: {'orjson' if ORJSON_AVAILABLE else 'stdlib json'})")
+    print("=" * 78)
+    print(f"{'rows':>7} | {'before':>10} | {'batched+fast':>13} | {'trusted+fast':>13} | {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+        old, new, raw = cpu_ms(lambda: before(rows)), cpu_ms(lambda: validated(rows)), cpu_ms(lambda: trusted(rows))
+        print(f"{size:>7,} | {old:>7.3f} ms | {new:>10.3f} ms | {raw:>10.3f} ms | {old / raw:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Chat Session Store Benchmark
+Request payload per turn when clients resend conversation_history versus sending
+a session_id, and the memory held by the server-side session store for many long
+conversations (tracemalloc), with its append/context throughput
+
+Usage: python benchmarks/bench_sessions.py [--sessions 2000] [--turns 50]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+
+QUESTIONS = [
+    "Plan a 5 day trip to Kerala for a couple",
+    "What about the food there?",
+    "Is it cheaper in the monsoon?",
+    "Tell me more about the houseboats",
+    "And how do we get from Kochi to Alleppey?",
+]
+
+def answer(rng: random.Random) -> str:
+    """A reply about as long as the assistant's usual formatted answers"""
+    return " ".join(rng.choice(["Kerala", "backwaters", "houseboat", "₹12,000", "October", "spice", "beach", "cruise"]) for _ in range(rng.randint(80, 160))) + "."
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=50, help="user messages per conversation")
+    args = parser.parse_args()
+
+    from backend.sessions import SessionStore
+
+    rng = random.Random(3)
+    history, full_bytes, session_bytes = [], 0, 0
+    session_id = "0" * 32
+    for turn in range(args.turns):
+        message = rng.choice(QUESTIONS)
+        full_bytes += len(json.dumps({"message": message, "conversation_history": history}).encode())
+        session_bytes += len(json.dumps({"message": message, "session_id": session_id}).encode())
+        history += [{"role": "user", "content": message}, {"role": "assistant", "content": answer(rng)}]
+
+    print(f"💬 {args.turns}-turn conversation, request payload")
+    print("=" * 66)
+    print(f"{'conversation_history':>22} | {full_bytes / args.turns / 1024:8.1f} KB/request avg | last {len(json.dumps(history)) / 1024:6.1f} KB")
+    print(f"{'session_id':>22} | {session_bytes / args.turns / 1024:8.2f} KB/request avg")
+
+    replies = [answer(rng) for _ in range(64)]
+    store = SessionStore(max_sessions=args.sessions * 2, max_bytes=1 << 40)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(args.sessions):
+        sid = f"session-{index:08d}"
+        for turn in range(args.turns):
+            store.context(sid)
+            store.append(sid, "user", QUESTIONS[turn % len(QUESTIONS)])
+            store.append(sid, "assistant", replies[(index + turn) % len(replies)])
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    unbounded = args.sessions * sum(len(turn["content"].encode()) for turn in history)
+    stats = store.stats()
+    print(f"\n🗄️ {args.sessions:,} sessions x {args.turns} turns in the store")
+    print("=" * 66)
+    print(f"{'raw history (unbounded)':>24} | {unbounded / 1024 / 1024:8.1f} MB of text")
+    print(f"{'session store':>24} | {stats['bytes'] / 1024 / 1024:8.1f} MB accounted | {held / 1024 / 1024:6.1f} MB traced")
+    print(f"{'per session':>24} | {stats['bytes'] / args.sessions / 1024:8.1f} KB (cap {store.session_max_bytes / 1024:.0f} KB)")
+    print(f"{'throughput':>24} | {args.sessions * args.turns / elapsed:8,.0f} turns/s (context + 2 appends)")
+    print(f"\n📊 {stats}")
+
+if __name__ == "__main__":
+    main()
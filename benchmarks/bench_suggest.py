@@ -0,0 +1,71 @@
+"""
+Typeahead Suggestion Benchmark
+Replays keystroke-by-keystroke prefixes against SuggestIndex on a synthetic
+catalog, cold (empty prefix cache) and warm, and with writes interleaved
+
+Usage: python benchmarks/bench_suggest.py [--rows 100000] [--rounds 20]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "api-backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from stub_postgrest import make_rows
+
+WORDS = ["destination 42", "town 17", "state 3", "destination 9", "town 250", "state 12"]
+
+def keystrokes():
+    """Every prefix a user types on the way to each word"""
+    return [word[:end] for word in WORDS for end in range(1, len(word) + 1)]
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+def replay(index, prefixes, rounds, write_every=0, rows=None):
+    samples = []
+    rng = random.Random(7)
+    for round_number in range(rounds):
+        for position, prefix in enumerate(prefixes):
+            if write_every and position % write_every == 0:
+                row = dict(rng.choice(rows), rating=round(rng.uniform(3, 5), 1))
+                index.upsert(row)
+            start = time.perf_counter()
+            index.suggest(prefix, 8)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    from backend.suggest import SuggestIndex
+
+    rows = make_rows(args.rows)
+    start = time.perf_counter()
+    index = SuggestIndex()
+    index.rebuild(rows)
+    print(f"⌨️  {args.rows:,} destinations — {len(index.entries):,} keys built in {(time.perf_counter() - start):.2f} s")
+    print("=" * 72)
+
+    prefixes = keystrokes()
+    cold = replay(index, prefixes, 1)
+    warm = replay(index, prefixes, args.rounds)
+    mixed = replay(index, prefixes, args.rounds, write_every=10, rows=rows)
+
+    for label, samples in (("cold (first keystrokes)", cold), ("warm", warm), ("warm + 1 write/10 reads", mixed)):
+        p50, p99 = percentiles(samples)
+        per_second = len(samples) / (sum(samples) / 1000)
+        print(f"{label:>24} | p50 {p50:.4f} ms | p99 {p99:.4f} ms | {per_second:>12,.0f} lookups/s")
+    print(f"\n📦 prefix cache: {index.cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Local LLM Provider Stand-in
+Threaded HTTP(S) server speaking the OpenAI-compatible /chat/completions API
+(plain JSON or `stream: true` server-sent events) with configurable latency
+"""
+
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+def make_self_signed_cert() -> str:
+    """Create a throwaway certificate for 127.0.0.1 and return the directory holding cert.pem/key.pem"""
+    directory = tempfile.mkdtemp(prefix="stub-llm-")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+            "-keyout", os.path.join(directory, "key.pem"),
+            "-out", os.path.join(directory, "cert.pem"),
+        ],
+        check=True,
+        capture_output=True
+    )
+    return directory
+
+class StubLLM:
+    """Serve canned completions on 127.0.0.1"""
+
+    def __init__(
+        self,
+        reply: str = "Kerala's backwaters are best explored on a houseboat from Alleppey.",
+        first_token_delay: float = 0.05,
+        token_delay: float = 0.005,
+        cert_dir: Optional[str] = None
+    ):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = _Server(("127.0.0.1", 0), self._handler())
+        self.scheme = "http"
+        if cert_dir:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(os.path.join(cert_dir, "cert.pem"), os.path.join(cert_dir, "key.pem"))
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = "https"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    def start(self) -> "StubLLM":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.first_token_delay)
+
+                if body.get("stream"):
+                    self._stream()
+                else:
+                    self._complete()
+
+            def _complete(self):
+                payload = json.dumps({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": stub.reply}}]
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, word in enumerate(stub.reply.split(" ")):
+                    if index:
+                        time.sleep(stub.token_delay)
+                    token = word if index == 0 else " " + word
+                    chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                    self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                self._chunk(b"data: [DONE]\n\n")
+                self._chunk(b"")
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
@@ -0,0 +1,229 @@
+"""
+Local PostgREST Stand-in
+Minimal threaded HTTP server that answers the supabase client's
+/rest/v1/destinations reads and writes with synthetic rows and a configurable delay
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any
+from urllib.parse import urlparse, parse_qsl
+
+CATEGORIES = ["Heritage", "Nature", "Beach", "Spiritual", "Adventure"]
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """Build synthetic destination rows"""
+    return [
+        {
+            "id": i,
+            "name": f"Destination {i}",
+            "location": f"Town {i % 500}",
+            "state": f"State {i % 28}",
+            "description": f"A synthetic destination number {i} used for benchmarking the API.",
+            "image_url": f"https://example.com/images/{i}.jpg",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "rating": round(3.0 + (i % 21) / 10, 1),
+            "price_from": 5000 + (i * 37) % 45000,
+            "featured": i % 7 == 0,
+            "created_at": "2024-01-01T00:00:00Z"
+        }
+        for i in range(1, count + 1)
+    ]
+
+def _coerce(current: Any, value: str) -> Any:
+    if isinstance(current, bool):
+        return value.lower() == "true"
+    if isinstance(current, (int, float)):
+        return type(current)(float(value))
+    return value
+
+def _matches(row: Dict[str, Any], column: str, expr: str) -> bool:
+    op, _, value = expr.partition(".")
+    current = row.get(column)
+    if op == "eq":
+        return str(current).lower() == value.lower()
+    if op == "in":
+        return str(current) in value.strip("()").split(",")
+    if op in ("gt", "gte", "lt", "lte"):
+        other = _coerce(current, value)
+        return {
+            "gt": current > other, "gte": current >= other,
+            "lt": current < other, "lte": current <= other
+        }[op]
+    return True
+
+def _ordered(rows: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+    for clause in reversed(order.split(",")):
+        column, _, direction = clause.partition(".")
+        rows = sorted(rows, key=lambda row: row.get(column), reverse=direction.startswith("desc"))
+    return rows
+
+REQUIRED_COLUMNS = ("name", "location", "state", "description", "category", "rating", "price_from")
+
+def _row_error(rows: List[Dict[str, Any]], existing: Dict[int, Any], upsert: bool):
+    """The Postgres error a multi-row insert would raise, if any (the statement is all or nothing)"""
+    seen = set()
+    for row in rows:
+        for column in REQUIRED_COLUMNS:
+            if row.get(column) is None:
+                return 400, {"code": "23502", "message": f'null value in column "{column}" violates not-null constraint'}
+        if "id" in row:
+            if row["id"] in seen:
+                return 500, {"code": "21000", "message": "ON CONFLICT DO UPDATE command cannot affect row a second time"}
+            if row["id"] in existing and not upsert:
+                return 409, {"code": "23505", "message": 'duplicate key value violates unique constraint "destinations_pkey"'}
+            seen.add(row["id"])
+    return None
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+class StubPostgREST:
+    """Serve a fake destinations table on 127.0.0.1"""
+    
+    def __init__(self, rows: List[Dict[str, Any]], delay: float = 0.02):
+        self.rows = rows
+        self.delay = delay
+        self.requests = 0
+        self.next_id = max((row["id"] for row in rows), default=0) + 1
+        self._lock = threading.Lock()
+        self.server = _Server(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "StubPostgREST":
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, delayed ACKs add ~40 ms per POST
+            disable_nagle_algorithm = True
+            
+            def log_message(self, *args):
+                pass
+            
+            def _body(self) -> Any:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                return json.loads(raw) if raw.strip() else None
+            
+            def _params(self):
+                return parse_qsl(urlparse(self.path).query)
+            
+            def _filtered(self, with_total: bool = False):
+                rows = stub.rows
+                limit, offset, order, columns = None, 0, None, "*"
+                for key, value in self._params():
+                    if key == "select":
+                        columns = value
+                    elif key == "limit":
+                        limit = int(value)
+                    elif key == "offset":
+                        offset = int(value)
+                    elif key == "order":
+                        order = value
+                    elif key != "or":
+                        rows = [row for row in rows if _matches(row, key, value)]
+                if order:
+                    rows = _ordered(rows, order)
+                total = len(rows)
+                rows = rows[offset:]
+                rows = rows[:limit] if limit is not None else rows
+                if columns != "*":
+                    names = columns.split(",")
+                    rows = [{name: row.get(name) for name in names} for row in rows]
+                return (rows, total) if with_total else rows
+            
+            def _reply(self, payload: Any, status: int = 200, headers: Dict[str, str] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                self._body()
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.delay)
+                if "count=exact" in self.headers.get("Prefer", ""):
+                    # PostgREST reports the total in Content-Range: first-last/total
+                    rows, total = self._filtered(with_total=True)
+                    span = f"0-{len(rows) - 1}" if rows else "*"
+                    self._reply(rows, headers={"Content-Range": f"{span}/{total}"})
+                else:
+                    self._reply(self._filtered())
+            
+            def _write(self, apply):
+                payload = self._body()
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.delay)
+                with stub._lock:
+                    status, result = apply(payload)
+                self._reply(result, status=status)
+            
+            def do_POST(self):
+                upsert = "resolution=merge-duplicates" in self.headers.get("Prefer", "")
+                
+                def insert(payload):
+                    rows = payload if isinstance(payload, list) else [payload]
+                    existing = {row["id"]: row for row in stub.rows}
+                    error = _row_error(rows, existing, upsert)
+                    if error:
+                        return error
+                    created = []
+                    for row in rows:
+                        row = dict(row)
+                        if "id" not in row:
+                            row["id"] = stub.next_id
+                        stub.next_id = max(stub.next_id, row["id"] + 1)
+                        row.setdefault("created_at", "2024-01-01T00:00:00Z")
+                        if row["id"] in existing:
+                            existing[row["id"]].update(row)
+                            row = existing[row["id"]]
+                        else:
+                            stub.rows.append(row)
+                        created.append(row)
+                    return 201, created
+                
+                self._write(insert)
+            
+            def do_PATCH(self):
+                def update(payload):
+                    matched = {id(row) for row in self._filtered()}
+                    rows = [row for row in stub.rows if id(row) in matched]
+                    for row in rows:
+                        row.update(payload)
+                    return 200, rows
+                
+                self._write(update)
+            
+            def do_DELETE(self):
+                def delete(payload):
+                    matched = {row["id"] for row in self._filtered()}
+                    deleted = [row for row in stub.rows if row["id"] in matched]
+                    stub.rows = [row for row in stub.rows if row["id"] not in matched]
+                    return 200, deleted
+                
+                self._write(delete)
+        
+        return Handler